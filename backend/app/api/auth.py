@@ -1,54 +1,94 @@
-from datetime import timedelta
+import uuid
+from datetime import UTC, datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import create_access_token, get_password_hash, verify_password
-from app.db.database import get_db
+from app.core.password_hasher import PasswordHasherSaturatedError, password_hasher
+from app.core.principal_cache import Principal, principal_cache
+from app.core.responses import respond
+from app.core.revocations import revocation_set, revoke_user_tokens
+from app.core.security import (
+    create_access_token,
+    new_refresh_token,
+    password_needs_rehash,
+    refresh_token_digest,
+)
+from app.core.token_cache import token_cache
+from app.db.database import get_async_db
+from app.models.models import RefreshToken
 from app.models.models import User as UserModel
-from app.schemas.schemas import Token, User, UserCreate
+from app.schemas.schemas import RefreshRequest, Token, User, UserCreate
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> UserModel:
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many authentication requests in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+    payload = token_cache.get(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            raise credentials_exception from None
+        token_cache.put(token, payload)
+    username: str = payload.get("sub")
+    if username is None:
+        raise credentials_exception
+
+    user_id = payload.get("uid")
+    if settings.STATELESS_TOKENS and isinstance(user_id, int):
+        # Everything needed is in the signed claims; only revocations are checked.
+        await revocation_set.refresh_if_due(db)
+        version = payload.get("ver", 0)
+        if payload.get("act") is not True or revocation_set.is_revoked(user_id, version):
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception from None
+        return Principal(id=user_id, username=username, is_active=True)
 
-    user = db.query(UserModel).filter(UserModel.username == username).first()
-    if user is None:
-        raise credentials_exception
+    principal = principal_cache.get(username)
+    if principal is None:
+        user = await db.scalar(select(UserModel).where(UserModel.username == username))
+        if user is None:
+            raise credentials_exception
+        principal = Principal.from_user(user)
+        principal_cache.put(username, principal)
 
-    if not user.is_active:
+    if not principal.is_active:
         raise credentials_exception
 
-    return user
+    return principal
 
 
 @router.post("/register", response_model=User)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
     errors: list[str] = []
 
     # Check uniqueness
-    if db.query(UserModel).filter(UserModel.email == user_in.email).first():
+    if await db.scalar(select(UserModel.id).where(UserModel.email == user_in.email)) is not None:
         errors.append("Email Address Already in Use")
-    if db.query(UserModel).filter(UserModel.username == user_in.username).first():
+    if (
+        await db.scalar(select(UserModel.id).where(UserModel.username == user_in.username))
+        is not None
+    ):
         errors.append("Username Already in Use")
 
     # Validate password strength
@@ -58,29 +98,43 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
     if errors:
         raise HTTPException(status_code=400, detail=", ".join(errors))
 
+    try:
+        password_hash = await password_hasher.hash(user_in.password)
+    except PasswordHasherSaturatedError:
+        raise _hasher_busy() from None
+
     # Create new user
     db_user = UserModel(
         email=user_in.email,
         username=user_in.username,
         full_name=user_in.full_name,
-        password_hash=get_password_hash(user_in.password),
+        password_hash=password_hash,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)
+):
     # Allow login with either email or username (OAuth2 form uses the "username" field)
     identifier = form_data.username
     if "@" in identifier:
-        user = db.query(UserModel).filter(UserModel.email == identifier).first()
+        user = await db.scalar(select(UserModel).where(UserModel.email == identifier))
     else:
-        user = db.query(UserModel).filter(UserModel.username == identifier).first()
+        user = await db.scalar(select(UserModel).where(UserModel.username == identifier))
+
+    try:
+        password_ok = user is not None and await password_hasher.verify(
+            form_data.password, user.password_hash
+        )
+    except PasswordHasherSaturatedError:
+        raise _hasher_busy() from None
 
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -90,13 +144,142 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     if not user.is_active:
         raise HTTPException(status_code=400, detail="User account is inactive")
 
+    # Transparently migrate hashes made with an old scheme or work factor.
+    if password_needs_rehash(user.password_hash):
+        try:
+            user.password_hash = await password_hasher.hash(form_data.password)
+            await db.commit()
+        except PasswordHasherSaturatedError:
+            pass  # the login still succeeds; we retry on the next one
+
+    refresh_token = await _issue_refresh_token(db, user.id, uuid.uuid4().hex)
+    await db.commit()
+    return {
+        "access_token": _access_token(user),
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+def _access_token(user: UserModel) -> str:
+    claims = {"sub": user.username}
+    if settings.STATELESS_TOKENS:
+        claims |= {"uid": user.id, "act": user.is_active, "ver": user.token_version}
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+    return create_access_token(data=claims, expires_delta=access_token_expires)
+
+
+async def _issue_refresh_token(db: AsyncSession, user_id: int, family_id: str) -> str:
+    """Insert a new refresh token of ``family_id``; the caller commits.
+
+    The user's expired tokens are deleted on the way (an indexed lookup by
+    user), so rotation does not grow the table without bound.  Used tokens
+    stay until they expire: they are what reuse detection matches.
+    """
+    token, digest = new_refresh_token()
+    now = datetime.now(UTC)
+    await db.execute(
+        delete(RefreshToken).where(RefreshToken.user_id == user_id, RefreshToken.expires_at <= now)
+    )
+    await db.execute(
+        insert(RefreshToken).values(
+            token_hash=digest,
+            user_id=user_id,
+            family_id=family_id,
+            created_at=now,
+            expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    return token
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(body: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """Trade a refresh token for a new access token and a new refresh token.
+
+    No password check: the token is looked up by its digest and marked used
+    in one conditional UPDATE, so two requests cannot both rotate it.  A
+    token that was already used is a replay (the client got a new one), so
+    its whole family is revoked and the user has to log in again.
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    digest = refresh_token_digest(body.refresh_token)
+    now = datetime.now(UTC)
+    rotated = (
+        await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == digest,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(used_at=now)
+            .returning(RefreshToken.user_id, RefreshToken.family_id)
+        )
+    ).first()
+
+    if rotated is None:
+        # Not rotatable: unknown, expired, revoked, or used before (a replay).
+        family_id = await db.scalar(
+            select(RefreshToken.family_id).where(
+                RefreshToken.token_hash == digest,
+                RefreshToken.used_at.is_not(None),
+                RefreshToken.revoked_at.is_(None),
+            )
+        )
+        if family_id is not None:
+            await _revoke_refresh_tokens(db, RefreshToken.family_id == family_id)
+            await db.commit()
+        raise invalid
+
+    user = await db.get(UserModel, rotated.user_id)
+    if user is None or not user.is_active:
+        await _revoke_refresh_tokens(db, RefreshToken.family_id == rotated.family_id)
+        await db.commit()
+        raise invalid
+
+    refresh_token = await _issue_refresh_token(db, user.id, rotated.family_id)
+    await db.commit()
+    return {
+        "access_token": _access_token(user),
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+async def _revoke_refresh_tokens(db: AsyncSession, condition) -> None:
+    await db.execute(
+        update(RefreshToken)
+        .where(condition, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(UTC))
     )
-    return {"access_token": access_token, "token_type": "bearer"}
+
+
+@router.post("/logout")
+async def logout(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Sign out everywhere: the caller's refresh tokens and stateless tokens are revoked."""
+    version = await revoke_user_tokens(db, current_user.id)
+    await _revoke_refresh_tokens(db, RefreshToken.user_id == current_user.id)
+    await db.commit()
+    revocation_set.revoke(current_user.id, version)
+    principal_cache.invalidate_user(current_user.id)
+    return {"detail": "Signed out"}
 
 
 @router.get("/me", response_model=User)
-def read_users_me(current_user: UserModel = Depends(get_current_user)):
-    return current_user
+async def read_users_me(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    user = await db.get(UserModel, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return respond(User, user)
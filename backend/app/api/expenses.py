@@ -1,149 +1,237 @@
-# Expenses API — create-and-split + confirm-payment (ID010)
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+# Expenses API — list, create-and-split + confirm-payment (ID010)
+import base64
+import binascii
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, case, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.api.auth import get_current_user
-from app.db.database import get_db
+from app.core.balance_cache import balance_cache
+from app.core.expense_writer import expense_row, insert_expenses, plan_shares
+from app.core.money import format_cents
+from app.core.principal_cache import Principal
+from app.core.splits import SplitError
+from app.db.balances import apply_balance_deltas, share_deltas
+from app.db.database import get_async_db
 from app.models.models import (
     Expense,
     ExpenseShare,
     ExpenseStatus,
     HouseholdMember,
-    User,
-    VoteStatus,
 )
-from app.schemas.schemas import ConfirmPaymentRequest, ExpenseCreate
+from app.schemas.schemas import (
+    ConfirmPaymentRequest,
+    ExpenseBatchCreate,
+    ExpenseBatchItemResult,
+    ExpenseBatchResult,
+    ExpenseCreate,
+    ExpensePage,
+    ExpenseWithShares,
+)
+from app.schemas.schemas import Expense as ExpenseSchema
 
 router = APIRouter()
 
+# Compare-and-set attempts per payment before giving up with 409.
+PAYMENT_CAS_ATTEMPTS = 3
 
-@router.post("/create-and-split", status_code=201)
-def create_and_split(
-    expense_in: ExpenseCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+EXPENSE_PAGE_DEFAULT = 50
+EXPENSE_PAGE_MAX = 200
+
+
+def _encode_cursor(expense: Expense) -> str:
+    raw = f"{expense.date.isoformat()}|{expense.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of ``_encode_cursor``; a malformed cursor is the client's error."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        date, expense_id = raw.split("|")
+        return datetime.fromisoformat(date), int(expense_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+@router.get("", response_model=ExpensePage)
+async def list_expenses(
+    cursor: str | None = None,
+    limit: int = Query(EXPENSE_PAGE_DEFAULT, ge=1, le=EXPENSE_PAGE_MAX),
+    status: ExpenseStatus | None = None,
+    category: str | None = None,
+    creator_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    include_shares: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    # --- 2. Identity check: find user's current household ---
-    membership = (
-        db.query(HouseholdMember)
-        .filter(
+    """List the current household's expenses, newest first.
+
+    Pages are keyed on ``(date, id)`` rather than an OFFSET: the cursor is
+    the last row of the previous page, so every page is an index range scan
+    on ``ix_expenses_household_date_id`` however deep the client has paged.
+    ``date_from`` is inclusive and ``date_to`` exclusive.  With
+    ``include_shares`` the page's shares are loaded by one extra ``IN`` query.
+    """
+    household_id = await db.scalar(
+        select(HouseholdMember.household_id).where(
             HouseholdMember.user_id == current_user.id,
             HouseholdMember.left_at.is_(None),
         )
-        .first()
     )
-
-    if not membership:
+    if household_id is None:
         raise HTTPException(status_code=400, detail="User is not currently in any household")
 
-    roommates = (
-        db.query(HouseholdMember)
-        .filter(
-            HouseholdMember.household_id == membership.household_id,
-            HouseholdMember.user_id != current_user.id,
-            HouseholdMember.left_at.is_(None),
+    query = select(Expense).where(Expense.household_id == household_id)
+    if status is not None:
+        query = query.where(Expense.status == status)
+    if category is not None:
+        query = query.where(Expense.category == category)
+    if creator_id is not None:
+        query = query.where(Expense.creator_id == creator_id)
+    if date_from is not None:
+        query = query.where(Expense.date >= date_from)
+    if date_to is not None:
+        query = query.where(Expense.date < date_to)
+    if cursor is not None:
+        after_date, after_id = _decode_cursor(cursor)
+        query = query.where(
+            or_(
+                Expense.date < after_date,
+                and_(Expense.date == after_date, Expense.id < after_id),
+            )
         )
-        .all()
+    if include_shares:
+        query = query.options(selectinload(Expense.shares))
+
+    # One extra row tells whether there is a next page.
+    rows = list(
+        await db.scalars(query.order_by(Expense.date.desc(), Expense.id.desc()).limit(limit + 1))
     )
+    page, more = rows[:limit], len(rows) > limit
 
-    if not expense_in.include_creator and not roommates:
-        raise HTTPException(
-            status_code=400, detail="No other active members in the household to split with"
-        )
+    schema = ExpenseWithShares if include_shares else ExpenseSchema
+    return ExpensePage(
+        items=[schema.model_validate(expense) for expense in page],
+        next_cursor=_encode_cursor(page[-1]) if more else None,
+    )
 
-    # --- 1. Basic validation: amount ---
-    if expense_in.amount <= 0:
-        raise HTTPException(
-            status_code=400, detail="Cannot create expense: Amount must be greater than zero"
-        )
 
-    # --- 3. Initialize expense ---
-    new_expense = Expense(
-        description=expense_in.description,
-        amount=expense_in.amount,
-        category=expense_in.category,
-        creator_id=current_user.id,
-        household_id=membership.household_id,
-    )
+async def _resolve_household(db: AsyncSession, user_id: int) -> tuple[int, list[int]]:
+    """Return ``(household_id, roommate_ids)`` for the user's current household.
 
-    # --- 4. Split logic ---
-    if expense_in.split_evenly:
-        split_members = []
-        if expense_in.include_creator:
-            split_members.append(current_user.id)
-        for m in roommates:
-            split_members.append(m.user_id)
-
-        num = len(split_members)
-        base_share = round(expense_in.amount / num, 2)
-        sum_of_others = base_share * (num - 1)
-        last_share = round(expense_in.amount - sum_of_others, 2)
-
-        for i, user_id in enumerate(split_members):
-            amt = base_share if i < (num - 1) else last_share
-            is_creator = user_id == current_user.id
-            vote = VoteStatus.ACCEPTED if is_creator else VoteStatus.PENDING
-            new_expense.shares.append(
-                ExpenseShare(
-                    user_id=user_id,
-                    amount_owed=amt,
-                    vote_status=vote,
-                )
-            )
-    else:
-        if not expense_in.manual_shares:
-            raise HTTPException(
-                status_code=400,
-                detail="Manual shares list cannot be empty when split_evenly is False",
+    Membership and roommates come back from one statement: every active
+    member of the household that has ``user_id`` as an active member.
+    """
+    current_household = (
+        select(HouseholdMember.household_id)
+        .where(HouseholdMember.user_id == user_id, HouseholdMember.left_at.is_(None))
+        .limit(1)
+        .scalar_subquery()
+    )
+    rows = (
+        await db.execute(
+            select(HouseholdMember.household_id, HouseholdMember.user_id)
+            .where(
+                HouseholdMember.household_id == current_household,
+                HouseholdMember.left_at.is_(None),
             )
+            .order_by(HouseholdMember.user_id)
+        )
+    ).all()
 
-        valid_ids = {m.user_id for m in roommates}
-        valid_ids.add(current_user.id)
-
-        total_manual = 0
-        for s in expense_in.manual_shares:
-            if s.user_id not in valid_ids:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"User {s.user_id} is not an active member of this household",
-                )
-            if s.amount <= 0:
-                raise HTTPException(
-                    status_code=400, detail=f"Share for user {s.user_id} must be greater than zero"
-                )
-            total_manual += s.amount
-            is_creator = s.user_id == current_user.id
-            vote = VoteStatus.ACCEPTED if is_creator else VoteStatus.PENDING
-            new_expense.shares.append(
-                ExpenseShare(
-                    user_id=s.user_id,
-                    amount_owed=s.amount,
-                    vote_status=vote,
-                )
-            )
+    if not rows:
+        raise HTTPException(status_code=400, detail="User is not currently in any household")
 
-        if abs(total_manual - expense_in.amount) > 0:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Cannot create expense: Split amounts {total_manual:.2f} CAD do not equal expense total {expense_in.amount:.2f} CAD",
-            )
+    return rows[0].household_id, [row.user_id for row in rows if row.user_id != user_id]
 
+
+@router.post("/create-and-split", status_code=201)
+async def create_and_split(
+    expense_in: ExpenseCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    # --- 2. Identity check: find user's current household and roommates ---
+    household_id, roommate_ids = await _resolve_household(db, current_user.id)
+
+    try:
+        shares = plan_shares(expense_in, current_user.id, roommate_ids)
+    except SplitError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+
+    # --- 3. Expense + shares in one transaction ---
+    row = expense_row(expense_in, current_user.id, household_id)
     try:
-        db.add(new_expense)
-        db.commit()
+        await insert_expenses(db, [(row, shares)])
+        await db.commit()
     except Exception:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Database error during creation") from None
+    balance_cache.invalidate(household_id)
 
     return {"detail": "success"}
 
 
+@router.post("/batch", status_code=201, response_model=ExpenseBatchResult)
+async def create_batch(
+    batch_in: ExpenseBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Create many expenses at once (e.g. from a bank export).
+
+    The household is resolved once, every item is validated with the same
+    rules as ``create-and-split``, and all accepted items are written in one
+    transaction.  Results are reported per item, in request order.
+    """
+    household_id, roommate_ids = await _resolve_household(db, current_user.id)
+
+    results = [
+        ExpenseBatchItemResult(index=i, status="created") for i in range(len(batch_in.items))
+    ]
+    planned = []
+    for i, expense_in in enumerate(batch_in.items):
+        try:
+            shares = plan_shares(expense_in, current_user.id, roommate_ids)
+        except SplitError as exc:
+            results[i] = ExpenseBatchItemResult(index=i, status="rejected", detail=str(exc))
+            continue
+        planned.append((i, expense_row(expense_in, current_user.id, household_id), shares))
+
+    rejected = len(batch_in.items) - len(planned)
+    if rejected and batch_in.mode == "all_or_nothing":
+        for i, _, _ in planned:
+            results[i] = ExpenseBatchItemResult(index=i, status="not_created")
+        body = ExpenseBatchResult(created=0, rejected=rejected, results=results)
+        return JSONResponse(status_code=400, content=body.model_dump())
+
+    if planned:
+        try:
+            expense_ids = await insert_expenses(db, [(row, shares) for _, row, shares in planned])
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail="Database error during creation") from None
+        balance_cache.invalidate(household_id)
+        for (i, _, _), expense_id in zip(planned, expense_ids, strict=True):
+            results[i].expense_id = expense_id
+
+    return ExpenseBatchResult(created=len(planned), rejected=rejected, results=results)
+
+
 @router.post("/{expense_id}/confirm-payment", status_code=200)
-def confirm_payment(
+async def confirm_payment(
     expense_id: int,
     body: ConfirmPaymentRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Allow the current user to confirm payment of their share of an expense (ID010)."""
     if body.amount <= 0:
@@ -152,13 +240,11 @@ def confirm_payment(
             detail="Payment amount must be greater than zero",
         )
 
-    membership = (
-        db.query(HouseholdMember)
-        .filter(
+    membership = await db.scalar(
+        select(HouseholdMember).where(
             HouseholdMember.user_id == current_user.id,
             HouseholdMember.left_at.is_(None),
         )
-        .first()
     )
     if not membership:
         raise HTTPException(
@@ -166,46 +252,94 @@ def confirm_payment(
             detail="User is not currently in any household",
         )
 
-    expense = db.query(Expense).filter(Expense.id == expense_id).first()
+    expense = await db.get(Expense, expense_id)
     if not expense or expense.household_id != membership.household_id:
         raise HTTPException(
             status_code=404,
             detail="Expense not found",
         )
 
-    share = (
-        db.query(ExpenseShare)
-        .filter(
-            ExpenseShare.expense_id == expense_id,
-            ExpenseShare.user_id == current_user.id,
+    # Compare-and-set instead of read-modify-write: the increment only applies
+    # while the share still has room for it, so concurrent partial payments
+    # cannot overwrite each other.  A miss re-reads the share and either
+    # reports why the payment no longer fits or tries again.
+    for _ in range(PAYMENT_CAS_ATTEMPTS):
+        share = await db.scalar(
+            select(ExpenseShare)
+            .where(
+                ExpenseShare.expense_id == expense_id,
+                ExpenseShare.user_id == current_user.id,
+            )
+            .execution_options(populate_existing=True)
         )
-        .first()
-    )
-    if not share:
+        if not share:
+            raise HTTPException(
+                status_code=400,
+                detail="Cannot confirm payment: You do not have an expense share for this expense",
+            )
+
+        outstanding = share.amount_owed_cents - share.paid_amount_cents
+        if share.is_paid or outstanding <= 0:
+            raise HTTPException(
+                status_code=400,
+                detail="Cannot confirm payment: Your expense share is already fully paid",
+            )
+        if body.amount > outstanding:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot confirm payment: Amount {format_cents(body.amount)} CAD exceeds outstanding balance of {format_cents(outstanding)} CAD",
+            )
+
+        new_paid = ExpenseShare.paid_amount_cents + body.amount
+        share_paid = await db.scalar(
+            update(ExpenseShare)
+            .where(
+                ExpenseShare.id == share.id,
+                ExpenseShare.is_paid.is_(False),
+                new_paid <= ExpenseShare.amount_owed_cents,
+            )
+            .values(paid_amount_cents=new_paid, is_paid=new_paid >= ExpenseShare.amount_owed_cents)
+            .returning(ExpenseShare.is_paid)
+            .execution_options(synchronize_session=False)
+        )
+        if share_paid is not None:
+            break
+    else:
         raise HTTPException(
-            status_code=400,
-            detail="Cannot confirm payment: You do not have an expense share for this expense",
+            status_code=409,
+            detail="Cannot confirm payment: Share was updated concurrently, please retry",
         )
 
-    outstanding = share.amount_owed - share.paid_amount
-    if share.is_paid or outstanding <= 0:
-        raise HTTPException(
-            status_code=400,
-            detail="Cannot confirm payment: Your expense share is already fully paid",
+    # Settle against the expense's counters in the database rather than
+    # re-reading every share: each payment decrements them atomically, so
+    # concurrent payments cannot both see "one share left".
+    settled = int(share_paid)
+    remaining = Expense.unpaid_share_count - settled
+    status = await db.scalar(
+        update(Expense)
+        .where(Expense.id == expense_id, Expense.unpaid_share_count >= settled)
+        .values(
+            unpaid_share_count=remaining,
+            outstanding_cents=Expense.outstanding_cents - body.amount,
+            status=case(
+                (remaining == 0, ExpenseStatus.FULLY_SETTLED),
+                else_=ExpenseStatus.PARTIALLY_SETTLED,
+            ),
         )
-    if body.amount > outstanding:
+        .returning(Expense.status)
+        .execution_options(synchronize_session=False)
+    )
+    if status is None:
+        await db.rollback()
         raise HTTPException(
-            status_code=400,
-            detail=f"Cannot confirm payment: Amount {body.amount:.2f} CAD exceeds outstanding balance of {outstanding:.2f} CAD",
+            status_code=409,
+            detail="Cannot confirm payment: Expense settlement state changed, please retry",
         )
 
-    share.paid_amount += body.amount
-    if share.paid_amount >= share.amount_owed:
-        share.is_paid = True
-
-    all_shares = db.query(ExpenseShare).filter(ExpenseShare.expense_id == expense_id).all()
-    all_paid = all(s.is_paid for s in all_shares)
-    expense.status = ExpenseStatus.FULLY_SETTLED if all_paid else ExpenseStatus.PARTIALLY_SETTLED
+    deltas: dict[tuple[int, int], int] = {}
+    share_deltas(deltas, expense.household_id, expense.creator_id, current_user.id, -body.amount)
+    await apply_balance_deltas(db, deltas)
 
-    db.commit()
+    await db.commit()
+    balance_cache.invalidate(expense.household_id)
     return {"detail": "Payment recorded"}
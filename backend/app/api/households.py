@@ -1,58 +1,480 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import Row, Select, and_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 
 from app.api.auth import get_current_user
-from app.db.database import get_db
-from app.models.models import Household, HouseholdMember
-from app.models.models import User as UserModel
-from app.schemas.schemas import HouseholdMemberWithUser
+from app.core.balance_cache import balance_cache
+from app.core.invite_codes import invite_code_allocator
+from app.core.join_guard import invite_code_misses, join_attempt_limiter
+from app.core.ledger import Ledger, ledger_from_net
+from app.core.money import CENTS_PER_UNIT, format_cents, from_cents
+from app.core.principal_cache import Principal
+from app.core.responses import respond
+from app.db import expense_import
+from app.db.database import get_async_db
+from app.db.upsert import upsert
+from app.models.models import Expense, ExpenseShare, Household, HouseholdMember, User
+from app.models.models import MemberBalance as MemberBalanceModel
+from app.schemas.schemas import (
+    ExpenseImportError,
+    ExpenseImportResult,
+    HouseholdBalances,
+    HouseholdCreate,
+    HouseholdJoin,
+    HouseholdMemberWithUser,
+    MemberBalance,
+    SettleUpTransfer,
+)
+from app.schemas.schemas import Household as HouseholdSchema
 
 router = APIRouter()
 
+# Rows fetched from the server-side cursor per round-trip (and per chunk sent).
+EXPORT_CHUNK_SIZE = 1000
+
+_EXPORT_CSV_HEADER = (
+    "expense_id",
+    "date",
+    "description",
+    "category",
+    "amount",
+    "status",
+    "creator_id",
+    "share_user_id",
+    "amount_owed",
+    "paid_amount",
+    "is_paid",
+    "vote_status",
+)
+
+
+def _current_household_id(user_id: int):
+    return (
+        select(HouseholdMember.household_id)
+        .where(HouseholdMember.user_id == user_id, HouseholdMember.left_at.is_(None))
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def _membership_upsert(dialect_name: str, user_id: int, household_id: int):
+    """Insert an active membership, or reactivate a former one for the same pair."""
+    table = HouseholdMember.__table__
+    values = {
+        "user_id": user_id,
+        "household_id": household_id,
+        "is_admin": False,
+        "joined_at": datetime.now(UTC),
+        "left_at": None,
+    }
+    return upsert(
+        dialect_name,
+        table,
+        values,
+        index_elements=[table.c.user_id, table.c.household_id],
+        set_=lambda new: {"left_at": None, "joined_at": new.joined_at},
+    )
+
+
+@router.post("", status_code=201, response_model=HouseholdSchema)
+async def create_household(
+    household_in: HouseholdCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Create a household with a fresh invite code; the creator becomes its admin."""
+    if await db.scalar(select(_current_household_id(current_user.id))) is not None:
+        raise HTTPException(status_code=400, detail="User is already in a household")
+
+    async def create(invite_code: str) -> Household:
+        household = Household(**household_in.model_dump(), invite_code=invite_code)
+        db.add(household)
+        await db.flush()
+        # In the same savepoint, so a rejected membership takes the household with it.
+        db.add(HouseholdMember(user_id=current_user.id, household_id=household.id, is_admin=True))
+        await db.flush()
+        return household
+
+    try:
+        household = await invite_code_allocator.insert(db, create)
+    except IntegrityError:
+        # A concurrent create or join gave the user an active membership first.
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="User is already in a household") from None
+    await db.commit()
+    invite_code_misses.discard(household.invite_code)
+    return household
+
+
+@router.post("/join", response_model=HouseholdSchema)
+async def join_household(
+    body: HouseholdJoin,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Join the household an invite code belongs to.
+
+    One indexed lookup finds the household and, in the same statement, the
+    caller's current household; then one upsert adds (or reactivates) the
+    membership.  Joining a household you are already in changes nothing.
+    Wrong codes are cached and counted per client IP, so guessing is
+    answered from memory and cut off with 429 after a few misses.
+    """
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = join_attempt_limiter.retry_after(client_ip)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many invalid invite codes, please retry later",
+            headers={"Retry-After": str(max(int(retry_after), 1))},
+        )
+
+    invite_code = body.invite_code.strip().upper()
+    row = None
+    if invite_code not in invite_code_misses:
+        row = (
+            await db.execute(
+                select(Household, _current_household_id(current_user.id)).where(
+                    Household.invite_code == invite_code
+                )
+            )
+        ).first()
+    if row is None:
+        invite_code_misses.add(invite_code)
+        join_attempt_limiter.record_failure(client_ip)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invalid invite code")
+
+    household, current_household_id = row
+    if current_household_id == household.id:
+        return household
+    if current_household_id is not None:
+        raise HTTPException(status_code=400, detail="User is already in another household")
+
+    try:
+        await db.execute(
+            _membership_upsert(db.get_bind().dialect.name, current_user.id, household.id)
+        )
+    except IntegrityError:
+        # A concurrent create or join gave the user an active membership first.
+        await db.rollback()
+        raise HTTPException(
+            status_code=400, detail="User is already in another household"
+        ) from None
+    await db.commit()
+    return household
+
 
 @router.get("/{household_id}/members", response_model=list[HouseholdMemberWithUser])
-def get_household_members(
+async def get_household_members(
     household_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Return the list of members for a household.
 
     Rules:
     - The household must exist.
     - The requesting user must be an active member of that household.
+
+    One statement answers all three questions: the household row is
+    outer-joined to its active members and their users, so no rows means
+    "not found", and the requester's presence among the members is the
+    authorization check.
     """
+    rows = (
+        await db.execute(
+            select(Household.id, HouseholdMember)
+            .outerjoin(
+                HouseholdMember,
+                and_(
+                    HouseholdMember.household_id == Household.id,
+                    HouseholdMember.left_at.is_(None),
+                ),
+            )
+            .outerjoin(User, User.id == HouseholdMember.user_id)
+            .options(contains_eager(HouseholdMember.user))
+            .where(Household.id == household_id)
+        )
+    ).all()
+
     # Check household exists
-    household = db.query(Household).filter(Household.id == household_id).first()
-    if household is None:
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Household not found",
         )
 
     # Check requesting user is a member
-    membership = (
-        db.query(HouseholdMember)
-        .filter(
-            HouseholdMember.household_id == household_id,
-            HouseholdMember.user_id == current_user.id,
-            HouseholdMember.left_at.is_(None),
+    members = [member for _, member in rows if member is not None]
+    if not any(member.user_id == current_user.id for member in members):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: You are not a member of this household",
         )
-        .first()
-    )
-    if membership is None:
+
+    return respond(list[HouseholdMemberWithUser], members)
+
+
+async def _active_member_ids(db: AsyncSession, household_id: int, user_id: int) -> list[int]:
+    """Active member ids of the household, with the same 404 / 403 rules as the members list."""
+    rows = (
+        await db.execute(
+            select(Household.id, HouseholdMember.user_id)
+            .outerjoin(
+                HouseholdMember,
+                and_(
+                    HouseholdMember.household_id == Household.id,
+                    HouseholdMember.left_at.is_(None),
+                ),
+            )
+            .where(Household.id == household_id)
+        )
+    ).all()
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Household not found",
+        )
+    member_ids = [row.user_id for row in rows if row.user_id is not None]
+    if user_id not in member_ids:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied: You are not a member of this household",
         )
+    return member_ids
+
+
+async def _load_ledger(db: AsyncSession, household_id: int) -> Ledger:
+    """The household's rows of the materialized ``member_balances`` table.
+
+    A primary-key range read: its cost depends on the number of members,
+    not on how many expenses the household has ever had.
+    """
+    rows = await db.execute(
+        select(MemberBalanceModel.user_id, MemberBalanceModel.net_cents).where(
+            MemberBalanceModel.household_id == household_id
+        )
+    )
+    return ledger_from_net({user_id: cents for user_id, cents in rows if cents})
+
+
+@router.get("/{household_id}/balances", response_model=HouseholdBalances)
+async def get_household_balances(
+    household_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Who owes whom in the household, plus a settle-up plan of at most N-1 transfers.
+
+    Every active member is listed (with 0 when square); former members only
+    while they still owe or are owed money.  The ledger is cached per
+    household until the next expense or payment.
+    """
+    member_ids = await _active_member_ids(db, household_id, current_user.id)
+
+    ledger = balance_cache.get(household_id)
+    if ledger is None:
+        generation = balance_cache.generation(household_id)
+        ledger = await _load_ledger(db, household_id)
+        balance_cache.put(household_id, ledger, generation)
+
+    net = dict.fromkeys(member_ids, 0) | {u: c for u, c in ledger.net.items() if c}
+    return HouseholdBalances(
+        household_id=household_id,
+        balances=[
+            MemberBalance(user_id=user_id, net=from_cents(cents))
+            for user_id, cents in sorted(net.items())
+        ],
+        transfers=[
+            SettleUpTransfer(
+                from_user_id=t.debtor_id, to_user_id=t.creditor_id, amount=from_cents(t.cents)
+            )
+            for t in ledger.transfers
+        ],
+    )
+
+
+def _export_query(household_id: int) -> Select:
+    """Every expense of the household with its shares, one row per share."""
+    return (
+        select(
+            Expense.id,
+            Expense.date,
+            Expense.description,
+            Expense.category,
+            Expense.amount_cents,
+            Expense.status,
+            Expense.creator_id,
+            ExpenseShare.user_id,
+            ExpenseShare.amount_owed_cents,
+            ExpenseShare.paid_amount_cents,
+            ExpenseShare.is_paid,
+            ExpenseShare.vote_status,
+        )
+        .outerjoin(ExpenseShare, ExpenseShare.expense_id == Expense.id)
+        .where(Expense.household_id == household_id)
+        .order_by(Expense.date, Expense.id, ExpenseShare.user_id)
+        .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    )
+
+
+async def _export_partitions(db: AsyncSession, household_id: int) -> AsyncIterator[Sequence[Row]]:
+    # Plain column rows, not ORM objects: nothing accumulates in the identity map.
+    result = await db.stream(_export_query(household_id))
+    async for partition in result.partitions():
+        yield partition
+
+
+def _csv_row(row: Row) -> tuple:
+    expense = (
+        row.id,
+        row.date.isoformat() if row.date else "",
+        row.description,
+        row.category or "",
+        format_cents(row.amount_cents),
+        row.status,
+        row.creator_id,
+    )
+    if row.user_id is None:
+        return (*expense, "", "", "", "", "")
+    return (
+        *expense,
+        row.user_id,
+        format_cents(row.amount_owed_cents),
+        format_cents(row.paid_amount_cents),
+        row.is_paid,
+        row.vote_status,
+    )
 
-    # Return all active members of the household
-    members = (
-        db.query(HouseholdMember)
-        .filter(
-            HouseholdMember.household_id == household_id,
-            HouseholdMember.left_at.is_(None),
+
+async def _export_csv(db: AsyncSession, household_id: int) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(_EXPORT_CSV_HEADER)
+    yield buffer.getvalue()
+    async for partition in _export_partitions(db, household_id):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_csv_row(row) for row in partition)
+        yield buffer.getvalue()
+
+
+async def _export_ndjson(db: AsyncSession, household_id: int) -> AsyncIterator[str]:
+    """One JSON object per expense with its shares nested.
+
+    Rows arrive ordered by expense, so an expense is complete as soon as the
+    next one starts; only that one expense is held between chunks.
+    """
+    current: dict | None = None
+    async for partition in _export_partitions(db, household_id):
+        lines = []
+        for row in partition:
+            if current is None or current["id"] != row.id:
+                if current is not None:
+                    lines.append(json.dumps(current))
+                current = {
+                    "id": row.id,
+                    "date": row.date.isoformat() if row.date else None,
+                    "description": row.description,
+                    "category": row.category,
+                    "amount": row.amount_cents / CENTS_PER_UNIT,
+                    "status": row.status,
+                    "creator_id": row.creator_id,
+                    "shares": [],
+                }
+            if row.user_id is not None:
+                current["shares"].append(
+                    {
+                        "user_id": row.user_id,
+                        "amount_owed": row.amount_owed_cents / CENTS_PER_UNIT,
+                        "paid_amount": row.paid_amount_cents / CENTS_PER_UNIT,
+                        "is_paid": row.is_paid,
+                        "vote_status": row.vote_status,
+                    }
+                )
+        if lines:
+            yield "\n".join(lines) + "\n"
+    if current is not None:
+        yield json.dumps(current) + "\n"
+
+
+@router.get("/{household_id}/expenses/export")
+async def export_household_expenses(
+    household_id: int,
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Stream the household's full expense and share history, oldest first.
+
+    CSV has one line per share (expense columns repeated, share columns empty
+    for an expense without shares); NDJSON has one object per expense.  Rows
+    are read through a server-side cursor ``EXPORT_CHUNK_SIZE`` at a time and
+    written out as they arrive, so memory does not grow with the history.
+
+    The body keeps reading through ``db`` after this handler returns; FastAPI
+    0.118+ closes yield dependencies only once the response has been sent.
+    """
+    await _active_member_ids(db, household_id, current_user.id)
+
+    if export_format == "csv":
+        body, media_type = _export_csv(db, household_id), "text/csv"
+    else:
+        body, media_type = _export_ndjson(db, household_id), "application/x-ndjson"
+    filename = f"household-{household_id}-expenses.{export_format}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/{household_id}/expenses/import", response_model=ExpenseImportResult)
+async def import_household_expenses(
+    household_id: int,
+    file: UploadFile = File(...),
+    mode: expense_import.ImportMode = "all_or_nothing",
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Import historical expenses from a CSV upload (columns: see app.db.expense_import).
+
+    The upload is spooled to disk by the server and parsed row by row in a
+    worker thread, so a large file is never held in memory and never stalls
+    the event loop.  Rows are validated and bulk-inserted
+    in chunks; the caller is the default payer.  ``all_or_nothing`` imports
+    nothing and answers 400 if any row is rejected.
+    """
+    await _active_member_ids(db, household_id, current_user.id)
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = await expense_import.import_expenses(
+            db, household_id, current_user.id, expense_import.read_csv(stream), mode=mode
         )
-        .all()
+    except (expense_import.ImportFormatError, UnicodeDecodeError, csv.Error) as exc:
+        raise HTTPException(status_code=400, detail=f"Cannot read CSV: {exc}") from None
+    finally:
+        stream.detach()
+    if report.created:
+        balance_cache.invalidate(household_id)
+
+    body = ExpenseImportResult(
+        created=report.created,
+        rejected=report.rejected,
+        errors=[ExpenseImportError(line=line, detail=detail) for line, detail in report.errors],
     )
-    return members
+    if report.rejected and mode == "all_or_nothing":
+        return JSONResponse(status_code=400, content=body.model_dump())
+    return body
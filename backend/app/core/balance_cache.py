@@ -0,0 +1,55 @@
+"""In-process cache of household ledgers, keyed by household id.
+
+Balances only change when an expense is created or a share is paid, and both
+handlers invalidate the household after committing.  A request that was
+computing the ledger while such a write committed could otherwise store a
+stale result *after* the invalidation, so ``put`` takes the generation read
+before the query and drops the value if the household was invalidated since.
+The TTL bounds staleness from writes made by other processes.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+from app.core.config import settings
+from app.core.ledger import Ledger
+from app.core.ttl_cache import TTLCache
+
+
+class BalanceCache(TTLCache):
+    def __init__(
+        self,
+        maxsize: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(maxsize, ttl_seconds, clock)
+        self._generations: dict[int, int] = {}
+
+    def generation(self, household_id: int) -> int:
+        with self._lock:
+            return self._generations.get(household_id, 0)
+
+    def put(self, household_id: int, ledger: Ledger, generation: int) -> None:
+        with self._lock:
+            if self._generations.get(household_id, 0) != generation:
+                return  # invalidated while the ledger was being computed
+            super().put(household_id, ledger)
+
+    def invalidate(self, household_id: int) -> None:
+        with self._lock:
+            self.pop(household_id)
+            self._generations[household_id] = self._generations.get(household_id, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._generations.clear()
+
+
+balance_cache = BalanceCache(
+    maxsize=settings.BALANCE_CACHE_MAXSIZE,
+    ttl_seconds=settings.BALANCE_CACHE_TTL_SECONDS,
+)
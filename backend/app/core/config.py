@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,11 +12,75 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./expense_tracker.db"
+    # Used by the async handlers; derived from DATABASE_URL when unset
+    # (sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg)
+    ASYNC_DATABASE_URL: str | None = None
+    # What each worker does with the schema at startup:
+    #   verify  - one query confirming the database is at the migration head
+    #   migrate - run `alembic upgrade head` first (single-process setups only)
+    #   off     - nothing
+    SCHEMA_STARTUP_MODE: Literal["verify", "migrate", "off"] = "verify"
+
+    # Connection pool (server databases; SQLite file databases use size/overflow)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+
+    # SQLite pragmas applied to every new connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE: int = -64_000  # negative = KiB, i.e. 64 MiB
+    SQLITE_MMAP_SIZE: int = 268_435_456  # 256 MiB
+    SQLITE_BUSY_TIMEOUT_SECONDS: float = 5.0
 
     # Security
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Issue tokens carrying user id, active flag and token version, authorized
+    # without a users-table read; revocations are reloaded every
+    # REVOCATION_REFRESH_SECONDS (see app.core.revocations)
+    STATELESS_TOKENS: bool = False
+    REVOCATION_REFRESH_SECONDS: float = 5.0
+    # Refresh tokens (POST /auth/refresh) rotate on every use
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # bcrypt work factor (log2 rounds, 4-31); existing hashes are rehashed on login
+    BCRYPT_ROUNDS: int = 12
+
+    # Authenticated-principal cache used by get_current_user (0 disables)
+    PRINCIPAL_CACHE_MAXSIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    # Verified-token cache: decoded claims per raw bearer token, kept until
+    # the token's exp (0 disables)
+    TOKEN_CACHE_MAXSIZE: int = 4096
+
+    # Per-household balances cache; dropped on expense creation and payment,
+    # the TTL bounds staleness from writes made by other processes (0 disables)
+    BALANCE_CACHE_MAXSIZE: int = 1024
+    BALANCE_CACHE_TTL_SECONDS: float = 60.0
+
+    # Free invite codes kept per worker for new households (0 = check a batch
+    # on every creation); a reserved code taken meanwhile is simply retried
+    INVITE_CODE_RESERVOIR_SIZE: int = 0
+
+    # POST /households/join: codes known not to exist are answered from memory,
+    # and each client IP gets JOIN_MAX_FAILED_ATTEMPTS wrong codes per window
+    # (0 disables either guard)
+    INVITE_NEGATIVE_CACHE_MAXSIZE: int = 10_000
+    INVITE_NEGATIVE_CACHE_TTL_SECONDS: float = 60.0
+    JOIN_MAX_FAILED_ATTEMPTS: int = 10
+    JOIN_ATTEMPT_WINDOW_SECONDS: float = 300.0
+
+    # orjson responses, and no output re-validation on routes that opt in via
+    # app.core.responses.respond (needs the `fast` extra)
+    FAST_RESPONSES: bool = False
+
+    # bcrypt worker pool (None = one process per CPU); requests beyond
+    # PASSWORD_HASH_MAX_PENDING queued/running hashes are rejected with 429
+    PASSWORD_HASH_WORKERS: int | None = None
+    PASSWORD_HASH_MAX_PENDING: int = 64
 
     # CORS - comma-separated list of allowed origins
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:8080"]
@@ -0,0 +1,141 @@
+"""Validating and writing expenses, shared by the expenses API and the CSV import.
+
+``plan_shares`` checks an ``ExpenseCreate`` against the household and runs
+the split engine; ``insert_expenses`` writes any number of planned expenses
+with a fixed number of statements.  Invalid input raises ``SplitError`` with
+a user-facing message: the API turns it into a 400, the importer into a
+rejected row.
+"""
+
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import splits
+from app.core.splits import SplitError
+from app.db.balances import apply_balance_deltas, share_deltas
+from app.models.models import Expense, ExpenseShare, VoteStatus
+from app.schemas.schemas import ExpenseCreate
+
+PlannedExpense = tuple[dict[str, Any], list[dict[str, Any]]]
+
+
+def _split_request(
+    expense_in: ExpenseCreate, creator_id: int, roommate_ids: list[int]
+) -> tuple[str, splits.SplitRequest]:
+    """Map the request body onto a split-engine strategy and its input."""
+    if expense_in.split is not None:
+        strategy = expense_in.split.strategy
+        shares = [
+            splits.ShareInput(s.user_id, amount_cents=s.amount, percent=s.percent, weight=s.weight)
+            for s in expense_in.split.shares
+        ]
+        items = [
+            splits.ItemInput(item.amount, tuple(item.user_ids)) for item in expense_in.split.items
+        ]
+    else:
+        # The original API: split_evenly or an explicit manual_shares list.
+        strategy = "even" if expense_in.split_evenly else "manual"
+        shares = [
+            splits.ShareInput(s.user_id, amount_cents=s.amount)
+            for s in expense_in.manual_shares or []
+        ]
+        items = []
+
+    return strategy, splits.SplitRequest(
+        total_cents=expense_in.amount,
+        creator_id=creator_id,
+        roommate_ids=tuple(roommate_ids),
+        include_creator=expense_in.include_creator,
+        shares=tuple(shares),
+        items=tuple(items),
+    )
+
+
+def plan_shares(
+    expense_in: ExpenseCreate, creator_id: int, roommate_ids: list[int]
+) -> list[dict[str, Any]]:
+    """Validate ``expense_in`` and return the share rows to insert (without expense_id).
+
+    Raises ``SplitError`` when the expense cannot be split as requested.
+    """
+    if not expense_in.include_creator and not roommate_ids:
+        raise SplitError("No other active members in the household to split with")
+    if expense_in.amount <= 0:
+        raise SplitError("Cannot create expense: Amount must be greater than zero")
+
+    strategy, request = _split_request(expense_in, creator_id, roommate_ids)
+    allocation = splits.split(strategy, request)
+    return [
+        {
+            "user_id": user_id,
+            "amount_owed_cents": cents,
+            "vote_status": VoteStatus.ACCEPTED if user_id == creator_id else VoteStatus.PENDING,
+        }
+        for user_id, cents in allocation
+    ]
+
+
+def expense_row(
+    expense_in: ExpenseCreate, creator_id: int, household_id: int, **extra: Any
+) -> dict[str, Any]:
+    """The ``expenses`` row for ``expense_in``; ``extra`` adds columns such as ``date``."""
+    return {
+        "description": expense_in.description,
+        "amount_cents": expense_in.amount,
+        "category": expense_in.category,
+        "creator_id": creator_id,
+        "household_id": household_id,
+        **extra,
+    }
+
+
+async def insert_expenses(db: AsyncSession, planned: list[PlannedExpense]) -> list[int]:
+    """Bulk-insert ``(expense_row, share_rows)`` pairs and return the new expense ids.
+
+    Three statements regardless of size: one multi-row INSERT ... RETURNING
+    for the expenses, one executemany for every share and one upsert of the
+    affected member balances.  The caller commits.
+    """
+    expense_rows = [
+        {
+            **row,
+            "unpaid_share_count": len(shares),
+            "outstanding_cents": sum(share["amount_owed_cents"] for share in shares),
+        }
+        for row, shares in planned
+    ]
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite cannot tie RETURNING rows to parameter sets, so asking for
+        # parameter order would make SQLAlchemy send one INSERT per row.  Rowids
+        # are handed out in VALUES order (and writers are serialized), so
+        # sorting the returned ids restores that order.
+        expense_ids = sorted(await db.scalars(insert(Expense).returning(Expense.id), expense_rows))
+    else:
+        expense_ids = list(
+            await db.scalars(
+                insert(Expense).returning(Expense.id, sort_by_parameter_order=True),
+                expense_rows,
+            )
+        )
+    share_rows = [
+        {**share, "expense_id": expense_id}
+        for expense_id, (_, shares) in zip(expense_ids, planned, strict=True)
+        for share in shares
+    ]
+    if share_rows:
+        await db.execute(insert(ExpenseShare), share_rows)
+
+    deltas: dict[tuple[int, int], int] = {}
+    for row, shares in planned:
+        for share in shares:
+            share_deltas(
+                deltas,
+                row["household_id"],
+                row["creator_id"],
+                share["user_id"],
+                share["amount_owed_cents"],
+            )
+    await apply_balance_deltas(db, deltas)
+    return expense_ids
@@ -1,38 +1,141 @@
 from __future__ import annotations
 
 import secrets
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
 
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
 from app.models.models import Household
 
 INVITE_CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
 
 DEFAULT_INVITE_CODE_LENGTH = 8
 
+# Candidates checked per IN (...) query.
+DEFAULT_BATCH_SIZE = 16
+
+T = TypeVar("T")
+
 
 def _random_candidate(length: int) -> str:
     return "".join(secrets.choice(INVITE_CODE_ALPHABET) for _ in range(length))
 
 
+def _check_params(length: int, max_attempts: int) -> None:
+    if length < 4:
+        raise ValueError("Invite code length must be at least 4")
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be >= 1")
+
+
+def _batch(make_candidate: Callable[[int], str], length: int, size: int) -> list[str]:
+    # dict.fromkeys: drop duplicates, keep generation order.
+    return list(dict.fromkeys(make_candidate(length).upper() for _ in range(size)))
+
+
+def _taken_query(candidates: list[str]):
+    return select(Household.invite_code).where(Household.invite_code.in_(candidates))
+
+
 def generate_unique_invite_code(
     db,
     *,
     length: int = DEFAULT_INVITE_CODE_LENGTH,
     max_attempts: int = 1_000,
     candidate_fn: Callable[[int], str] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
 ) -> str:
-    if length < 4:
-        raise ValueError("Invite code length must be at least 4")
-    if max_attempts < 1:
-        raise ValueError("max_attempts must be >= 1")
+    """Return a code no household has yet, checking ``batch_size`` candidates per query.
 
+    Only a snapshot: the caller's INSERT can still lose a race, which the
+    unique index turns into an IntegrityError (see ``InviteCodeAllocator``).
+    """
+    _check_params(length, max_attempts)
     make_candidate = candidate_fn or _random_candidate
 
-    for _ in range(max_attempts):
-        code = make_candidate(length).upper()
-
-        exists = db.query(Household).filter(Household.invite_code == code).first()
-        if not exists:
-            return code
+    tried = 0
+    while tried < max_attempts:
+        size = min(batch_size, max_attempts - tried)
+        candidates = _batch(make_candidate, length, size)
+        tried += size
+        taken = set(db.scalars(_taken_query(candidates)))
+        for code in candidates:
+            if code not in taken:
+                return code
 
     raise RuntimeError("Could not generate a unique invite code")
+
+
+class InviteCodeAllocator:
+    """Hands out invite codes for new households without a query per attempt.
+
+    Candidates are generated ``batch_size`` at a time and checked with one
+    ``IN (...)`` query.  The check is only a filter: ``insert`` relies on the
+    unique index and, if the code was taken in the meantime, retries with the
+    next one inside a savepoint.  With ``reservoir_size`` the free codes of
+    a batch are kept for later calls, so most households are created without
+    any lookup at all.
+    """
+
+    def __init__(
+        self,
+        *,
+        length: int = DEFAULT_INVITE_CODE_LENGTH,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        reservoir_size: int = 0,
+        max_attempts: int = 1_000,
+        candidate_fn: Callable[[int], str] | None = None,
+    ) -> None:
+        _check_params(length, max_attempts)
+        self.length = length
+        self.batch_size = max(batch_size, reservoir_size, 1)
+        self.reservoir_size = reservoir_size
+        self.max_attempts = max_attempts
+        self._make_candidate = candidate_fn or _random_candidate
+        self._reservoir: deque[str] = deque()
+
+    @property
+    def reserved(self) -> int:
+        return len(self._reservoir)
+
+    async def refill(self, db: AsyncSession) -> None:
+        """Check one batch of candidates and keep the free ones."""
+        candidates = _batch(self._make_candidate, self.length, self.batch_size)
+        taken = set(await db.scalars(_taken_query(candidates)))
+        free = [code for code in candidates if code not in taken]
+        self._reservoir.extend(free[: max(self.reservoir_size - len(self._reservoir), 1)])
+
+    async def take(self, db: AsyncSession) -> str:
+        """A code that was free when checked (possibly by an earlier call)."""
+        checked = 0
+        while not self._reservoir:
+            if checked >= self.max_attempts:
+                raise RuntimeError("Could not generate a unique invite code")
+            await self.refill(db)
+            checked += self.batch_size
+        return self._reservoir.popleft()
+
+    async def insert(self, db: AsyncSession, create: Callable[[str], Awaitable[T]]) -> T:
+        """Run ``create(code)`` until it does not collide on ``invite_code``.
+
+        ``create`` must flush its INSERT.  Each attempt runs in a savepoint,
+        so a collision leaves the caller's transaction usable.  Integrity
+        errors that are not about the code are re-raised.
+        """
+        for _ in range(self.max_attempts):
+            code = await self.take(db)
+            try:
+                async with db.begin_nested():
+                    return await create(code)
+            except IntegrityError:
+                if not await db.scalar(_taken_query([code])):
+                    raise
+        raise RuntimeError("Could not generate a unique invite code")
+
+
+invite_code_allocator = InviteCodeAllocator(reservoir_size=settings.INVITE_CODE_RESERVOIR_SIZE)
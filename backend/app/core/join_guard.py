@@ -0,0 +1,103 @@
+"""In-process guards in front of ``POST /households/join``.
+
+Invite codes are short and guessable in bulk, so every wrong guess must be
+cheap and must be counted.  ``NegativeLookupCache`` remembers codes that
+matched no household, so repeating a guess never reaches the database, and
+``AttemptLimiter`` caps failed attempts per client IP in a fixed window.
+Both are bounded LRUs, so spraying codes or addresses cannot grow memory.
+They are per process; the limit across N workers is N times the setting.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+
+
+class NegativeLookupCache(TTLCache):
+    """Keys that recently matched nothing, each remembered for ``ttl_seconds``."""
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def add(self, key: str) -> None:
+        self.put(key, True)
+
+    def discard(self, key: str) -> None:
+        """Forget ``key``, e.g. because a household was just created with it."""
+        self.pop(key)
+
+
+class AttemptLimiter:
+    """At most ``max_attempts`` recorded failures per key in each ``window_seconds``."""
+
+    def __init__(
+        self,
+        max_attempts: int,
+        window_seconds: float,
+        maxsize: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self.maxsize = maxsize
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (window start, failures in the window)
+        self._windows: OrderedDict[str, tuple[float, int]] = OrderedDict()
+        self.blocked = 0
+
+    def retry_after(self, key: str) -> float:
+        """Seconds until ``key`` may try again; 0 if it may try now."""
+        if self.max_attempts <= 0:
+            return 0.0
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                return 0.0
+            start, failures = window
+            remaining = start + self.window_seconds - self._clock()
+            if remaining <= 0:
+                del self._windows[key]
+                return 0.0
+            if failures < self.max_attempts:
+                return 0.0
+            self.blocked += 1
+            return remaining
+
+    def record_failure(self, key: str) -> None:
+        if self.max_attempts <= 0:
+            return
+        with self._lock:
+            now = self._clock()
+            start, failures = self._windows.get(key, (now, 0))
+            if start + self.window_seconds <= now:
+                start, failures = now, 0
+            self._windows[key] = (start, failures + 1)
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.maxsize:
+                self._windows.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._windows.clear()
+            self.blocked = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"blocked": self.blocked, "tracked_clients": len(self._windows)}
+
+
+invite_code_misses = NegativeLookupCache(
+    maxsize=settings.INVITE_NEGATIVE_CACHE_MAXSIZE,
+    ttl_seconds=settings.INVITE_NEGATIVE_CACHE_TTL_SECONDS,
+)
+join_attempt_limiter = AttemptLimiter(
+    max_attempts=settings.JOIN_MAX_FAILED_ATTEMPTS,
+    window_seconds=settings.JOIN_ATTEMPT_WINDOW_SECONDS,
+)
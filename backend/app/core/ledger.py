@@ -0,0 +1,76 @@
+"""Household ledger: who owes whom, and the fewest transfers that settle it.
+
+Every unpaid share is a debt from the share's owner to the expense's
+creator.  ``net_balances`` folds those pairwise debts into one signed amount
+per member, and ``simplify_debts`` turns the net amounts into a short list of
+transfers (min-cash-flow).  All amounts are integer cents.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Transfer:
+    debtor_id: int
+    creditor_id: int
+    cents: int
+
+
+@dataclass(frozen=True, slots=True)
+class Ledger:
+    """Net balance per member (positive: is owed money) and the settle-up plan."""
+
+    net: Mapping[int, int]
+    transfers: tuple[Transfer, ...]
+
+
+def net_balances(debts: Iterable[tuple[int, int, int]]) -> dict[int, int]:
+    """Fold ``(debtor_id, creditor_id, cents)`` debts into net balances."""
+    net: dict[int, int] = {}
+    for debtor_id, creditor_id, cents in debts:
+        net[debtor_id] = net.get(debtor_id, 0) - cents
+        net[creditor_id] = net.get(creditor_id, 0) + cents
+    return net
+
+
+def simplify_debts(net: Mapping[int, int]) -> list[Transfer]:
+    """Settle ``net`` balances with at most N-1 transfers.
+
+    Greedy min-cash-flow: the largest debtor pays the largest creditor as
+    much as one of them needs, which clears at least one member per
+    transfer.  Finding the absolute minimum number of transfers is NP-hard;
+    this bound is what matters in practice.  Ties are broken by user id so
+    the plan is stable between calls.
+    """
+    if sum(net.values()) != 0:
+        raise ValueError("net balances must sum to zero")
+
+    # heapq is a min-heap: store negated amounts to pop the largest first.
+    creditors = [(-cents, user_id) for user_id, cents in net.items() if cents > 0]
+    debtors = [(cents, user_id) for user_id, cents in net.items() if cents < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers = []
+    while creditors and debtors:
+        neg_credit, creditor_id = heapq.heappop(creditors)
+        neg_debt, debtor_id = heapq.heappop(debtors)
+        amount = min(-neg_credit, -neg_debt)
+        transfers.append(Transfer(debtor_id, creditor_id, amount))
+        if -neg_credit > amount:
+            heapq.heappush(creditors, (neg_credit + amount, creditor_id))
+        if -neg_debt > amount:
+            heapq.heappush(debtors, (neg_debt + amount, debtor_id))
+    return transfers
+
+
+def ledger_from_net(net: Mapping[int, int]) -> Ledger:
+    return Ledger(net=dict(net), transfers=tuple(simplify_debts(net)))
+
+
+def build_ledger(debts: Iterable[tuple[int, int, int]]) -> Ledger:
+    return ledger_from_net(net_balances(debts))
@@ -0,0 +1,54 @@
+"""Money as integer minor units (cents).
+
+Amounts are stored, summed and split as ``int`` cents so arithmetic is exact:
+``0.1 + 0.2`` dollars is ``10 + 20`` cents, and a manual split either adds
+up to the expense total or it does not.  Decimal text and JSON numbers are
+converted at the API edge with ``to_cents``; ``format_cents`` renders an
+amount for messages.
+
+Every money column is a 32-bit ``INTEGER``, so one amount is at most
+``MAX_CENTS`` in absolute value; larger inputs are rejected at the edge
+instead of failing in the INSERT.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal, InvalidOperation
+
+CENTS_PER_UNIT = 100
+MAX_CENTS = 2**31 - 1
+_CENT = Decimal("0.01")
+
+
+def to_cents(value: int | float | str | Decimal) -> int:
+    """Convert a major-unit amount (``12.5``, ``"12.50"``) to cents.
+
+    Raises ``ValueError`` rather than rounding: an amount with more than two
+    decimal places (``10.005``) is ambiguous, and one beyond ``MAX_CENTS``
+    does not fit the column.
+    """
+    if isinstance(value, bool):
+        raise ValueError("amount must be a number, not a bool")
+    try:
+        amount = value if isinstance(value, Decimal) else Decimal(str(value))
+        if not amount.is_finite():
+            raise ValueError(f"amount must be finite, got {value!r}")
+        if amount != amount.quantize(_CENT):
+            raise ValueError(f"amount must have at most 2 decimal places, got {value!r}")
+    except InvalidOperation:
+        raise ValueError(f"invalid amount {value!r}") from None
+    cents = int(amount * CENTS_PER_UNIT)
+    if abs(cents) > MAX_CENTS:
+        raise ValueError(f"amount must be at most {format_cents(MAX_CENTS)} in absolute value")
+    return cents
+
+
+def from_cents(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+def format_cents(cents: int) -> str:
+    """``2050`` -> ``"20.50"``, ``-5`` -> ``"-0.05"``."""
+    sign = "-" if cents < 0 else ""
+    units, rest = divmod(abs(cents), CENTS_PER_UNIT)
+    return f"{sign}{units}.{rest:02d}"
@@ -0,0 +1,86 @@
+"""Async-aware bcrypt hashing backed by a bounded process pool.
+
+bcrypt is deliberately slow (hundreds of ms per call).  Running it inline in
+a request handler ties up a worker for that long, so a burst of logins
+starves every other endpoint.  ``PasswordHasher`` moves the work into a
+process pool and caps how many operations may be queued or running at once;
+beyond that cap callers get ``PasswordHasherSaturatedError`` immediately
+instead of piling up behind the pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any
+
+from app.core import security
+from app.core.config import settings
+
+
+class PasswordHasherSaturatedError(RuntimeError):
+    """Raised when the pending-operation limit has been reached."""
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_pending: int = 64,
+        executor_factory: Callable[[int | None], Executor] | None = None,
+    ) -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending must be >= 1")
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor_factory = executor_factory or _process_pool
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(security.get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(security.verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordHasherSaturatedError("Password hashing queue is full")
+            self._pending += 1
+            if self._executor is None:
+                self._executor = self._executor_factory(self.max_workers)
+            executor = self._executor
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+def _process_pool(max_workers: int | None) -> Executor:
+    # "spawn" avoids forking a process that already runs server threads.
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,102 @@
+"""In-process cache of authenticated principals, keyed by token subject.
+
+``get_current_user`` used to load the full ``User`` row on every protected
+request.  Most endpoints only need the id and the active flag, so we keep a
+small bounded LRU of those fields with a TTL.  The TTL bounds staleness for
+changes made by *other* processes; changes made through the ORM in this
+process invalidate the entry via mapper events, at flush and after commit.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+from app.db.after_commit import call_after_commit
+from app.models.models import User
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The subset of a ``User`` row needed to authorize a request."""
+
+    id: int
+    username: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> Principal:
+        return cls(id=user.id, username=user.username, is_active=user.is_active)
+
+
+class PrincipalCache(TTLCache):
+    def __init__(
+        self,
+        maxsize: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(maxsize, ttl_seconds, clock)
+        self._subject_by_id: dict[int, str] = {}
+
+    def put(self, subject: str, principal: Principal) -> None:
+        with self._lock:
+            super().put(subject, principal)
+            if subject in self._entries:
+                self._subject_by_id[principal.id] = subject
+
+    def invalidate(self, subject: str) -> None:
+        self.pop(subject)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            subject = self._subject_by_id.get(user_id)
+            if subject is not None:
+                self.pop(subject)
+
+    def _removed(self, subject: str, principal: Principal) -> None:
+        if self._subject_by_id.get(principal.id) == subject:
+            del self._subject_by_id[principal.id]
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._subject_by_id.clear()
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAXSIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+# ── invalidation ─────────────────────────────────────────────────────────
+# Any ORM insert / update / delete of a User (register, deactivation,
+# profile edits) drops the cached principal, once at flush time and again
+# after the commit: a request reading the user in between still sees the
+# committed row and may have cached it again.  Bulk ``update()`` statements
+# bypass these hooks and are only covered by the TTL.
+
+
+def _evict(user_id: int | None, username: str | None) -> None:
+    if user_id is not None:
+        principal_cache.invalidate_user(user_id)
+    if username is not None:
+        principal_cache.invalidate(username)
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(_mapper, _connection, target: User) -> None:
+    _evict(target.id, target.username)
+    session = object_session(target)
+    if session is not None:
+        call_after_commit(session, partial(_evict, target.id, target.username))
@@ -0,0 +1,103 @@
+"""Opt-in fast JSON responses (``FAST_RESPONSES=true``, needs the ``fast`` extra).
+
+By default FastAPI validates every return value against the route's
+``response_model`` and then serializes it.  For a handler that returns rows
+it just loaded, the validation pass only re-checks what the database already
+guarantees.  In fast mode:
+
+- ``OrjsonResponse`` is the app's default response class, so routes without
+  a response model skip the stdlib encoder.
+- ``respond(schema, obj)`` turns ORM objects straight into JSON with a
+  per-schema dumper compiled once from the schema's fields, and returns the
+  response itself, which FastAPI passes through unvalidated.  The schema
+  stays on the route as ``response_model`` for the OpenAPI docs.
+
+With the mode off ``respond`` returns ``obj`` unchanged and the usual
+validation applies.
+"""
+
+from __future__ import annotations
+
+import types
+import typing
+from collections.abc import Callable
+from functools import cache
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+Dumper = Callable[[Any], Any]
+
+
+class OrjsonResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def check_fast_responses() -> None:
+    if settings.FAST_RESPONSES and orjson is None:
+        raise RuntimeError("FAST_RESPONSES needs orjson: pip install '.[fast]'")
+
+
+def default_response_class() -> type[JSONResponse]:
+    check_fast_responses()
+    return OrjsonResponse if settings.FAST_RESPONSES else JSONResponse
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _value_dumper(annotation: Any) -> Dumper:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return orm_dumper(annotation)
+
+    origin, args = typing.get_origin(annotation), typing.get_args(annotation)
+    if origin is list:
+        item = _value_dumper(args[0])
+        if item is _identity:
+            return list
+        return lambda values: [item(value) for value in values]
+    if origin in (typing.Union, types.UnionType):
+        present = [arg for arg in args if arg is not type(None)]
+        if len(present) != 1:
+            raise TypeError(f"cannot compile a dumper for {annotation!r}")
+        inner = _value_dumper(present[0])
+        if inner is _identity:
+            return inner
+        return lambda value: None if value is None else inner(value)
+    # Scalars (str, int, bool, datetime, enums) are encoded by orjson as they are.
+    return _identity
+
+
+@cache
+def orm_dumper(schema: type[BaseModel]) -> Dumper:
+    """Compile ``obj -> dict`` reading ``schema``'s fields as attributes of ``obj``.
+
+    Only for trusted objects whose attributes already have the schema's
+    types: nothing is checked or coerced.
+    """
+    fields = [(name, _value_dumper(info.annotation)) for name, info in schema.model_fields.items()]
+
+    def dump(obj: Any) -> dict[str, Any]:
+        return {name: dump_value(getattr(obj, name)) for name, dump_value in fields}
+
+    return dump
+
+
+def respond(schema: Any, obj: Any, status_code: int = 200) -> Any:
+    """Return ``obj`` for the route's ``response_model``, or its JSON in fast mode.
+
+    ``schema`` is the route's response model: a model class or ``list[Model]``.
+    """
+    if not settings.FAST_RESPONSES:
+        return obj
+    return OrjsonResponse(_value_dumper(schema)(obj), status_code=status_code)
@@ -0,0 +1,200 @@
+"""Revocation of stateless access tokens (``STATELESS_TOKENS=true``).
+
+A stateless token carries the user id, the active flag and the user's
+``token_version`` at login, so ``get_current_user`` can authorize it without
+reading the ``users`` table.  Signing out everywhere or deactivating a user
+bumps ``token_version`` and records the new minimum in ``token_revocations``.
+Every worker keeps that table in memory:
+
+- a Bloom filter over the revoked user ids answers "certainly not revoked"
+  for almost every request with a few hash probes;
+- an exact ``{user_id: min_version}`` map settles the rare positives (real
+  revocations and ~1% false positives).
+
+The set is rebuilt from the table every ``REVOCATION_REFRESH_SECONDS`` by one
+request; revocations made in this process apply immediately.  Rows older
+than the access-token lifetime no longer matter: every token they revoke
+has expired.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import time
+from collections.abc import Callable, Iterable, Mapping
+from datetime import UTC, datetime, timedelta
+from functools import partial
+
+from sqlalchemy import delete, event, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import object_session
+
+from app.core.config import settings
+from app.db.after_commit import call_after_commit
+from app.db.upsert import upsert
+from app.models.models import TokenRevocation, User
+
+FALSE_POSITIVE_RATE = 0.01
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over integers (no removal; rebuilt instead)."""
+
+    def __init__(self, capacity: int, false_positive_rate: float = FALSE_POSITIVE_RATE) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: int) -> Iterable[int]:
+        # Double hashing: k positions from the two halves of one digest.
+        digest = hashlib.blake2b(value.to_bytes(8, "big", signed=True), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value: int) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: int) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(value))
+
+
+class RevocationSet:
+    def __init__(
+        self,
+        refresh_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._next_refresh = 0.0
+        self._refreshing = False
+        self._replace({})
+        self.refreshes = 0
+        self.exact_checks = 0
+
+    def _replace(self, min_versions: Mapping[int, int]) -> None:
+        bloom = BloomFilter(len(min_versions))
+        for user_id in min_versions:
+            bloom.add(user_id)
+        # One assignment, so readers never see a filter and map that disagree.
+        self._state = (bloom, dict(min_versions))
+
+    def is_revoked(self, user_id: int, version: int) -> bool:
+        bloom, min_versions = self._state
+        if user_id not in bloom:
+            return False
+        self.exact_checks += 1
+        return version < min_versions.get(user_id, 0)
+
+    def revoke(self, user_id: int, min_version: int) -> None:
+        """Apply a revocation committed by this process without waiting for a refresh."""
+        bloom, min_versions = self._state
+        min_versions = {**min_versions, user_id: max(min_version, min_versions.get(user_id, 0))}
+        if user_id in bloom:
+            self._state = (bloom, min_versions)
+        else:
+            self._replace(min_versions)
+
+    def expire(self) -> None:
+        """Reload from the table on the next request."""
+        self._next_refresh = 0.0
+
+    async def refresh_if_due(self, db: AsyncSession) -> None:
+        if self._refreshing or self._clock() < self._next_refresh:
+            return
+        # Concurrent requests keep using the current set meanwhile.
+        self._refreshing = True
+        try:
+            cutoff = datetime.now(UTC) - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+            rows = await db.execute(
+                select(TokenRevocation.user_id, TokenRevocation.min_version).where(
+                    TokenRevocation.revoked_at > cutoff
+                )
+            )
+            self._replace(dict(rows.all()))
+            self._next_refresh = self._clock() + self.refresh_seconds
+            self.refreshes += 1
+        finally:
+            self._refreshing = False
+
+    def clear(self) -> None:
+        self._replace({})
+        self._next_refresh = 0.0
+        self.refreshes = 0
+        self.exact_checks = 0
+
+    def stats(self) -> dict[str, int]:
+        bloom, min_versions = self._state
+        return {
+            "revoked_users": len(min_versions),
+            "bloom_bits": bloom.size,
+            "exact_checks": self.exact_checks,
+            "refreshes": self.refreshes,
+        }
+
+
+revocation_set = RevocationSet(refresh_seconds=settings.REVOCATION_REFRESH_SECONDS)
+
+
+def _revocation_upsert(dialect_name: str, user_id: int, min_version: int):
+    table = TokenRevocation.__table__
+    return upsert(
+        dialect_name,
+        table,
+        {"user_id": user_id, "min_version": min_version, "revoked_at": datetime.now(UTC)},
+        index_elements=[table.c.user_id],
+        set_=lambda new: {"min_version": new.min_version, "revoked_at": new.revoked_at},
+    )
+
+
+async def revoke_user_tokens(db: AsyncSession, user_id: int) -> int:
+    """Revoke every token issued to ``user_id`` so far; returns the new version.
+
+    The caller commits, then calls ``revocation_set.revoke``.  Rows whose
+    tokens have all expired are pruned on the way.
+    """
+    version = await db.scalar(
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+        .returning(User.token_version)
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(_revocation_upsert(db.get_bind().dialect.name, user_id, version))
+    cutoff = datetime.now(UTC) - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    await db.execute(delete(TokenRevocation).where(TokenRevocation.revoked_at <= cutoff))
+    return version
+
+
+# ── deactivation ─────────────────────────────────────────────────────────
+# Deactivating a user through the ORM records the revocation in the same
+# flush and applies it to this process's set once the transaction commits;
+# a refresh running before the commit would not see the row yet.  Bulk
+# ``update()`` statements bypass these hooks.
+
+
+def _deactivated(target: User) -> bool:
+    history = inspect(target).attrs.is_active.history
+    return bool(history.deleted) and target.is_active is False
+
+
+@event.listens_for(User, "before_update")
+def _bump_token_version(_mapper, _connection, target: User) -> None:
+    if _deactivated(target):
+        target.token_version = (target.token_version or 0) + 1
+
+
+@event.listens_for(User, "after_update")
+def _record_deactivation(_mapper, connection, target: User) -> None:
+    if _deactivated(target):
+        connection.execute(
+            _revocation_upsert(connection.dialect.name, target.id, target.token_version)
+        )
+        session = object_session(target)
+        if session is not None:
+            call_after_commit(
+                session, partial(revocation_set.revoke, target.id, target.token_version)
+            )
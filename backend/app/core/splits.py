@@ -0,0 +1,263 @@
+"""Split engine: turn an expense total into per-member shares in integer cents.
+
+Each split strategy is a function registered under a name with
+``register_strategy``.  It maps a ``SplitRequest`` to ``{user_id: cents}``.
+Strategies that divide by a ratio (even, percentage, weighted, the
+tax/tip part of itemized) go through ``allocate_many``.  That is the
+largest-remainder method: everyone gets the floor of their exact quota,
+and the cents left over go to the largest fractional remainders.  Shares
+always add up to the total, and each is within a cent of its exact quota.
+
+Allocation is integer arithmetic in a few list passes plus one partial sort.
+That keeps households with thousands of members cheap.  ``allocate_many``
+splits many totals over the same weights and computes the weight sum once.
+
+Strategies raise ``SplitError`` with a user-facing message; the API layer
+turns it into a 400.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from app.core.money import format_cents
+
+# Decimal places accepted for weights (e.g. a room size of 12.375 m²).
+MAX_WEIGHT_DECIMALS = 6
+
+
+class SplitError(ValueError):
+    """The split cannot be computed from the given input."""
+
+
+@dataclass(frozen=True, slots=True)
+class ShareInput:
+    """One participant line: which field is used depends on the strategy."""
+
+    user_id: int
+    amount_cents: int | None = None
+    percent: Decimal | None = None
+    weight: Decimal | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ItemInput:
+    """A line item shared evenly by ``user_ids`` (itemized splits)."""
+
+    amount_cents: int
+    user_ids: tuple[int, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class SplitRequest:
+    total_cents: int
+    creator_id: int
+    roommate_ids: tuple[int, ...]
+    include_creator: bool = True
+    shares: tuple[ShareInput, ...] = ()
+    items: tuple[ItemInput, ...] = ()
+    member_ids: frozenset[int] = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "member_ids", frozenset((self.creator_id, *self.roommate_ids)))
+
+
+SplitStrategy = Callable[[SplitRequest], dict[int, int]]
+
+_STRATEGIES: dict[str, SplitStrategy] = {}
+
+
+def register_strategy(name: str) -> Callable[[SplitStrategy], SplitStrategy]:
+    def decorator(strategy: SplitStrategy) -> SplitStrategy:
+        if name in _STRATEGIES:
+            raise ValueError(f"split strategy {name!r} is already registered")
+        _STRATEGIES[name] = strategy
+        return strategy
+
+    return decorator
+
+
+def split_strategies() -> tuple[str, ...]:
+    return tuple(_STRATEGIES)
+
+
+def split(strategy: str, request: SplitRequest) -> list[tuple[int, int]]:
+    """Run ``strategy`` and return ``(user_id, cents)`` pairs that sum to the total.
+
+    Zero-cent allocations are dropped: a share nobody can pay would keep the
+    expense from ever settling.
+    """
+    try:
+        run = _STRATEGIES[strategy]
+    except KeyError:
+        raise SplitError(
+            f"Unknown split strategy '{strategy}'. Available: {', '.join(_STRATEGIES)}"
+        ) from None
+    allocation = run(request)
+    if sum(allocation.values()) != request.total_cents:  # pragma: no cover - strategy bug
+        raise AssertionError(f"split strategy {strategy!r} did not allocate the full total")
+    return [(user_id, cents) for user_id, cents in allocation.items() if cents]
+
+
+# ── Allocation ────────────────────────────────────────────────────────────
+
+
+def allocate_many(totals: Sequence[int], weights: Sequence[int]) -> list[list[int]]:
+    """Split each of ``totals`` in proportion to ``weights`` (largest remainder).
+
+    Ties in the remainder go to the earlier position, so results are
+    deterministic.
+    """
+    if not weights:
+        raise SplitError("Nobody to split the expense between")
+    if any(w < 0 for w in weights):
+        raise SplitError("Split weights cannot be negative")
+    weight_sum = sum(weights)
+    if weight_sum == 0:
+        raise SplitError("Split weights must not all be zero")
+
+    positions = range(len(weights))
+    results = []
+    for total in totals:
+        quotas = [divmod(total * w, weight_sum) for w in weights]
+        shares = [quotient for quotient, _ in quotas]
+        shortfall = total - sum(shares)
+        if shortfall:
+            for i in heapq.nlargest(shortfall, positions, key=lambda i: quotas[i][1]):
+                shares[i] += 1
+        results.append(shares)
+    return results
+
+
+def allocate(total: int, weights: Sequence[int]) -> list[int]:
+    return allocate_many([total], weights)[0]
+
+
+def _check_participants(request: SplitRequest, user_ids: Sequence[int]) -> None:
+    seen = set()
+    for user_id in user_ids:
+        if user_id not in request.member_ids:
+            raise SplitError(f"User {user_id} is not an active member of this household")
+        if user_id in seen:
+            raise SplitError(f"User {user_id} appears more than once in the split")
+        seen.add(user_id)
+
+
+def _require_shares(request: SplitRequest, strategy: str) -> tuple[ShareInput, ...]:
+    if not request.shares:
+        raise SplitError(f"A {strategy} split needs at least one share")
+    _check_participants(request, [s.user_id for s in request.shares])
+    return request.shares
+
+
+def _integer_weights(values: Sequence[Decimal]) -> list[int]:
+    """Scale decimal weights by a common power of ten so they become exact integers."""
+    decimals = max(max(0, -v.as_tuple().exponent) for v in values)
+    if decimals > MAX_WEIGHT_DECIMALS:
+        raise SplitError(f"Split weights allow at most {MAX_WEIGHT_DECIMALS} decimal places")
+    scale = 10**decimals
+    return [int(v * scale) for v in values]
+
+
+# ── Strategies ────────────────────────────────────────────────────────────
+
+
+@register_strategy("even")
+def even_split(request: SplitRequest) -> dict[int, int]:
+    """Everyone in the household (optionally without the creator) pays the same."""
+    members = [request.creator_id] if request.include_creator else []
+    members.extend(request.roommate_ids)
+    return dict(zip(members, allocate(request.total_cents, [1] * len(members)), strict=True))
+
+
+@register_strategy("manual")
+def manual_split(request: SplitRequest) -> dict[int, int]:
+    """Explicit amounts per member that must add up to the total exactly."""
+    if not request.shares:
+        raise SplitError("Manual shares list cannot be empty when split_evenly is False")
+
+    allocation = {}
+    for share in request.shares:
+        if share.user_id not in request.member_ids:
+            raise SplitError(f"User {share.user_id} is not an active member of this household")
+        if share.amount_cents is None or share.amount_cents <= 0:
+            raise SplitError(f"Share for user {share.user_id} must be greater than zero")
+        if share.user_id in allocation:
+            raise SplitError(f"User {share.user_id} appears more than once in the split")
+        allocation[share.user_id] = share.amount_cents
+
+    total_manual = sum(allocation.values())
+    if total_manual != request.total_cents:
+        raise SplitError(
+            f"Cannot create expense: Split amounts {format_cents(total_manual)} CAD "
+            f"do not equal expense total {format_cents(request.total_cents)} CAD"
+        )
+    return allocation
+
+
+@register_strategy("percentage")
+def percentage_split(request: SplitRequest) -> dict[int, int]:
+    """Percentages per member (up to two decimals) that add up to 100."""
+    shares = _require_shares(request, "percentage")
+    basis_points = []
+    for share in shares:
+        if share.percent is None or share.percent <= 0:
+            raise SplitError(f"Percentage for user {share.user_id} must be greater than zero")
+        points = share.percent * 100
+        if points != points.to_integral_value():
+            raise SplitError("Percentages allow at most two decimal places")
+        basis_points.append(int(points))
+    if sum(basis_points) != 100 * 100:
+        raise SplitError(
+            f"Percentages must add up to 100, got {Decimal(sum(basis_points)).scaleb(-2)}"
+        )
+    amounts = allocate(request.total_cents, basis_points)
+    return dict(zip((s.user_id for s in shares), amounts, strict=True))
+
+
+@register_strategy("weighted")
+def weighted_split(request: SplitRequest) -> dict[int, int]:
+    """Split in proportion to arbitrary positive weights (room size, income, ...)."""
+    shares = _require_shares(request, "weighted")
+    for share in shares:
+        if share.weight is None or share.weight <= 0:
+            raise SplitError(f"Weight for user {share.user_id} must be greater than zero")
+    amounts = allocate(request.total_cents, _integer_weights([s.weight for s in shares]))
+    return dict(zip((s.user_id for s in shares), amounts, strict=True))
+
+
+@register_strategy("itemized")
+def itemized_split(request: SplitRequest) -> dict[int, int]:
+    """Each item is split evenly among the members who had it.
+
+    Whatever the items do not cover (tax, tip, delivery) is spread in
+    proportion to each member's item subtotal.
+    """
+    if not request.items:
+        raise SplitError("An itemized split needs at least one item")
+
+    subtotals: dict[int, int] = {}
+    for item in request.items:
+        if item.amount_cents <= 0:
+            raise SplitError("Item amounts must be greater than zero")
+        if not item.user_ids:
+            raise SplitError("Every item needs at least one member")
+        _check_participants(request, item.user_ids)
+        for user_id, cents in zip(
+            item.user_ids, allocate(item.amount_cents, [1] * len(item.user_ids)), strict=True
+        ):
+            subtotals[user_id] = subtotals.get(user_id, 0) + cents
+
+    items_total = sum(subtotals.values())
+    extra = request.total_cents - items_total
+    if extra < 0:
+        raise SplitError(
+            f"Cannot create expense: Item amounts {format_cents(items_total)} CAD "
+            f"exceed expense total {format_cents(request.total_cents)} CAD"
+        )
+    user_ids = list(subtotals)
+    surcharge = allocate(extra, [subtotals[u] for u in user_ids])
+    return {u: subtotals[u] + s for u, s in zip(user_ids, surcharge, strict=True)}
@@ -0,0 +1,48 @@
+"""In-process cache of verified access tokens, keyed by the raw token string.
+
+A client sends the same bearer token on every request until it expires, and
+``jwt.decode`` (signature check, JSON parse, claim validation) is the one
+cost ``get_current_user`` pays on every call even when the principal cache
+or the stateless path spares the database.  ``TokenCache`` remembers the
+claims of tokens that decoded successfully until their ``exp``, so a token is
+verified once per process.
+
+Only the decode is cached.  Whatever the claims authorize is still checked
+on every request (principal cache, revocation set), so signing out or
+deactivating a user takes effect exactly as without the cache.  Tokens that
+fail to decode are never stored.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+
+Claims = dict[str, Any]
+
+
+class TokenCache(TTLCache):
+    def __init__(self, maxsize: int, clock: Callable[[], float] = time.time) -> None:
+        # ``exp`` is a Unix timestamp, so the clock is wall time, not monotonic.
+        super().__init__(maxsize, clock=clock)
+
+    def get(self, token: str) -> Claims | None:
+        """The claims of ``token`` if it was verified before and has not expired.
+
+        The dict is shared between requests: read it, do not modify it.
+        """
+        return super().get(token)
+
+    def put(self, token: str, claims: Claims) -> None:
+        """Remember the claims of a token that just passed ``jwt.decode``, until its ``exp``."""
+        expires_at = claims.get("exp")
+        # Tokens without a numeric exp are verified every time rather than kept forever.
+        if isinstance(expires_at, int | float):
+            super().put(token, claims, expires_at=expires_at)
+
+
+token_cache = TokenCache(maxsize=settings.TOKEN_CACHE_MAXSIZE)
@@ -0,0 +1,93 @@
+"""Bounded, thread-safe LRU whose entries expire; the base of the in-process caches.
+
+Every entry carries its own deadline on ``clock``: ``ttl_seconds`` from when
+it was stored, or an explicit ``expires_at`` (the token cache keeps claims
+until the token's ``exp``).  Expired entries are dropped when they are next
+read, and the least recently used entry is evicted beyond ``maxsize``.
+Subclasses add their own bookkeeping under ``_lock`` (re-entrant) and learn
+about every entry that leaves through ``_removed``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class TTLCache:
+    def __init__(
+        self,
+        maxsize: int,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and (self.ttl_seconds is None or self.ttl_seconds > 0)
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                self.pop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, expires_at: float | None = None) -> None:
+        """Store ``value`` until ``expires_at`` on the clock, by default ``ttl_seconds`` from now."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if expires_at is None:
+                if self.ttl_seconds is None:
+                    raise ValueError("expires_at is required when the cache has no ttl_seconds")
+                expires_at = self._clock() + self.ttl_seconds
+            self.pop(key)
+            self._entries[key] = (expires_at, value)
+            while len(self._entries) > self.maxsize:
+                self.pop(next(iter(self._entries)))
+
+    def pop(self, key: Hashable) -> Any:
+        """Remove ``key`` without counting a lookup; returns its value if it was cached."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._removed(key, entry[1])
+            return entry[1]
+
+    def _removed(self, key: Hashable, value: Any) -> None:
+        """Called (under the lock) for every entry that expires, is evicted or popped."""
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
@@ -0,0 +1,33 @@
+"""Defer in-process side effects of a write until its transaction commits.
+
+Mapper events fire at flush time, while the transaction is still open.
+Another request reading the database in between sees the old row and can
+put it straight back into an in-process cache that the flush just cleared.
+``call_after_commit`` queues a callback on the session instead: it runs
+once the outermost transaction commits and is dropped if it rolls back.
+"""
+
+from collections.abc import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+_CALLBACKS = "after_commit_callbacks"
+
+
+def call_after_commit(session: Session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` after ``session`` next commits; forget it on rollback."""
+    session.info.setdefault(_CALLBACKS, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_callbacks(session: Session) -> None:
+    for callback in session.info.pop(_CALLBACKS, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_callbacks(session: Session, previous_transaction: SessionTransaction) -> None:
+    # A savepoint rolling back leaves the outer transaction (and its writes) alive.
+    if previous_transaction.parent is None:
+        session.info.pop(_CALLBACKS, None)
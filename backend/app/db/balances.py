@@ -0,0 +1,183 @@
+"""Maintenance of the materialized ``member_balances`` table.
+
+Request handlers call ``apply_balance_deltas`` inside their own transaction,
+so balances move together with the expenses and payments that change them.
+This module is also the CLI that checks the table against the shares, or
+rebuilds it from scratch:
+
+    python -m app.db.balances                      # verify, exit 1 on drift
+    python -m app.db.balances --rebuild            # recompute every row
+    python -m app.db.balances --chunk-size 5000    # rows fetched per round-trip
+
+Both commands stream the recomputed balances ordered by (household, user)
+through a server-side cursor, so memory stays flat however long the
+history is.
+"""
+
+import argparse
+import sys
+from collections.abc import Iterator, Mapping
+
+from sqlalchemy import Connection, Select, delete, func, insert, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import create_db_engine
+from app.db.upsert import upsert
+from app.models.models import Expense, ExpenseShare, MemberBalance
+
+DEFAULT_CHUNK_SIZE = 1000
+
+_table = MemberBalance.__table__
+
+
+def _upsert(dialect_name: str):
+    """INSERT ... adding ``net_cents`` onto an existing row for the same member."""
+    return upsert(
+        dialect_name,
+        _table,
+        index_elements=[_table.c.household_id, _table.c.user_id],
+        set_=lambda new: {"net_cents": _table.c.net_cents + new.net_cents},
+    )
+
+
+async def apply_balance_deltas(db: AsyncSession, deltas: Mapping[tuple[int, int], int]) -> None:
+    """Add ``{(household_id, user_id): cents}`` to the members' balances (one statement).
+
+    The caller owns the transaction.  The increment happens in the database,
+    so concurrent writers cannot lose each other's updates.
+    """
+    rows = [
+        {"household_id": household_id, "user_id": user_id, "net_cents": cents}
+        for (household_id, user_id), cents in deltas.items()
+        if cents
+    ]
+    if rows:
+        await db.execute(_upsert(db.get_bind().dialect.name), rows)
+
+
+def share_deltas(
+    deltas: dict[tuple[int, int], int],
+    household_id: int,
+    creator_id: int,
+    debtor_id: int,
+    cents: int,
+) -> None:
+    """Record that ``debtor_id`` owes ``creator_id`` ``cents`` more (negative: less)."""
+    if debtor_id == creator_id or not cents:
+        return
+    deltas[household_id, creator_id] = deltas.get((household_id, creator_id), 0) + cents
+    deltas[household_id, debtor_id] = deltas.get((household_id, debtor_id), 0) - cents
+
+
+def computed_balances() -> Select:
+    """Balances recomputed from the shares, ordered by (household_id, user_id)."""
+    outstanding = ExpenseShare.amount_owed_cents - ExpenseShare.paid_amount_cents
+    joined = (ExpenseShare.expense_id == Expense.id, ExpenseShare.user_id != Expense.creator_id)
+    credits = select(
+        Expense.household_id, Expense.creator_id.label("user_id"), outstanding.label("delta")
+    ).where(*joined)
+    debits = select(
+        Expense.household_id, ExpenseShare.user_id, (-outstanding).label("delta")
+    ).where(*joined)
+    deltas = union_all(credits, debits).subquery()
+    return (
+        select(deltas.c.household_id, deltas.c.user_id, func.sum(deltas.c.delta))
+        .group_by(deltas.c.household_id, deltas.c.user_id)
+        .order_by(deltas.c.household_id, deltas.c.user_id)
+    )
+
+
+def _stream(conn: Connection, stmt: Select, chunk_size: int) -> Iterator[tuple[int, int, int]]:
+    result = conn.execution_options(yield_per=chunk_size).execute(stmt)
+    for partition in result.partitions():
+        yield from partition
+
+
+def _merge(
+    stored: Iterator[tuple[int, int, int]], computed: Iterator[tuple[int, int, int]]
+) -> Iterator[tuple[tuple[int, int], int, int]]:
+    """Walk two streams sorted by (household, user); yield ``(key, stored, computed)``."""
+    sentinel = (sys.maxsize, sys.maxsize, 0)
+    a, b = next(stored, sentinel), next(computed, sentinel)
+    while a is not sentinel or b is not sentinel:
+        key_a, key_b = (a[0], a[1]), (b[0], b[1])
+        if key_a == key_b:
+            yield key_a, a[2], b[2]
+            a, b = next(stored, sentinel), next(computed, sentinel)
+        elif key_a < key_b:
+            yield key_a, a[2], 0
+            a = next(stored, sentinel)
+        else:
+            yield key_b, 0, b[2]
+            b = next(computed, sentinel)
+
+
+def verify(conn: Connection, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[tuple]:
+    """Return ``((household_id, user_id), stored, expected)`` for every drifted balance."""
+    stored = select(_table.c.household_id, _table.c.user_id, _table.c.net_cents).order_by(
+        _table.c.household_id, _table.c.user_id
+    )
+    # Two cursors at once: SQLite and psycopg both allow it on one connection.
+    return [
+        (key, have, want)
+        for key, have, want in _merge(
+            _stream(conn, stored, chunk_size), _stream(conn, computed_balances(), chunk_size)
+        )
+        if have != want
+    ]
+
+
+def rebuild(conn: Connection, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Replace every row with balances recomputed from the shares; returns rows written."""
+    conn.execute(delete(_table))
+    written = 0
+    result = conn.execution_options(yield_per=chunk_size).execute(computed_balances())
+    for partition in result.partitions():
+        rows = [
+            {"household_id": household_id, "user_id": user_id, "net_cents": net}
+            for household_id, user_id, net in partition
+            if net
+        ]
+        if rows:
+            conn.execute(insert(_table), rows)
+            written += len(rows)
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="balances", description="Verify or rebuild the member_balances table."
+    )
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL from the settings")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="recompute the table instead of verifying it"
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    engine = create_db_engine(args.database_url)
+    try:
+        if args.rebuild:
+            with engine.begin() as conn:
+                written = rebuild(conn, args.chunk_size)
+            print(f"member_balances rebuilt: {written} rows")  # noqa: T201
+            return 0
+
+        with engine.connect() as conn:
+            drift = verify(conn, args.chunk_size)
+        for (household_id, user_id), have, want in drift[:20]:
+            print(  # noqa: T201
+                f"household {household_id} user {user_id}: stored {have}, expected {want}",
+                file=sys.stderr,
+            )
+        if drift:
+            print(f"{len(drift)} balances differ; run with --rebuild", file=sys.stderr)  # noqa: T201
+            return 1
+        print("member_balances OK")  # noqa: T201
+        return 0
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
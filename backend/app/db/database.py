@@ -1,11 +1,143 @@
-from sqlalchemy import create_engine
+from collections.abc import AsyncIterator
+from typing import Any
+
+from sqlalchemy import URL, Engine, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
+# Async driver used for each backend when ASYNC_DATABASE_URL is not set.
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+_POOL_SIZING_KWARGS = ("pool_size", "max_overflow", "pool_recycle", "pool_timeout")
+
+
+def _is_memory_database(url: URL) -> bool:
+    return not url.database or url.database == ":memory:"
+
+
+def _sqlite_pragmas(url: URL) -> dict[str, Any]:
+    pragmas: dict[str, Any] = {
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+    }
+    # WAL needs a real file; in-memory databases ignore it.
+    if not _is_memory_database(url):
+        pragmas = {"journal_mode": settings.SQLITE_JOURNAL_MODE, **pragmas}
+    return pragmas
+
+
+def _default_pool_is_sized(url: URL) -> bool:
+    """Whether the dialect's own pool for ``url`` takes ``pool_size``/``max_overflow``.
+
+    Not a given for SQLite files: SQLAlchemy before 2.0.38 pools aiosqlite
+    with ``NullPool``, which rejects them.
+    """
+    return issubclass(url.get_dialect().get_pool_class(url), QueuePool)
+
+
+def _engine_kwargs(url: URL, overrides: dict[str, Any]) -> dict[str, Any]:
+    kwargs: dict[str, Any]
+    if url.get_backend_name() == "sqlite":
+        kwargs = {
+            "connect_args": {
+                "check_same_thread": False,
+                "timeout": settings.SQLITE_BUSY_TIMEOUT_SECONDS,
+            }
+        }
+        if _is_memory_database(url):
+            # Every connection to ":memory:" is a new database; share one.
+            kwargs["poolclass"] = StaticPool
+        elif _default_pool_is_sized(url):
+            kwargs["pool_size"] = settings.DB_POOL_SIZE
+            kwargs["max_overflow"] = settings.DB_MAX_OVERFLOW
+    else:
+        kwargs = {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+            "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        }
+
+    if "poolclass" in overrides:
+        # A caller-chosen pool (e.g. NullPool) may not accept sizing options.
+        for key in _POOL_SIZING_KWARGS:
+            kwargs.pop(key, None)
+    kwargs.update(overrides)
+    return kwargs
+
+
+def _install_sqlite_pragmas(db_engine: Engine, url: URL) -> None:
+    pragmas = _sqlite_pragmas(url)
+
+    @event.listens_for(db_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_db_engine(database_url: str | None = None, **engine_kwargs: Any) -> Engine:
+    """Build an engine for ``database_url`` (default: ``settings.DATABASE_URL``).
+
+    SQLite gets ``check_same_thread=False``, a busy timeout and the
+    ``SQLITE_*`` pragmas applied on every new connection.  Server databases
+    (PostgreSQL, MySQL) get a sized connection pool with pre-ping and
+    recycling.  Extra keyword arguments override the computed defaults.
+    """
+    url = make_url(database_url or settings.DATABASE_URL)
+    db_engine = create_engine(url, **_engine_kwargs(url, engine_kwargs))
+    if url.get_backend_name() == "sqlite":
+        _install_sqlite_pragmas(db_engine, url)
+    return db_engine
+
+
+def async_database_url(database_url: str | None = None) -> URL:
+    """Return the async-driver URL matching ``database_url``.
+
+    ``settings.ASYNC_DATABASE_URL`` wins when set; otherwise the driver of
+    ``DATABASE_URL`` is swapped for the backend's entry in ``ASYNC_DRIVERS``.
+    """
+    if database_url is None and settings.ASYNC_DATABASE_URL:
+        return make_url(settings.ASYNC_DATABASE_URL)
+    url = make_url(database_url or settings.DATABASE_URL)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None or url.get_driver_name() == driver:
+        return url
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}")
+
+
+def create_async_db_engine(database_url: str | None = None, **engine_kwargs: Any) -> AsyncEngine:
+    """Async counterpart of ``create_db_engine`` with the same pool and pragma settings."""
+    url = async_database_url(database_url)
+    db_engine = create_async_engine(url, **_engine_kwargs(url, engine_kwargs))
+    if url.get_backend_name() == "sqlite":
+        _install_sqlite_pragmas(db_engine.sync_engine, url)
+    return db_engine
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_db_engine()
+# expire_on_commit=False: attribute access after commit must not trigger IO.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     pass
@@ -17,3 +149,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,315 @@
+"""Bulk import of historical expenses from CSV.
+
+Used by ``POST /households/{id}/expenses/import`` and as a CLI:
+
+    python -m app.db.expense_import expenses.csv --household-id 3 --as alice
+    python -m app.db.expense_import expenses.csv --household-id 3 --as alice --best-effort
+
+Columns (header row required, extra columns are ignored):
+
+- ``description``, ``amount``: required
+- ``date``: ISO 8601 (an offset is converted to UTC), defaults to the time
+  of the import
+- ``category``
+- ``paid_by``: username of the member who paid, defaults to the importer
+- ``split_with``: ``;``-separated usernames sharing the amount evenly,
+  defaults to every active member
+- ``shares``: manual amounts instead, e.g. ``alice:12.50;bob:7.50``
+
+Rows are read lazily and handled ``chunk_size`` at a time: each chunk is
+validated against ``ExpenseCreate`` with the same split rules as
+``create-and-split`` in a worker thread, then written with the three bulk
+statements of ``app.core.expense_writer.insert_expenses``.  Usernames
+resolve through one map loaded up front.
+Everything happens in one transaction; ``all_or_nothing`` rolls it back if
+any row is rejected, ``best_effort`` commits the valid rows.
+"""
+
+import argparse
+import asyncio
+import csv
+import sys
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from itertools import islice
+from typing import Any, Literal, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.expense_writer import PlannedExpense, expense_row, insert_expenses, plan_shares
+from app.db.database import create_async_db_engine
+from app.models.models import HouseholdMember, User
+from app.schemas.schemas import ExpenseCreate
+
+DEFAULT_CHUNK_SIZE = 1000
+# Rejected rows listed in the report; the count is always exact.
+MAX_REPORTED_ERRORS = 100
+
+REQUIRED_COLUMNS = frozenset({"description", "amount"})
+
+ImportMode = Literal["all_or_nothing", "best_effort"]
+
+
+class ImportFormatError(ValueError):
+    """The file itself is unusable (not a single row was looked at)."""
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    rejected: int = 0
+    # (line, detail) of the first MAX_REPORTED_ERRORS rejected rows.
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def reject(self, line: int, detail: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, detail))
+
+
+@dataclass(frozen=True, slots=True)
+class _Members:
+    by_username: dict[str, int]
+    active_ids: tuple[int, ...]
+
+
+def read_csv(stream: TextIO) -> Iterator[tuple[int, dict[str, str]]]:
+    """Yield ``(line_number, row)`` lazily; raises ImportFormatError for a bad header."""
+    reader = csv.DictReader(stream)
+    columns = {name.strip() for name in reader.fieldnames or ()}
+    missing = REQUIRED_COLUMNS - columns
+    if missing:
+        raise ImportFormatError(f"Missing column(s): {', '.join(sorted(missing))}")
+    for row in reader:
+        yield (
+            reader.line_num,
+            {key.strip(): (value or "").strip() for key, value in row.items() if key},
+        )
+
+
+async def _load_members(db: AsyncSession, household_id: int) -> _Members:
+    """Every member who ever belonged to the household: history may name former members."""
+    rows = await db.execute(
+        select(User.username, User.id, HouseholdMember.left_at)
+        .join(HouseholdMember, HouseholdMember.user_id == User.id)
+        .where(HouseholdMember.household_id == household_id)
+        .order_by(User.id)
+    )
+    by_username, active_ids = {}, []
+    for username, user_id, left_at in rows:
+        by_username[username] = user_id
+        if left_at is None:
+            active_ids.append(user_id)
+    return _Members(by_username, tuple(active_ids))
+
+
+def _user_id(members: _Members, username: str) -> int:
+    try:
+        return members.by_username[username]
+    except KeyError:
+        raise ValueError(f"Unknown household member '{username}'") from None
+
+
+def _plan_row(
+    row: dict[str, str], members: _Members, household_id: int, importer_id: int, now: datetime
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Turn one CSV row into ``(expense_row, share_rows)``; raises ValueError when invalid."""
+    payer_id = _user_id(members, row["paid_by"]) if row.get("paid_by") else importer_id
+    payload: dict[str, Any] = {
+        "description": row["description"],
+        "amount": row["amount"],
+        "category": row.get("category") or None,
+    }
+    if row.get("shares"):
+        manual = []
+        for entry in row["shares"].split(";"):
+            username, _, amount = entry.partition(":")
+            manual.append({"user_id": _user_id(members, username.strip()), "amount": amount})
+        payload |= {"split_evenly": False, "include_creator": True, "manual_shares": manual}
+        roommate_ids = [user_id for user_id in members.by_username.values() if user_id != payer_id]
+    else:
+        if row.get("split_with"):
+            names = [name.strip() for name in row["split_with"].split(";") if name.strip()]
+            participants = [_user_id(members, name) for name in names]
+        else:
+            participants = list(members.active_ids)
+        payload |= {"split_evenly": True, "include_creator": payer_id in participants}
+        roommate_ids = list(dict.fromkeys(p for p in participants if p != payer_id))
+
+    try:
+        expense_in = ExpenseCreate.model_validate(payload)
+    except ValidationError as exc:
+        error = exc.errors()[0]
+        location = ".".join(str(part) for part in error["loc"])
+        raise ValueError(f"{location}: {error['msg']}" if location else error["msg"]) from None
+    # SplitError is a ValueError: the row is rejected with its message.
+    shares = plan_shares(expense_in, payer_id, roommate_ids)
+
+    date = datetime.fromisoformat(row["date"]) if row.get("date") else now
+    if date.tzinfo is not None:
+        # Stored as naive UTC like every other timestamp; naive dates are taken as UTC.
+        date = date.astimezone(UTC).replace(tzinfo=None)
+    return expense_row(expense_in, payer_id, household_id, date=date), shares
+
+
+def _plan_chunk(
+    rows: Iterator[tuple[int, dict[str, str]]],
+    chunk_size: int,
+    members: _Members,
+    household_id: int,
+    importer_id: int,
+    now: datetime,
+) -> tuple[int, list[PlannedExpense], list[tuple[int, str]]]:
+    """Read the next ``chunk_size`` rows and plan them: ``(rows read, planned, rejected)``."""
+    planned, rejected = [], []
+    count = 0
+    for line, row in islice(rows, chunk_size):
+        count += 1
+        try:
+            planned.append(_plan_row(row, members, household_id, importer_id, now))
+        except ValueError as exc:
+            rejected.append((line, str(exc)))
+    return count, planned, rejected
+
+
+async def import_expenses(
+    db: AsyncSession,
+    household_id: int,
+    importer_id: int,
+    rows: Iterable[tuple[int, dict[str, str]]],
+    *,
+    mode: ImportMode = "all_or_nothing",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Callable[[ImportReport], None] | None = None,
+) -> ImportReport:
+    """Validate and insert ``rows`` (from ``read_csv``) chunk by chunk, then commit.
+
+    Each chunk is read and validated in a worker thread, so a large upload
+    does not hold up the event loop; only the inserts run on it.
+
+    In ``all_or_nothing`` mode the first rejected row stops the inserts; the
+    remaining rows are still validated so the report lists every problem.
+    """
+    members = await _load_members(db, household_id)
+    report = ImportReport()
+    now = datetime.now(UTC)
+    rows = iter(rows)
+    try:
+        while True:
+            # Reading the file, parsing CSV and validating rows is blocking work.
+            count, planned, rejected = await asyncio.to_thread(
+                _plan_chunk, rows, chunk_size, members, household_id, importer_id, now
+            )
+            if not count:
+                break
+            report.rows += count
+            for line, detail in rejected:
+                report.reject(line, detail)
+            if planned and not (mode == "all_or_nothing" and report.rejected):
+                await insert_expenses(db, planned)
+                report.created += len(planned)
+            if progress is not None:
+                progress(report)
+
+        if report.rejected and mode == "all_or_nothing":
+            await db.rollback()
+            report.created = 0
+        else:
+            await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return report
+
+
+def _print_progress(report: ImportReport) -> None:
+    print(  # noqa: T201
+        f"\r{report.rows} rows: {report.created} created, {report.rejected} rejected "
+        f"({report.rows_per_second:,.0f} rows/s)",
+        end="",
+        file=sys.stderr,
+    )
+
+
+async def _run(args: argparse.Namespace) -> int:
+    engine = create_async_db_engine(args.database_url)
+    try:
+        async with async_sessionmaker(engine, autoflush=False)() as db:
+            importer_id = await db.scalar(
+                select(User.id)
+                .join(HouseholdMember, HouseholdMember.user_id == User.id)
+                .where(
+                    User.username == args.username,
+                    HouseholdMember.household_id == args.household_id,
+                    HouseholdMember.left_at.is_(None),
+                )
+            )
+            if importer_id is None:
+                print(  # noqa: T201
+                    f"{args.username} is not an active member of household {args.household_id}",
+                    file=sys.stderr,
+                )
+                return 2
+            with open(args.file, encoding="utf-8-sig", newline="") as stream:
+                report = await import_expenses(
+                    db,
+                    args.household_id,
+                    importer_id,
+                    read_csv(stream),
+                    mode=args.mode,
+                    chunk_size=args.chunk_size,
+                    progress=_print_progress,
+                )
+    finally:
+        await engine.dispose()
+
+    print(file=sys.stderr)  # noqa: T201
+    for line, detail in report.errors:
+        print(f"line {line}: {detail}", file=sys.stderr)  # noqa: T201
+    if report.rejected and args.mode == "all_or_nothing":
+        print(f"{report.rejected} rows rejected; nothing imported", file=sys.stderr)  # noqa: T201
+        return 1
+    print(f"imported {report.created} expenses, {report.rejected} rows rejected")  # noqa: T201
+    return 1 if report.rejected else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="expense_import", description="Import historical expenses from a CSV file."
+    )
+    parser.add_argument("file")
+    parser.add_argument("--household-id", type=int, required=True)
+    parser.add_argument(
+        "--as", dest="username", required=True, help="importing member; the default payer"
+    )
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL from the settings")
+    parser.add_argument(
+        "--best-effort",
+        dest="mode",
+        action="store_const",
+        const="best_effort",
+        default="all_or_nothing",
+        help="import the valid rows even if others are rejected",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(_run(args))
+    except (ImportFormatError, UnicodeDecodeError, csv.Error) as exc:
+        print(f"cannot read {args.file}: {exc}", file=sys.stderr)  # noqa: T201
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Schema migrations: the ``migrate`` CLI and the startup revision check.
+
+    python -m app.db.migrate                 # upgrade the database to head
+    python -m app.db.migrate --revision 0002 # upgrade to a specific revision
+    python -m app.db.migrate --check         # exit 1 unless the database is at head
+
+Downgrades go through the ``alembic`` command directly.  Migrations are run
+once per deployment with this command; each server worker then only confirms
+the revision with a single query at startup, instead of every worker
+reflecting and creating tables concurrently.
+"""
+
+import argparse
+import asyncio
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import NullPool
+
+from app.db.database import create_async_db_engine
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """The database is not at the migration head this code expects."""
+
+
+def alembic_config(database_url: str | None = None, *, configure_logger: bool = True) -> Config:
+    cfg = Config(str(BACKEND_DIR / "alembic.ini"))
+    cfg.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    if database_url:
+        cfg.set_main_option("sqlalchemy.url", database_url)
+    cfg.attributes["configure_logger"] = configure_logger
+    return cfg
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> str:
+    """The newest revision in ``migrations/versions`` (read from disk, no DB access)."""
+    head = ScriptDirectory.from_config(alembic_config()).get_current_head()
+    if head is None:
+        raise SchemaOutOfDateError("No migration revisions found")
+    return head
+
+
+def upgrade(
+    database_url: str | None = None, revision: str = "head", *, configure_logger: bool = True
+) -> None:
+    command.upgrade(alembic_config(database_url, configure_logger=configure_logger), revision)
+
+
+async def current_revision(db_engine: AsyncEngine) -> str | None:
+    """Return the stamped revision, or None if the database was never migrated."""
+    try:
+        async with db_engine.connect() as conn:
+            return await conn.scalar(text("SELECT version_num FROM alembic_version"))
+    except DBAPIError:
+        return None
+
+
+async def verify_schema(db_engine: AsyncEngine) -> None:
+    current = await current_revision(db_engine)
+    expected = head_revision()
+    if current != expected:
+        raise SchemaOutOfDateError(
+            f"Database schema is at revision {current or '<none>'}, expected {expected}. "
+            "Run `python -m app.db.migrate` before starting the server."
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="migrate", description="Apply database migrations.")
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL from the settings")
+    parser.add_argument("--revision", default="head", help="target revision (default: head)")
+    parser.add_argument(
+        "--check", action="store_true", help="only verify that the database is at head"
+    )
+    args = parser.parse_args(argv)
+
+    if args.check:
+        db_engine = create_async_db_engine(args.database_url, poolclass=NullPool)
+
+        async def _verify() -> None:
+            try:
+                await verify_schema(db_engine)
+            finally:
+                await db_engine.dispose()
+
+        try:
+            asyncio.run(_verify())
+        except SchemaOutOfDateError as exc:
+            print(exc, file=sys.stderr)  # noqa: T201
+            return 1
+        return 0
+
+    upgrade(args.database_url, args.revision)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""Column types shared by the models.
+
+Timestamps are stored as naive UTC in ``timestamp without time zone``
+columns, while the application computes them as aware values
+(``datetime.now(UTC)``, token expiries, client-supplied dates with an
+offset).  SQLite and psycopg drop or convert the offset silently, but
+asyncpg refuses an aware value for a naive column.  ``UTCDateTime``
+converts aware values to naive UTC before they reach any driver, so every
+dialect stores the same wall time and reads back naive UTC.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator
+
+
+class UTCDateTime(TypeDecorator):
+    """``DateTime`` that binds aware values as naive UTC; naive values are taken as UTC."""
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value: datetime | None, dialect: Dialect) -> datetime | None:
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(UTC).replace(tzinfo=None)
+        return value
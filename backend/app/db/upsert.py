@@ -0,0 +1,53 @@
+"""Dialect-specific ``INSERT ... ON CONFLICT`` for the databases we run on.
+
+SQLite and PostgreSQL spell it ``ON CONFLICT (...) DO UPDATE`` and name the
+incoming row ``excluded``; MySQL spells it ``ON DUPLICATE KEY UPDATE`` (the
+conflict target is implied by the keys) and names it ``inserted``.  ``upsert``
+hides the difference: ``set_`` receives the incoming row's columns and
+returns the assignments.  Any other dialect raises ``NotImplementedError``
+instead of producing SQL it may not understand.
+"""
+
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import ColumnElement, Table
+from sqlalchemy.sql.dml import Insert
+
+SUPPORTED_DIALECTS = ("mysql", "postgresql", "sqlite")
+
+
+def upsert(
+    dialect_name: str,
+    table: Table,
+    values: Mapping[str, Any] | None = None,
+    *,
+    index_elements: Sequence[ColumnElement],
+    set_: Callable[[Any], Mapping[str, Any]],
+) -> Insert:
+    """INSERT into ``table``, updating ``set_(incoming)`` on a conflict on ``index_elements``.
+
+    Leave ``values`` out to execute the statement with a list of rows.
+    """
+    if dialect_name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        stmt = mysql_insert(table)
+        if values is not None:
+            stmt = stmt.values(values)
+        return stmt.on_duplicate_key_update(set_(stmt.inserted))
+
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise NotImplementedError(
+            f"upsert is not implemented for {dialect_name!r} "
+            f"(supported: {', '.join(SUPPORTED_DIALECTS)})"
+        )
+
+    stmt = dialect_insert(table)
+    if values is not None:
+        stmt = stmt.values(values)
+    return stmt.on_conflict_do_update(index_elements=index_elements, set_=set_(stmt.excluded))
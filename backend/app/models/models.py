@@ -1,10 +1,21 @@
 import enum
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
+from app.core.money import CENTS_PER_UNIT
 from app.db.database import Base
+from app.db.types import UTCDateTime
 
 # ---------------------------------------------------------------------------
 # Enums (stored as String in the database via Enum(..., native_enum=False))
@@ -39,7 +50,10 @@ class User(Base):
     password_hash = Column(String, nullable=False)
     full_name = Column(String)
     is_active = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(UTC))
+    # Embedded in stateless access tokens; bumping it revokes every token
+    # issued before (see app.core.revocations).
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     household_memberships = relationship("HouseholdMember", back_populates="user")
@@ -60,7 +74,7 @@ class Household(Base):
     description = Column(String)
     invite_code = Column(String, unique=True, index=True, nullable=False)
     address = Column(String)
-    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(UTC))
 
     # Relationships
     members = relationship("HouseholdMember", back_populates="household")
@@ -78,8 +92,31 @@ class HouseholdMember(Base):
     user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
     household_id = Column(Integer, ForeignKey("households.id"), primary_key=True)
     is_admin = Column(Boolean, default=False, nullable=False)
-    joined_at = Column(DateTime, default=lambda: datetime.now(UTC))
-    left_at = Column(DateTime, nullable=True)
+    joined_at = Column(UTCDateTime, default=lambda: datetime.now(UTC))
+    left_at = Column(UTCDateTime, nullable=True)
+
+    # Partial index over *active* memberships only (left_at IS NULL), which is
+    # what every membership lookup filters on.  Lookups by user_id already use
+    # the primary key, whose leading column it is.
+    # The unique one lets a user hold one active membership even when two
+    # joins race past the "already in a household" check.  Without partial
+    # indexes (MySQL) it would forbid former memberships too, so it is skipped.
+    __table_args__ = (
+        Index(
+            "ix_household_members_active_household",
+            "household_id",
+            "user_id",
+            sqlite_where=left_at.is_(None),
+            postgresql_where=left_at.is_(None),
+        ),
+        Index(
+            "uq_household_members_active_user",
+            "user_id",
+            unique=True,
+            sqlite_where=left_at.is_(None),
+            postgresql_where=left_at.is_(None),
+        ).ddl_if(dialect=("sqlite", "postgresql")),
+    )
 
     # Relationships
     user = relationship("User", back_populates="household_memberships")
@@ -95,25 +132,37 @@ class Expense(Base):
     __tablename__ = "expenses"
 
     id = Column(Integer, primary_key=True, index=True)
-    amount = Column(Float, nullable=False)
+    amount_cents = Column(Integer, nullable=False)
     description = Column(String, nullable=False)
     category = Column(String)
-    date = Column(DateTime, default=lambda: datetime.now(UTC))
+    date = Column(UTCDateTime, nullable=False, default=lambda: datetime.now(UTC))
     status = Column(
         Enum(ExpenseStatus, native_enum=False),
         default=ExpenseStatus.PENDING,
         nullable=False,
     )
+    # Denormalized from the shares and kept in step by the payment path, so a
+    # status change is one conditional UPDATE instead of reloading every share.
+    unpaid_share_count = Column(Integer, nullable=False, default=0, server_default="0")
+    outstanding_cents = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Foreign keys
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     household_id = Column(Integer, ForeignKey("households.id"), nullable=False)
 
+    # Serves the listing's keyset: WHERE household_id = ? ORDER BY date, id.
+    __table_args__ = (Index("ix_expenses_household_date_id", "household_id", "date", "id"),)
+
     # Relationships
     creator = relationship("User", back_populates="created_expenses")
     household = relationship("Household", back_populates="expenses")
     shares = relationship("ExpenseShare", back_populates="expense")
 
+    @property
+    def amount(self) -> float:
+        """The amount in dollars, for display; arithmetic uses ``amount_cents``."""
+        return self.amount_cents / CENTS_PER_UNIT
+
 
 # ---------------------------------------------------------------------------
 # ExpenseShare
@@ -126,8 +175,9 @@ class ExpenseShare(Base):
     id = Column(Integer, primary_key=True, index=True)
     expense_id = Column(Integer, ForeignKey("expenses.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    amount_owed = Column(Float, nullable=False, default=0.0)
-    paid_amount = Column(Float, nullable=False, default=0.0)
+    # Money columns hold integer cents (see app.core.money).
+    amount_owed_cents = Column(Integer, nullable=False, default=0)
+    paid_amount_cents = Column(Integer, nullable=False, default=0)
     is_paid = Column(Boolean, default=False, nullable=False)
     vote_status = Column(
         Enum(VoteStatus, native_enum=False),
@@ -135,6 +185,81 @@ class ExpenseShare(Base):
         nullable=False,
     )
 
+    # One share per user per expense; its index also serves expense_id lookups.
+    __table_args__ = (
+        UniqueConstraint("expense_id", "user_id", name="uq_expense_shares_expense_user"),
+    )
+
     # Relationships
     expense = relationship("Expense", back_populates="shares")
     user = relationship("User", back_populates="expense_shares")
+
+    @property
+    def amount_owed(self) -> float:
+        return self.amount_owed_cents / CENTS_PER_UNIT
+
+    @property
+    def paid_amount(self) -> float:
+        return self.paid_amount_cents / CENTS_PER_UNIT
+
+
+# ---------------------------------------------------------------------------
+# MemberBalance  (materialized net balance per household member)
+# ---------------------------------------------------------------------------
+
+
+class MemberBalance(Base):
+    """Running net balance in cents: positive is owed money, negative owes money.
+
+    Maintained incrementally in the same transaction as expense creation and
+    payments; ``python -m app.db.balances`` verifies or rebuilds it.
+    """
+
+    __tablename__ = "member_balances"
+
+    household_id = Column(Integer, ForeignKey("households.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    net_cents = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+# ---------------------------------------------------------------------------
+# TokenRevocation
+# ---------------------------------------------------------------------------
+
+
+class TokenRevocation(Base):
+    """Stateless tokens of ``user_id`` with a version below ``min_version`` are revoked.
+
+    One row per user, only needed until the last revoked token expires.
+    """
+
+    __tablename__ = "token_revocations"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    min_version = Column(Integer, nullable=False)
+    revoked_at = Column(UTCDateTime, nullable=False, default=lambda: datetime.now(UTC))
+
+
+# ---------------------------------------------------------------------------
+# RefreshToken
+# ---------------------------------------------------------------------------
+
+
+class RefreshToken(Base):
+    """One issued refresh token, stored as the SHA-256 hex digest of its value.
+
+    Each use rotates it: ``used_at`` is set and a new token joins the same
+    ``family_id``.  Presenting a used token again means it leaked, and the
+    whole family is revoked.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    family_id = Column(String(32), nullable=False, index=True)
+    created_at = Column(UTCDateTime, nullable=False, default=lambda: datetime.now(UTC))
+    expires_at = Column(UTCDateTime, nullable=False)
+    used_at = Column(UTCDateTime, nullable=True)
+    revoked_at = Column(UTCDateTime, nullable=True)
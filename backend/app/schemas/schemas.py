@@ -1,8 +1,30 @@
 from datetime import datetime
+from decimal import Decimal
+from typing import Annotated, Literal
+
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    EmailStr,
+    Field,
+    PlainSerializer,
+    WithJsonSchema,
+    model_validator,
+)
+
+from app.core.money import CENTS_PER_UNIT, to_cents
+from app.models.models import ExpenseStatus, VoteStatus
 
-from pydantic import BaseModel, ConfigDict, EmailStr
+# ── Money ────────────────────────────────────────────────────────────────
 
-from app.models.models import ExpenseStatus, VoteStatus
+# A dollar amount on the wire (``12.5``, ``"12.50"``), integer cents in Python.
+Money = Annotated[
+    int,
+    BeforeValidator(to_cents),
+    PlainSerializer(lambda cents: cents / CENTS_PER_UNIT, return_type=float),
+    WithJsonSchema({"type": "number", "multipleOf": 0.01}),
+]
 
 # ── User schemas ──────────────────────────────────────────────────────────
 
@@ -86,17 +108,41 @@ class Household(HouseholdBase):
     created_at: datetime
 
 
+class HouseholdJoin(BaseModel):
+    invite_code: str
+
+
 class HouseholdWithMembers(Household):
     members: list[HouseholdMemberWithUser] = []
 
 
+class MemberBalance(BaseModel):
+    user_id: int
+    # Positive: the member is owed money; negative: the member owes money.
+    net: Money
+
+
+class SettleUpTransfer(BaseModel):
+    from_user_id: int
+    to_user_id: int
+    amount: Money
+
+
+class HouseholdBalances(BaseModel):
+    """Net balance per member and the fewest transfers that settle them."""
+
+    household_id: int
+    balances: list[MemberBalance]
+    transfers: list[SettleUpTransfer]
+
+
 # ── ExpenseShare schemas ─────────────────────────────────────────────────
 
 
 class ExpenseShareBase(BaseModel):
     user_id: int
-    amount_owed: float
-    paid_amount: float = 0.0
+    amount_owed: Money
+    paid_amount: Money = 0
     is_paid: bool = False
     vote_status: VoteStatus = VoteStatus.PENDING
 
@@ -116,7 +162,7 @@ class ExpenseShare(ExpenseShareBase):
 
 
 class ExpenseBase(BaseModel):
-    amount: float
+    amount: Money
     description: str
     category: str | None = None
     date: datetime | None = None
@@ -135,24 +181,104 @@ class ExpenseWithShares(Expense):
     shares: list[ExpenseShare] = []
 
 
+class ExpensePage(BaseModel):
+    """One page of ``GET /expenses``; pass ``next_cursor`` back to get the next one."""
+
+    # Plain expenses unless ``include_shares`` was requested.
+    items: list[Expense | ExpenseWithShares]
+    next_cursor: str | None = None
+
+
 class ManualShare(BaseModel):
     user_id: int
-    amount: float
+    amount: Money
+
+
+class SplitShare(BaseModel):
+    """A participant in a split; the strategy decides which value it reads."""
+
+    user_id: int
+    amount: Money | None = None  # manual
+    percent: Decimal | None = None  # percentage
+    weight: Decimal | None = None  # weighted
+
+
+class SplitItem(BaseModel):
+    """An itemized line shared evenly by ``user_ids``."""
+
+    amount: Money
+    user_ids: list[int] = Field(min_length=1)
+    description: str | None = None
+
+
+class SplitSpec(BaseModel):
+    """Which split strategy to use (see app.core.splits) and its inputs."""
+
+    strategy: str
+    shares: list[SplitShare] = []
+    items: list[SplitItem] = []
 
 
 class ExpenseCreate(BaseModel):
     description: str
-    amount: float
+    amount: Money
     category: str | None = None
-    split_evenly: bool
-    include_creator: bool
+    # Legacy split selection, required unless ``split`` is given.
+    split_evenly: bool = False
+    include_creator: bool = True
     manual_shares: list[ManualShare] | None = None
+    split: SplitSpec | None = None
+
+    @model_validator(mode="after")
+    def _require_split_selection(self) -> "ExpenseCreate":
+        if self.split is None:
+            missing = {"split_evenly", "include_creator"} - self.model_fields_set
+            if missing:
+                raise ValueError(f"{', '.join(sorted(missing))} required when split is not given")
+        return self
+
+
+class ExpenseBatchCreate(BaseModel):
+    """Several expenses for the caller's household, written in one transaction.
+
+    ``all_or_nothing`` writes nothing if any item is invalid; ``best_effort``
+    writes the valid items and reports the rest.
+    """
+
+    items: list[ExpenseCreate] = Field(min_length=1, max_length=1000)
+    mode: Literal["all_or_nothing", "best_effort"] = "all_or_nothing"
+
+
+class ExpenseBatchItemResult(BaseModel):
+    index: int
+    status: Literal["created", "rejected", "not_created"]
+    expense_id: int | None = None
+    detail: str | None = None
+
+
+class ExpenseBatchResult(BaseModel):
+    created: int
+    rejected: int
+    results: list[ExpenseBatchItemResult]
+
+
+class ExpenseImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class ExpenseImportResult(BaseModel):
+    """Outcome of a CSV import; ``errors`` lists at most the first 100 rejected rows."""
+
+    created: int
+    rejected: int
+    errors: list[ExpenseImportError]
 
 
 class ConfirmPaymentRequest(BaseModel):
     """Request body for confirming payment of an expense share."""
 
-    amount: float
+    amount: Money
 
 
 # ── Token schemas ────────────────────────────────────────────────────────
@@ -161,6 +287,11 @@ class ConfirmPaymentRequest(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 
 class TokenData(BaseModel):
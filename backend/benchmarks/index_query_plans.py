@@ -0,0 +1,170 @@
+"""Query plans and timings for the membership/share lookups, before and after 0002.
+
+Builds a throw-away SQLite database at revision 0001, seeds it, prints the
+``EXPLAIN QUERY PLAN`` and mean latency of each hot lookup, then upgrades to
+0002 and repeats.  The by-user membership lookup is a control: it uses the
+primary key at both revisions.
+
+    cd backend
+    python -m benchmarks.index_query_plans [--households 5000] [--repeat 2000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+from alembic import command
+from sqlalchemy import Engine, MetaData, Table, insert, select, text
+
+from app.db.database import create_db_engine
+from app.db.migrate import alembic_config
+
+MEMBERS_PER_HOUSEHOLD = 5
+EXPENSES_PER_HOUSEHOLD = 20
+
+
+def _reflect(engine: Engine) -> dict[str, Table]:
+    # The models track the latest revision; seed and query the 0001 tables as they are.
+    metadata = MetaData()
+    metadata.reflect(engine)
+    return metadata.tables
+
+
+def _seed(engine: Engine, tables: dict[str, Table], households: int) -> None:
+    now = datetime.now(UTC)
+    n_users = households * MEMBERS_PER_HOUSEHOLD
+    with engine.begin() as conn:
+        conn.execute(
+            insert(tables["users"]),
+            [
+                {
+                    "id": i,
+                    "username": f"u{i}",
+                    "email": f"u{i}@x.io",
+                    "password_hash": "x",
+                    "is_active": True,
+                }
+                for i in range(1, n_users + 1)
+            ],
+        )
+        conn.execute(
+            insert(tables["households"]),
+            [
+                {"id": h, "name": f"h{h}", "invite_code": f"C{h:07d}"}
+                for h in range(1, households + 1)
+            ],
+        )
+        members = []
+        for h in range(1, households + 1):
+            for k in range(MEMBERS_PER_HOUSEHOLD):
+                user_id = (h - 1) * MEMBERS_PER_HOUSEHOLD + k + 1
+                # Every other household has one former member (left_at set).
+                left_at = now if k == MEMBERS_PER_HOUSEHOLD - 1 and h % 2 else None
+                members.append(
+                    {"user_id": user_id, "household_id": h, "is_admin": False, "left_at": left_at}
+                )
+        conn.execute(insert(tables["household_members"]), members)
+
+        expenses, shares = [], []
+        expense_id = 0
+        for h in range(1, households + 1):
+            first_user = (h - 1) * MEMBERS_PER_HOUSEHOLD + 1
+            for _ in range(EXPENSES_PER_HOUSEHOLD):
+                expense_id += 1
+                expenses.append(
+                    {
+                        "id": expense_id,
+                        "amount": 50.0,
+                        "description": "seed",
+                        "status": "PENDING",
+                        "creator_id": first_user,
+                        "household_id": h,
+                    }
+                )
+                for k in range(MEMBERS_PER_HOUSEHOLD):
+                    shares.append(
+                        {
+                            "expense_id": expense_id,
+                            "user_id": first_user + k,
+                            "amount_owed": 10.0,
+                            "paid_amount": 0.0,
+                            "is_paid": False,
+                            "vote_status": "PENDING",
+                        }
+                    )
+        conn.execute(insert(tables["expenses"]), expenses)
+        conn.execute(insert(tables["expense_shares"]), shares)
+        conn.execute(text("ANALYZE"))
+
+
+def _queries(tables: dict[str, Table], households: int):
+    h = random.Random(households).randint(1, households)  # same rows before and after
+    user_id = (h - 1) * MEMBERS_PER_HOUSEHOLD + 2
+    expense_id = (h - 1) * EXPENSES_PER_HOUSEHOLD + 1
+    members, shares = tables["household_members"], tables["expense_shares"]
+    return {
+        "active membership by user": select(members).where(
+            members.c.user_id == user_id, members.c.left_at.is_(None)
+        ),
+        "active members of household": select(members).where(
+            members.c.household_id == h, members.c.left_at.is_(None)
+        ),
+        "share by expense and user": select(shares).where(
+            shares.c.expense_id == expense_id, shares.c.user_id == user_id
+        ),
+    }
+
+
+def _report(engine: Engine, label: str, households: int, repeat: int) -> dict[str, float]:
+    print(f"\n=== {label} ===")
+    timings = {}
+    with engine.connect() as conn:
+        for name, stmt in _queries(_reflect(engine), households).items():
+            sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(stmt).all()
+            timings[name] = (time.perf_counter() - start) / repeat * 1e6
+            print(f"- {name}: {timings[name]:.1f} µs/query")
+            for row in plan:
+                print(f"    {row[-1]}")
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--households", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        cfg = alembic_config(url, configure_logger=False)
+        engine = create_db_engine(url)
+
+        command.upgrade(cfg, "0001")
+        _seed(engine, _reflect(engine), args.households)
+        before = _report(
+            engine, "revision 0001 (no covering indexes)", args.households, args.repeat
+        )
+
+        engine.dispose()
+        command.upgrade(cfg, "0002")
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        after = _report(
+            engine, "revision 0002 (partial + unique indexes)", args.households, args.repeat
+        )
+        engine.dispose()
+
+    print("\n=== speed-up ===")
+    for name in before:
+        print(f"- {name}: {before[name] / after[name]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Requests/sec of ``/auth/me`` and the members list with FAST_RESPONSES off and on.
+
+Seeds a throw-away SQLite database with one household, then drives the app
+in-process through httpx's ASGI transport (no network, no server), so the
+numbers isolate handler, validation and serialization cost.
+
+    cd backend
+    python -m benchmarks.json_responses [--members 50] [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.database import Base, create_async_db_engine, create_db_engine, get_async_db
+from app.models.models import Household, HouseholdMember, User
+from main import app
+
+
+def _seed(url: str, members: int) -> None:
+    engine = create_db_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {
+                    "id": i,
+                    "username": f"u{i}",
+                    "email": f"u{i}@x.io",
+                    "password_hash": "x",
+                    "full_name": f"User {i}",
+                }
+                for i in range(1, members + 1)
+            ],
+        )
+        conn.execute(insert(Household), [{"id": 1, "name": "bench", "invite_code": "BENCH001"}])
+        conn.execute(
+            insert(HouseholdMember),
+            [{"user_id": i, "household_id": 1} for i in range(1, members + 1)],
+        )
+    engine.dispose()
+
+
+async def _rate(client: httpx.AsyncClient, url: str, headers: dict, requests: int) -> float:
+    for _ in range(50):  # warm-up: principal cache, connection, dumpers
+        (await client.get(url, headers=headers)).raise_for_status()
+    start = time.perf_counter()
+    for _ in range(requests):
+        await client.get(url, headers=headers)
+    return requests / (time.perf_counter() - start)
+
+
+async def _run(url: str, requests: int) -> dict[str, dict[bool, float]]:
+    engine = create_async_db_engine(url)
+    sessions = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def get_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = get_db
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'u1'})}"}
+    routes = {
+        "GET /auth/me": f"{settings.API_V1_STR}/auth/me",
+        "GET /households/1/members": f"{settings.API_V1_STR}/households/1/members",
+    }
+    results: dict[str, dict[bool, float]] = {name: {} for name in routes}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for fast in (False, True):
+                settings.FAST_RESPONSES = fast
+                for name, route in routes.items():
+                    results[name][fast] = await _rate(client, route, headers, requests)
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        _seed(url, args.members)
+        results = asyncio.run(_run(url, args.requests))
+
+    print(f"{'route':<28}{'default':>12}{'fast':>12}{'speed-up':>10}")
+    for name, rates in results.items():
+        print(
+            f"{name:<28}{rates[False]:>10.0f}/s{rates[True]:>10.0f}/s"
+            f"{rates[True] / rates[False]:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
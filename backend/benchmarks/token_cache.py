@@ -0,0 +1,98 @@
+"""Cost per call of the ``get_current_user`` dependency with the token cache off and on.
+
+Calls the dependency directly on one session of a throw-away SQLite database,
+so only the auth work is measured: token decode, then the principal cache
+(default tokens) or the revocation set (``STATELESS_TOKENS``).  Both of those
+are warm, so with the token cache off the remaining cost is ``jwt.decode``.
+
+    cd backend
+    python -m benchmarks.token_cache [--calls 20000]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.api.auth import _access_token, get_current_user
+from app.core.config import settings
+from app.core.principal_cache import principal_cache
+from app.core.revocations import revocation_set
+from app.core.token_cache import token_cache
+from app.db.database import Base, create_async_db_engine, create_db_engine
+from app.models.models import User
+
+
+def _seed(url: str) -> None:
+    engine = create_db_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [{"id": 1, "username": "u1", "email": "u1@x.io", "password_hash": "x"}],
+        )
+    engine.dispose()
+
+
+async def _cost(db, token: str, calls: int) -> float:
+    """Microseconds per call."""
+    for _ in range(100):  # warm-up: principal cache, revocation set, token cache
+        await get_current_user(token=token, db=db)
+    start = time.perf_counter()
+    for _ in range(calls):
+        await get_current_user(token=token, db=db)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def _run(url: str, calls: int) -> dict[str, dict[bool, float]]:
+    engine = create_async_db_engine(url)
+    sessions = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    maxsize = token_cache.maxsize
+    results: dict[str, dict[bool, float]] = {}
+    try:
+        async with sessions() as db:
+            user = await db.get(User, 1)
+            for stateless in (False, True):
+                settings.STATELESS_TOKENS = stateless
+                token = _access_token(user)
+                name = "stateless token" if stateless else "default token"
+                results[name] = {}
+                for cached in (False, True):
+                    token_cache.maxsize = maxsize if cached else 0
+                    token_cache.clear()
+                    principal_cache.clear()
+                    revocation_set.clear()
+                    results[name][cached] = await _cost(db, token, calls)
+    finally:
+        token_cache.maxsize = maxsize
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+    if settings.TOKEN_CACHE_MAXSIZE <= 0:
+        parser.error("TOKEN_CACHE_MAXSIZE is 0; nothing to compare")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        _seed(url)
+        results = asyncio.run(_run(url, args.calls))
+
+    print(f"{'get_current_user':<20}{'no cache':>12}{'cache':>12}{'speed-up':>10}")
+    for name, costs in results.items():
+        print(
+            f"{name:<20}{costs[False]:>9.1f} us{costs[True]:>9.1f} us"
+            f"{costs[False] / costs[True]:>9.2f}x"
+        )
+    print(f"token cache: {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,39 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import auth, expenses, households
+from app.core.balance_cache import balance_cache
 from app.core.config import settings
-from app.db.database import Base, engine
+from app.core.join_guard import invite_code_misses, join_attempt_limiter
+from app.core.password_hasher import password_hasher
+from app.core.principal_cache import principal_cache
+from app.core.responses import default_response_class
+from app.core.revocations import revocation_set
+from app.core.token_cache import token_cache
+from app.db import migrate
+from app.db.database import async_engine
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Tables are created by migrations (`python -m app.db.migrate`), not here.
+    if settings.SCHEMA_STARTUP_MODE == "migrate":
+        await asyncio.to_thread(migrate.upgrade, configure_logger=False)
+    if settings.SCHEMA_STARTUP_MODE != "off":
+        await migrate.verify_schema(async_engine)
+    yield
+    password_hasher.shutdown()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
+    default_response_class=default_response_class(),
 )
 
 # Set up CORS for Flutter app
@@ -47,6 +69,19 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+def metrics():
+    """In-process cache counters, for checking how many DB round-trips they save."""
+    return {
+        "principal_cache": principal_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "balance_cache": balance_cache.stats(),
+        "invite_code_misses": invite_code_misses.stats(),
+        "join_attempt_limiter": join_attempt_limiter.stats(),
+        "revocations": revocation_set.stats(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
 
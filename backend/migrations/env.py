@@ -0,0 +1,58 @@
+"""Alembic environment: runs migrations against ``settings.DATABASE_URL``."""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import pool
+
+import app.models.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.config import settings
+from app.db.database import Base, create_db_engine
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def _database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL to stdout instead of running it."""
+    context.configure(
+        url=_database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = create_db_engine(_database_url(), poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        # Batch mode lets ALTER-style operations work on SQLite.
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+    connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,52 @@
+"""Active-membership partial index and a unique (expense_id, user_id) on shares.
+
+Covers the hot lookups that 0001 answers with a full scan:
+- household_members WHERE household_id = ? AND left_at IS NULL
+- expense_shares WHERE expense_id = ? [AND user_id = ?]
+
+household_members WHERE user_id = ? needs nothing new: user_id leads the
+(user_id, household_id) primary key.
+
+The unique constraint fails if a database already holds duplicate shares
+for the same user and expense; remove those before upgrading.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:05:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: str | Sequence[str] | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_ACTIVE = sa.text("left_at IS NULL")
+
+
+def upgrade() -> None:
+    # SQLite cannot ADD CONSTRAINT; batch mode rebuilds the table.
+    with op.batch_alter_table("expense_shares") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_expense_shares_expense_user", ["expense_id", "user_id"]
+        )
+
+    op.create_index(
+        "ix_household_members_active_household",
+        "household_members",
+        ["household_id", "user_id"],
+        sqlite_where=_ACTIVE,
+        postgresql_where=_ACTIVE,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_household_members_active_household", table_name="household_members")
+
+    with op.batch_alter_table("expense_shares") as batch_op:
+        batch_op.drop_constraint("uq_expense_shares_expense_user", type_="unique")
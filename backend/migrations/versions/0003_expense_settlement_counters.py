@@ -0,0 +1,49 @@
+"""Settlement counters on expenses: unpaid_share_count and outstanding_total.
+
+Existing rows are backfilled from their shares.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 12:40:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: str | Sequence[str] | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("expenses") as batch_op:
+        batch_op.add_column(
+            sa.Column("unpaid_share_count", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch_op.add_column(
+            sa.Column("outstanding_total", sa.Float(), nullable=False, server_default="0")
+        )
+
+    op.execute(
+        """
+        UPDATE expenses SET
+            unpaid_share_count = (
+                SELECT count(*) FROM expense_shares s
+                WHERE s.expense_id = expenses.id AND NOT s.is_paid
+            ),
+            outstanding_total = (
+                SELECT coalesce(sum(s.amount_owed - s.paid_amount), 0) FROM expense_shares s
+                WHERE s.expense_id = expenses.id AND NOT s.is_paid
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("expenses") as batch_op:
+        batch_op.drop_column("outstanding_total")
+        batch_op.drop_column("unpaid_share_count")
@@ -0,0 +1,65 @@
+"""Store money as integer cents.
+
+expenses.amount, expenses.outstanding_total, expense_shares.amount_owed and
+expense_shares.paid_amount (FLOAT dollars) become amount_cents,
+outstanding_cents, amount_owed_cents and paid_amount_cents (INTEGER cents).
+Existing values are rounded to the nearest cent.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 15:20:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: str | Sequence[str] | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (table, float dollars column, integer cents column)
+_MONEY_COLUMNS = [
+    ("expenses", "amount", "amount_cents"),
+    ("expenses", "outstanding_total", "outstanding_cents"),
+    ("expense_shares", "amount_owed", "amount_owed_cents"),
+    ("expense_shares", "paid_amount", "paid_amount_cents"),
+]
+_SERVER_DEFAULTS = {"outstanding_total": "0", "outstanding_cents": "0"}
+
+
+def _convert(to_cents: bool) -> None:
+    tables = dict.fromkeys(table for table, _, _ in _MONEY_COLUMNS)
+    for table in tables:
+        columns = [(d, c) for t, d, c in _MONEY_COLUMNS if t == table]
+        with op.batch_alter_table(table) as batch_op:
+            for dollars, cents in columns:
+                new, type_ = (cents, sa.Integer()) if to_cents else (dollars, sa.Float())
+                batch_op.add_column(
+                    sa.Column(new, type_, nullable=True, server_default=_SERVER_DEFAULTS.get(new))
+                )
+
+        assignments = ", ".join(
+            f"{cents} = CAST(ROUND({dollars} * 100) AS INTEGER)"
+            if to_cents
+            else f"{dollars} = {cents} / 100.0"
+            for dollars, cents in columns
+        )
+        op.execute(f"UPDATE {table} SET {assignments}")
+
+        with op.batch_alter_table(table) as batch_op:
+            for dollars, cents in columns:
+                old, new = (dollars, cents) if to_cents else (cents, dollars)
+                batch_op.drop_column(old)
+                batch_op.alter_column(new, nullable=False)
+
+
+def upgrade() -> None:
+    _convert(to_cents=True)
+
+
+def downgrade() -> None:
+    _convert(to_cents=False)
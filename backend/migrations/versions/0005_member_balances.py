@@ -0,0 +1,52 @@
+"""Materialized member_balances table, backfilled from the existing shares.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 18:10:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: str | Sequence[str] | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "member_balances",
+        sa.Column("household_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("net_cents", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["household_id"], ["households.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("household_id", "user_id"),
+    )
+
+    # Each outstanding share is owed by its member to the expense creator.
+    op.execute(
+        """
+        INSERT INTO member_balances (household_id, user_id, net_cents)
+        SELECT household_id, user_id, SUM(delta) FROM (
+            SELECT e.household_id, e.creator_id AS user_id,
+                   s.amount_owed_cents - s.paid_amount_cents AS delta
+            FROM expense_shares s JOIN expenses e ON e.id = s.expense_id
+            WHERE s.user_id != e.creator_id
+            UNION ALL
+            SELECT e.household_id, s.user_id,
+                   s.paid_amount_cents - s.amount_owed_cents
+            FROM expense_shares s JOIN expenses e ON e.id = s.expense_id
+            WHERE s.user_id != e.creator_id
+        ) AS deltas
+        GROUP BY household_id, user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("member_balances")
@@ -0,0 +1,24 @@
+"""Composite (household_id, date, id) index for the keyset-paginated expense list.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 19:20:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: str | Sequence[str] | None = "0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_expenses_household_date_id", "expenses", ["household_id", "date", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_expenses_household_date_id", table_name="expenses")
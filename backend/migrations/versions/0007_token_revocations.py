@@ -0,0 +1,39 @@
+"""users.token_version and the token_revocations table for stateless tokens.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 21:30:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: str | Sequence[str] | None = "0006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(
+            sa.Column("token_version", sa.Integer(), nullable=False, server_default="0")
+        )
+
+    op.create_table(
+        "token_revocations",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("min_version", sa.Integer(), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("token_revocations")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("token_version")
@@ -0,0 +1,39 @@
+"""expenses.date NOT NULL, so every expense has a place in the keyset order.
+
+The list endpoint pages by (date, id); a NULL date can neither be encoded
+in a cursor nor compared, so such rows were skipped.  Existing NULL dates
+are backfilled with the time of the migration.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 09:10:00
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: str | Sequence[str] | None = "0008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Timestamps are stored as naive UTC.
+    now = datetime.now(UTC).replace(tzinfo=None)
+    op.execute(
+        sa.text("UPDATE expenses SET date = :now WHERE date IS NULL").bindparams(
+            sa.bindparam("now", now, type_=sa.DateTime())
+        )
+    )
+    with op.batch_alter_table("expenses") as batch_op:
+        batch_op.alter_column("date", existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("expenses") as batch_op:
+        batch_op.alter_column("date", existing_type=sa.DateTime(), nullable=True)
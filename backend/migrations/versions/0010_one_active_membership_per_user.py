@@ -0,0 +1,46 @@
+"""Unique partial index: at most one active membership per user.
+
+Creating and joining a household check for a current membership before
+inserting one, so two concurrent requests could both pass the check.  The
+index makes the second insert fail instead.  MySQL has no partial indexes
+and a plain unique index would forbid former memberships, so it is skipped
+there.
+
+The index cannot be created while a user holds two active memberships;
+set left_at on the extra ones before upgrading.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 10:05:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: str | Sequence[str] | None = "0009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_ACTIVE = sa.text("left_at IS NULL")
+_DIALECTS = ("sqlite", "postgresql")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name in _DIALECTS:
+        op.create_index(
+            "uq_household_members_active_user",
+            "household_members",
+            ["user_id"],
+            unique=True,
+            sqlite_where=_ACTIVE,
+            postgresql_where=_ACTIVE,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name in _DIALECTS:
+        op.drop_index("uq_household_members_active_user", table_name="household_members")
@@ -1,12 +1,29 @@
 import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-
-from app.db.database import Base, get_db
+from sqlalchemy.pool import NullPool
+
+from app.core.balance_cache import balance_cache
+from app.core.join_guard import invite_code_misses, join_attempt_limiter
+from app.core.principal_cache import principal_cache
+from app.core.revocations import revocation_set
+from app.core.security import create_access_token
+from app.core.token_cache import token_cache
+from app.db.database import (
+    Base,
+    create_async_db_engine,
+    create_db_engine,
+    get_async_db,
+    get_db,
+)
+from app.models.models import Household, HouseholdMember, User
 from main import app
 
 # Place the test database in the OS temp directory so it never
@@ -14,7 +31,7 @@ from main import app
 _TEST_DB_PATH = Path(tempfile.gettempdir()) / "expense_tracker_test.db"
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{_TEST_DB_PATH}"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -26,7 +43,19 @@ def override_get_db():
         db.close()
 
 
+# The async handlers share the same database file.  TestClient may run
+# each request on a fresh event loop, so async connections are not pooled.
+async_engine = create_async_db_engine(SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 
 # ── shared fixtures ───────────────────────────────────────────────────────
@@ -35,6 +64,12 @@ app.dependency_overrides[get_db] = override_get_db
 @pytest.fixture(scope="function")
 def client():
     Base.metadata.create_all(bind=engine)
+    principal_cache.clear()
+    balance_cache.clear()
+    invite_code_misses.clear()
+    join_attempt_limiter.clear()
+    revocation_set.clear()
+    token_cache.clear()
     yield TestClient(app)
     Base.metadata.drop_all(bind=engine)
 
@@ -72,6 +107,31 @@ def auth_header(client, **kwargs):
     return {"Authorization": f"Bearer {token}"}
 
 
+class FakeClock:
+    """A settable ``clock`` for the in-process caches and limiters."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@contextmanager
+def count_statements():
+    """Collect the SQL statements the request handlers send to the database."""
+    statements = []
+
+    def _before(_conn, _cursor, statement, _params, _context, _executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _before)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _before)
+
+
 # ── Expense handling ────────────────────────────────────────────────────────
 
 
@@ -94,3 +154,46 @@ def create_expense(client, headers, payload):
         json=payload,
         headers=headers,
     )
+
+
+@dataclass
+class SharedHousehold:
+    id: int
+    user_ids: dict[str, int]
+    # Bearer headers per username, minted directly (no bcrypt login per member).
+    headers: dict[str, dict[str, str]]
+
+
+@pytest.fixture(scope="function")
+def make_household(client, db):
+    """Factory: register ``names`` and put them in one household, the first as admin.
+
+    ``make_household("Alice", "Bob", "Cara")`` returns a ``SharedHousehold``.
+    """
+
+    def make(*names: str, invite_code: str = "HOUSE001") -> SharedHousehold:
+        names = names or ("Alice", "Bob")
+        for name in names:
+            register(
+                client, email=f"{name.lower()}@house.com", username=name, password="Password123!"
+            )
+        user_ids = {
+            user.username: user.id for user in db.query(User).filter(User.username.in_(names))
+        }
+
+        household = Household(name=f"{names[0]}'s household", invite_code=invite_code)
+        db.add(household)
+        db.flush()
+        for i, name in enumerate(names):
+            db.add(
+                HouseholdMember(user_id=user_ids[name], household_id=household.id, is_admin=i == 0)
+            )
+        db.commit()
+
+        headers = {
+            name: {"Authorization": f"Bearer {create_access_token({'sub': name})}"}
+            for name in names
+        }
+        return SharedHousehold(household.id, user_ids, headers)
+
+    return make
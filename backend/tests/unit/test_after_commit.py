@@ -0,0 +1,42 @@
+"""Unit tests for app.db.after_commit."""
+
+from app.db.after_commit import call_after_commit
+from app.models.models import User
+
+
+def _add_user(db, name):
+    db.add(User(username=name, email=f"{name}@commit.com", password_hash="x"))
+    db.flush()
+
+
+class TestCallAfterCommit:
+    def test_runs_once_after_commit(self, db):
+        calls = []
+        _add_user(db, "alice")
+        call_after_commit(db, lambda: calls.append("alice"))
+        assert calls == []
+
+        db.commit()
+        db.commit()
+
+        assert calls == ["alice"]
+
+    def test_dropped_on_rollback(self, db):
+        calls = []
+        _add_user(db, "alice")
+        call_after_commit(db, lambda: calls.append("alice"))
+        db.rollback()
+        db.commit()
+
+        assert calls == []
+
+    def test_savepoint_rollback_keeps_outer_callbacks(self, db):
+        calls = []
+        _add_user(db, "alice")
+        call_after_commit(db, lambda: calls.append("alice"))
+        with db.begin_nested() as savepoint:
+            _add_user(db, "bob")
+            savepoint.rollback()
+        db.commit()
+
+        assert calls == ["alice"]
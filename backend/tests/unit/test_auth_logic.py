@@ -38,6 +38,29 @@ class TestLoginEdgeCases:
         assert resp.status_code == 400
         assert "inactive" in resp.json()["detail"].lower()
 
+    def test_outdated_work_factor_is_rehashed_on_login(self, client):
+        """A hash made with a different bcrypt cost is upgraded after a good login."""
+        from passlib.context import CryptContext
+
+        from app.core.security import password_needs_rehash
+        from app.models.models import User as UserModel
+        from tests.conftest import TestingSessionLocal
+
+        register(client)
+        legacy = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("testpass123")
+        db = TestingSessionLocal()
+        user = db.query(UserModel).filter(UserModel.username == "testuser").first()
+        user.password_hash = legacy
+        db.commit()
+
+        assert login(client).status_code == 200
+
+        db.expire_all()
+        user = db.query(UserModel).filter(UserModel.username == "testuser").first()
+        db.close()
+        assert user.password_hash != legacy
+        assert password_needs_rehash(user.password_hash) is False
+
 
 # ── get_current_user: edge cases ──────────────────────────────────────────
 
@@ -1,7 +1,12 @@
 """Unit tests for confirm expense share payment (ID010 / TID022)."""
 
+import asyncio
+
+import httpx
+
 from app.models.models import Expense, ExpenseShare, ExpenseStatus, User
-from tests.conftest import auth_header, create_expense, register
+from main import app
+from tests.conftest import auth_header, count_statements, create_expense, register
 
 
 def _setup_household_and_expense(client, db):
@@ -213,3 +218,100 @@ class TestConfirmPaymentErrors:
         )
         assert resp.status_code == 400
         assert "greater than zero" in resp.json()["detail"].lower()
+
+
+class TestSettlementCounters:
+    """Expense status is driven by denormalized counters, not by reloading shares."""
+
+    def _pay(self, client, expense_id, headers, amount):
+        return client.post(
+            f"/api/v1/expenses/{expense_id}/confirm-payment",
+            json={"amount": amount},
+            headers=headers,
+        )
+
+    def test_counters_initialised_on_create(self, client, db):
+        expense_id, _, _, _ = _setup_household_and_expense(client, db)
+        expense = db.get(Expense, expense_id)
+        assert expense.unpaid_share_count == 2
+        assert expense.outstanding_cents == 6000
+
+    def test_counters_follow_partial_and_full_payments(self, client, db):
+        expense_id, _, headers_bob, headers_cara = _setup_household_and_expense(client, db)
+
+        self._pay(client, expense_id, headers_cara, 15.0)
+        db.expire_all()
+        expense = db.get(Expense, expense_id)
+        assert (expense.unpaid_share_count, expense.outstanding_cents) == (2, 4500)
+        assert expense.status == ExpenseStatus.PARTIALLY_SETTLED
+
+        self._pay(client, expense_id, headers_bob, 20.0)
+        self._pay(client, expense_id, headers_cara, 25.0)
+        db.expire_all()
+        expense = db.get(Expense, expense_id)
+        assert (expense.unpaid_share_count, expense.outstanding_cents) == (0, 0)
+        assert expense.status == ExpenseStatus.FULLY_SETTLED
+
+    def test_payment_does_not_reload_all_shares(self, client, db):
+        expense_id, _, headers_bob, _ = _setup_household_and_expense(client, db)
+        self._pay(client, expense_id, headers_bob, 1.0)  # warm the principal cache
+
+        with count_statements() as statements:
+            resp = self._pay(client, expense_id, headers_bob, 1.0)
+        assert resp.status_code == 200
+        share_selects = [
+            sql
+            for sql in statements
+            if sql.lstrip().upper().startswith("SELECT") and "expense_shares" in sql
+        ]
+        assert len(share_selects) == 1
+        assert "expense_shares.user_id" in share_selects[0]
+
+    def test_inconsistent_counters_are_a_conflict(self, client, db):
+        expense_id, _, headers_bob, _ = _setup_household_and_expense(client, db)
+        expense = db.get(Expense, expense_id)
+        expense.unpaid_share_count = 0
+        db.commit()
+
+        resp = self._pay(client, expense_id, headers_bob, 20.0)
+        assert resp.status_code == 409
+
+        db.expire_all()
+        share = db.query(ExpenseShare).filter(ExpenseShare.expense_id == expense_id).first()
+        assert share.paid_amount == 0.0
+
+
+class TestConcurrentPayments:
+    """Compare-and-set keeps simultaneous partial payments from losing updates."""
+
+    async def test_concurrent_partial_payments_never_overpay(self, client, db):
+        expense_id, _, headers_bob, headers_cara = _setup_household_and_expense(client, db)
+        url = f"/api/v1/expenses/{expense_id}/confirm-payment"
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            responses = await asyncio.gather(
+                *(ac.post(url, json={"amount": 5.0}, headers=headers_cara) for _ in range(10)),
+                ac.post(url, json={"amount": 20.0}, headers=headers_bob),
+            )
+
+        codes = [r.status_code for r in responses]
+        assert codes.count(200) == 9  # Cara's 40.0 share fits eight payments of 5.0
+        assert responses[-1].status_code == 200  # Bob's payment
+        for rejected in (r for r in responses if r.status_code != 200):
+            detail = rejected.json()["detail"]
+            if rejected.status_code == 409:
+                assert detail.endswith("please retry")
+            else:
+                assert rejected.status_code == 400
+                assert detail == (
+                    "Cannot confirm payment: Your expense share is already fully paid"
+                )
+
+        db.expire_all()
+        shares = db.query(ExpenseShare).filter(ExpenseShare.expense_id == expense_id).all()
+        assert sorted(s.paid_amount for s in shares) == [20.0, 40.0]
+        assert all(s.is_paid for s in shares)
+        expense = db.get(Expense, expense_id)
+        assert (expense.unpaid_share_count, expense.outstanding_cents) == (0, 0)
+        assert expense.status == ExpenseStatus.FULLY_SETTLED
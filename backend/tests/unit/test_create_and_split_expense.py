@@ -3,7 +3,7 @@ from datetime import UTC, datetime
 from app.models.models import Expense, ExpenseShare, Household, HouseholdMember, VoteStatus
 from app.models.models import User as UserModel
 
-from ..conftest import TestingSessionLocal, login, register
+from ..conftest import TestingSessionLocal, count_statements, login, register
 
 
 class TestExpenseMembershipEdgeCases:
@@ -280,3 +280,210 @@ class TestManualSplitEdgeCases:
         assert resp.status_code == 400
         assert f"Share for user {bob.id} must be greater than zero" in resp.json()["detail"]
         db.close()
+
+    def test_manual_split_is_exact_in_cents(self, client):
+        """0.10 + 0.20 is not 0.30 in floating point; the split must still match the total."""
+        register(client, username="alice_c", email="alice_c@test.com")
+        register(client, username="bob_c", email="bob_c@test.com")
+
+        auth_resp = login(client, username="alice_c")
+        headers = {"Authorization": f"Bearer {auth_resp.json()['access_token']}"}
+
+        db = TestingSessionLocal()
+        alice = db.query(UserModel).filter(UserModel.username == "alice_c").first()
+        bob = db.query(UserModel).filter(UserModel.username == "bob_c").first()
+
+        h = Household(name="Cents Home", invite_code="CENTS1")
+        db.add(h)
+        db.flush()
+        db.add(HouseholdMember(user_id=alice.id, household_id=h.id))
+        db.add(HouseholdMember(user_id=bob.id, household_id=h.id))
+        db.commit()
+
+        payload = {
+            "description": "Gum",
+            "amount": 0.3,
+            "split_evenly": False,
+            "include_creator": True,
+            "manual_shares": [
+                {"user_id": alice.id, "amount": 0.1},
+                {"user_id": bob.id, "amount": 0.2},
+            ],
+        }
+        resp = client.post("/api/v1/expenses/create-and-split", json=payload, headers=headers)
+
+        assert resp.status_code == 201, resp.text
+        expense = db.query(Expense).filter(Expense.household_id == h.id).one()
+        assert expense.amount_cents == 30
+        shares = db.query(ExpenseShare).filter(ExpenseShare.expense_id == expense.id).all()
+        assert sorted(share.amount_owed_cents for share in shares) == [10, 20]
+        db.close()
+
+
+class TestSplitStrategies:
+    """The ``split`` field selects a split-engine strategy instead of split_evenly."""
+
+    def _household(self, client):
+        for name in ("alice_s", "bob_s", "cara_s"):
+            register(client, username=name, email=f"{name}@test.com")
+        auth_resp = login(client, username="alice_s")
+        headers = {"Authorization": f"Bearer {auth_resp.json()['access_token']}"}
+
+        db = TestingSessionLocal()
+        users = {u.username: u.id for u in db.query(UserModel).all()}
+        h = Household(name="Strategy Home", invite_code="STRAT1")
+        db.add(h)
+        db.flush()
+        for user_id in users.values():
+            db.add(HouseholdMember(user_id=user_id, household_id=h.id))
+        db.commit()
+        db.close()
+        return headers, users
+
+    def _shares(self, description):
+        db = TestingSessionLocal()
+        expense = db.query(Expense).filter(Expense.description == description).one()
+        shares = db.query(ExpenseShare).filter(ExpenseShare.expense_id == expense.id).all()
+        db.close()
+        return {s.user_id: s.amount_owed_cents for s in shares}
+
+    def test_percentage_split(self, client):
+        headers, users = self._household(client)
+        payload = {
+            "description": "Rent",
+            "amount": 1000.01,
+            "split": {
+                "strategy": "percentage",
+                "shares": [
+                    {"user_id": users["alice_s"], "percent": 50},
+                    {"user_id": users["bob_s"], "percent": "33.33"},
+                    {"user_id": users["cara_s"], "percent": "16.67"},
+                ],
+            },
+        }
+        resp = client.post("/api/v1/expenses/create-and-split", json=payload, headers=headers)
+
+        assert resp.status_code == 201, resp.text
+        assert self._shares("Rent") == {
+            users["alice_s"]: 50001,
+            users["bob_s"]: 33330,
+            users["cara_s"]: 16670,
+        }
+
+    def test_itemized_split_with_tip(self, client):
+        headers, users = self._household(client)
+        payload = {
+            "description": "Dinner",
+            "amount": 33.0,
+            "split": {
+                "strategy": "itemized",
+                "items": [
+                    {"amount": 20.0, "user_ids": [users["bob_s"]], "description": "Steak"},
+                    {"amount": 10.0, "user_ids": [users["cara_s"]], "description": "Salad"},
+                ],
+            },
+        }
+        resp = client.post("/api/v1/expenses/create-and-split", json=payload, headers=headers)
+
+        assert resp.status_code == 201, resp.text
+        assert self._shares("Dinner") == {users["bob_s"]: 2200, users["cara_s"]: 1100}
+
+    def test_strategy_errors_are_400(self, client):
+        headers, users = self._household(client)
+        payload = {
+            "description": "Bad",
+            "amount": 10.0,
+            "split": {
+                "strategy": "weighted",
+                "shares": [{"user_id": users["bob_s"], "weight": 0}],
+            },
+        }
+        resp = client.post("/api/v1/expenses/create-and-split", json=payload, headers=headers)
+        assert resp.status_code == 400
+        assert "Weight for user" in resp.json()["detail"]
+
+    def test_legacy_fields_required_without_split(self, client):
+        headers, _ = self._household(client)
+        payload = {"description": "Vague", "amount": 10.0}
+        resp = client.post("/api/v1/expenses/create-and-split", json=payload, headers=headers)
+        assert resp.status_code == 422
+
+    def test_sub_cent_amount_is_422_not_rounded(self, client):
+        headers, _ = self._household(client)
+        payload = {
+            "description": "Odd",
+            "amount": 10.005,
+            "split_evenly": True,
+            "include_creator": True,
+        }
+        resp = client.post("/api/v1/expenses/create-and-split", json=payload, headers=headers)
+        assert resp.status_code == 422
+        assert "2 decimal places" in resp.text
+
+    def test_amount_beyond_the_column_is_422_not_500(self, client):
+        headers, _ = self._household(client)
+        payload = {
+            "description": "Huge",
+            "amount": 1e20,
+            "split_evenly": True,
+            "include_creator": True,
+        }
+        resp = client.post("/api/v1/expenses/create-and-split", json=payload, headers=headers)
+        assert resp.status_code == 422
+        assert "must be at most" in resp.text
+
+
+class TestExpenseCreateStatementCount:
+    def _household(self, n_members: int, invite_code: str) -> None:
+        db = TestingSessionLocal()
+        creator = db.query(UserModel).filter(UserModel.username == "bulk_alice").first()
+        # Leave any earlier household so the creator has exactly one.
+        db.query(HouseholdMember).filter(HouseholdMember.user_id == creator.id).update(
+            {HouseholdMember.left_at: datetime.now(UTC)}
+        )
+        household = Household(name=f"Bulk{n_members}", invite_code=invite_code)
+        db.add(household)
+        db.flush()
+        db.add(HouseholdMember(user_id=creator.id, household_id=household.id))
+        for i in range(n_members - 1):
+            user = UserModel(
+                username=f"bulk{n_members}_{i}",
+                email=f"bulk{n_members}_{i}@test.com",
+                password_hash="not-a-real-hash",
+            )
+            db.add(user)
+            db.flush()
+            db.add(HouseholdMember(user_id=user.id, household_id=household.id))
+        db.commit()
+        db.close()
+
+    def test_statement_count_does_not_grow_with_household_size(self, client):
+        register(client, username="bulk_alice", email="bulk_alice@test.com")
+        token = login(client, username="bulk_alice").json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        client.get("/api/v1/auth/me", headers=headers)  # warm the principal cache
+
+        payload = {
+            "description": "Rent",
+            "amount": 1000.0,
+            "split_evenly": True,
+            "include_creator": True,
+        }
+        counts = {}
+        for size, code in ((3, "BULK0003"), (40, "BULK0040")):
+            self._household(size, code)
+            with count_statements() as statements:
+                resp = client.post(
+                    "/api/v1/expenses/create-and-split", json=payload, headers=headers
+                )
+            assert resp.status_code == 201, resp.text
+            counts[size] = len(statements)
+
+            db = TestingSessionLocal()
+            expense = db.query(Expense).order_by(Expense.id.desc()).first()
+            assert len(expense.shares) == size
+            assert round(sum(s.amount_owed for s in expense.shares), 2) == 1000.0
+            db.close()
+
+        # membership/roommates, expense INSERT, shares executemany, balances upsert
+        assert counts[3] == counts[40] == 4
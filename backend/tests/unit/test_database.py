@@ -0,0 +1,128 @@
+"""Unit tests for the engine factory in app.db.database."""
+
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import DateTime, text
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
+
+from app.core.config import settings
+from app.db.database import Base, async_database_url, create_async_db_engine, create_db_engine
+from app.db.types import UTCDateTime
+from app.models.models import User
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestSqliteEngine:
+    def test_file_database_uses_wal_and_pragmas(self, tmp_path):
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'wal.db'}")
+        try:
+            assert _pragma(engine, "journal_mode").upper() == settings.SQLITE_JOURNAL_MODE
+            assert _pragma(engine, "cache_size") == settings.SQLITE_CACHE_SIZE
+            # synchronous=NORMAL is reported as 1
+            assert _pragma(engine, "synchronous") == 1
+            assert isinstance(engine.pool, QueuePool)
+        finally:
+            engine.dispose()
+
+    def test_in_memory_database_shares_one_connection(self):
+        engine = create_db_engine("sqlite://")
+        try:
+            assert isinstance(engine.pool, StaticPool)
+            with engine.begin() as conn:
+                conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            with engine.connect() as conn:
+                assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 0
+        finally:
+            engine.dispose()
+
+    def test_overrides_win_over_defaults(self, tmp_path):
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'o.db'}", pool_size=2)
+        try:
+            assert engine.pool.size() == 2
+        finally:
+            engine.dispose()
+
+
+class TestServerEngine:
+    def test_postgres_gets_pool_settings_and_no_sqlite_args(self):
+        pytest.importorskip("psycopg")
+        engine = create_db_engine("postgresql+psycopg://u:p@localhost/db")
+        assert engine.pool.size() == settings.DB_POOL_SIZE
+        assert engine.pool._pre_ping is settings.DB_POOL_PRE_PING
+        assert engine.pool._recycle == settings.DB_POOL_RECYCLE_SECONDS
+
+
+class TestAsyncEngine:
+    @pytest.mark.parametrize(
+        "sync_url,async_url",
+        [
+            ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+            ("postgresql://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+            ("postgresql+psycopg://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+            ("sqlite+aiosqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+        ],
+    )
+    def test_async_url_swaps_driver(self, sync_url, async_url):
+        assert async_database_url(sync_url).render_as_string(hide_password=False) == async_url
+
+    async def test_async_sqlite_engine_applies_pragmas(self, tmp_path):
+        engine = create_async_db_engine(f"sqlite:///{tmp_path / 'async.db'}")
+        try:
+            async with engine.connect() as conn:
+                mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            assert mode.upper() == settings.SQLITE_JOURNAL_MODE
+        finally:
+            await engine.dispose()
+
+    async def test_async_sqlite_engine_without_a_sized_pool(self, tmp_path, monkeypatch):
+        # SQLAlchemy < 2.0.38 pools aiosqlite files with NullPool.
+        from sqlalchemy.dialects.sqlite.aiosqlite import SQLiteDialect_aiosqlite
+
+        monkeypatch.setattr(
+            SQLiteDialect_aiosqlite, "get_pool_class", classmethod(lambda cls, url: NullPool)
+        )
+        engine = create_async_db_engine(f"sqlite:///{tmp_path / 'nullpool.db'}")
+        try:
+            assert isinstance(engine.pool, NullPool)
+            async with engine.connect() as conn:
+                assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+        finally:
+            await engine.dispose()
+
+
+class TestTimestamps:
+    def test_asyncpg_receives_naive_utc_for_every_timestamp(self):
+        # asyncpg rejects aware datetimes for ``timestamp without time zone``.
+        dialect = PGDialect_asyncpg()
+        aware = datetime(2024, 1, 1, 10, tzinfo=timezone(timedelta(hours=-5)))
+        columns = [
+            column
+            for table in Base.metadata.tables.values()
+            for column in table.columns
+            if isinstance(column.type, DateTime | UTCDateTime)
+        ]
+
+        assert columns
+        for column in columns:
+            assert isinstance(column.type, UTCDateTime), column
+            bound = column.type.bind_processor(dialect)(aware)
+            assert bound == datetime(2024, 1, 1, 15) and bound.tzinfo is None
+
+    def test_naive_values_are_bound_unchanged(self):
+        naive = datetime(2024, 1, 1, 10)
+        assert UTCDateTime().bind_processor(PGDialect_asyncpg())(naive) is naive
+
+    def test_aware_default_is_stored_as_utc(self, db):
+        before = datetime.now(UTC).replace(tzinfo=None)
+        db.add(User(username="tz", email="tz@example.com", password_hash="x"))
+        db.commit()
+
+        created_at = db.query(User.created_at).scalar()
+        assert created_at.tzinfo is None
+        assert before <= created_at <= datetime.now(UTC).replace(tzinfo=None)
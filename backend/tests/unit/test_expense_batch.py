@@ -0,0 +1,98 @@
+"""Unit tests for POST /expenses/batch."""
+
+from app.models.models import Expense, ExpenseShare
+from tests.conftest import auth_header, count_statements, register
+
+BATCH_URL = "/api/v1/expenses/batch"
+
+
+def _even(description, amount):
+    return {
+        "description": description,
+        "amount": amount,
+        "split_evenly": True,
+        "include_creator": True,
+    }
+
+
+class TestExpenseBatchSuccess:
+    def test_all_items_created_in_order(self, client, db, make_household):
+        house = make_household()
+        headers, bob_id = house.headers["Alice"], house.user_ids["Bob"]
+        items = [
+            _even("Groceries", 40.0),
+            {
+                "description": "Internet",
+                "amount": 60.0,
+                "split_evenly": False,
+                "include_creator": False,
+                "manual_shares": [{"user_id": bob_id, "amount": 60.0}],
+            },
+        ]
+        resp = client.post(BATCH_URL, json={"items": items}, headers=headers)
+        assert resp.status_code == 201, resp.text
+        body = resp.json()
+        assert body["created"] == 2
+        assert body["rejected"] == 0
+        assert [r["status"] for r in body["results"]] == ["created", "created"]
+
+        internet = db.get(Expense, body["results"][1]["expense_id"])
+        assert internet.description == "Internet"
+        shares = db.query(ExpenseShare).filter(ExpenseShare.expense_id == internet.id).all()
+        assert [(s.user_id, s.amount_owed) for s in shares] == [(bob_id, 60.0)]
+
+    def test_statement_count_does_not_grow_with_batch_size(self, client, db, make_household):
+        headers = make_household().headers["Alice"]
+        client.get("/api/v1/auth/me", headers=headers)  # warm the principal cache
+
+        counts = {}
+        for size in (2, 30):
+            items = [_even(f"Item {i}", 10.0 + i) for i in range(size)]
+            with count_statements() as statements:
+                resp = client.post(BATCH_URL, json={"items": items}, headers=headers)
+            assert resp.status_code == 201
+            counts[size] = len(statements)
+
+        # membership/roommates, expense INSERT, shares executemany, balances upsert
+        assert counts[2] == counts[30] == 4
+        assert db.query(Expense).count() == 32
+
+
+class TestExpenseBatchModes:
+    def test_all_or_nothing_writes_nothing_on_invalid_item(self, client, db, make_household):
+        headers = make_household().headers["Alice"]
+        items = [_even("Fine", 10.0), _even("Broken", -5.0)]
+        resp = client.post(BATCH_URL, json={"items": items}, headers=headers)
+
+        assert resp.status_code == 400
+        body = resp.json()
+        assert body["created"] == 0
+        assert body["results"][0]["status"] == "not_created"
+        assert body["results"][1]["status"] == "rejected"
+        assert "greater than zero" in body["results"][1]["detail"]
+        assert db.query(Expense).count() == 0
+
+    def test_best_effort_writes_valid_items(self, client, db, make_household):
+        headers = make_household().headers["Alice"]
+        items = [_even("Fine", 10.0), _even("Broken", 0.0), _even("Also fine", 12.0)]
+        resp = client.post(BATCH_URL, json={"items": items, "mode": "best_effort"}, headers=headers)
+
+        assert resp.status_code == 201
+        body = resp.json()
+        assert (body["created"], body["rejected"]) == (2, 1)
+        assert [r["status"] for r in body["results"]] == ["created", "rejected", "created"]
+        assert body["results"][1]["expense_id"] is None
+        assert db.query(Expense).count() == 2
+
+    def test_caller_without_household_rejected(self, client, db):
+        register(client)
+        resp = client.post(
+            BATCH_URL, json={"items": [_even("Solo", 5.0)]}, headers=auth_header(client)
+        )
+        assert resp.status_code == 400
+        assert "not currently in any household" in resp.json()["detail"].lower()
+
+    def test_empty_batch_is_invalid(self, client, db, make_household):
+        headers = make_household().headers["Alice"]
+        resp = client.post(BATCH_URL, json={"items": []}, headers=headers)
+        assert resp.status_code == 422
@@ -0,0 +1,103 @@
+"""Unit tests for GET /households/{id}/expenses/export."""
+
+import csv
+import io
+import json
+
+import pytest
+
+from app.api import households
+from app.models.models import Household, HouseholdMember, User
+from tests.conftest import auth_header, register
+
+
+def _setup_household(client, make_household):
+    """Alice and Bob share a household with three expenses; returns (url, headers, ids)."""
+    household = make_household("Alice", "Bob")
+    ids, headers = household.user_ids, household.headers
+    items = [
+        {"description": "Rent", "amount": 1200.0, "split_evenly": True, "include_creator": True},
+        {
+            "description": "Gift, for Bob",
+            "amount": 25.5,
+            "category": "misc",
+            "split_evenly": False,
+            "include_creator": False,
+            "manual_shares": [{"user_id": ids["Bob"], "amount": 25.5}],
+        },
+        {"description": "Power", "amount": 0.03, "split_evenly": True, "include_creator": True},
+    ]
+    resp = client.post("/api/v1/expenses/batch", json={"items": items}, headers=headers["Alice"])
+    assert resp.status_code == 201, resp.text
+    return f"/api/v1/households/{household.id}/expenses/export", headers, ids
+
+
+@pytest.fixture(params=[1, 1000], ids=["chunk-1", "chunk-1000"])
+def chunk_size(request, monkeypatch):
+    monkeypatch.setattr(households, "EXPORT_CHUNK_SIZE", request.param)
+
+
+class TestCsvExport:
+    def test_one_line_per_share(self, client, chunk_size, make_household):
+        url, headers, ids = _setup_household(client, make_household)
+
+        resp = client.get(url, headers=headers["Bob"])
+
+        assert resp.status_code == 200, resp.text
+        assert resp.headers["content-type"].startswith("text/csv")
+        assert "attachment" in resp.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(resp.text)))
+        assert [(r["description"], r["share_user_id"], r["amount_owed"]) for r in rows] == [
+            ("Rent", str(ids["Alice"]), "600.00"),
+            ("Rent", str(ids["Bob"]), "600.00"),
+            ("Gift, for Bob", str(ids["Bob"]), "25.50"),
+            ("Power", str(ids["Alice"]), "0.02"),
+            ("Power", str(ids["Bob"]), "0.01"),
+        ]
+        assert rows[2]["category"] == "misc"
+        assert rows[2]["amount"] == "25.50"
+        assert rows[2]["status"] == "PENDING"
+
+
+class TestNdjsonExport:
+    def test_one_object_per_expense_across_chunks(self, client, chunk_size, make_household):
+        url, headers, ids = _setup_household(client, make_household)
+
+        resp = client.get(url, params={"format": "ndjson"}, headers=headers["Alice"])
+
+        assert resp.status_code == 200, resp.text
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        expenses = [json.loads(line) for line in resp.text.splitlines()]
+        assert [e["description"] for e in expenses] == ["Rent", "Gift, for Bob", "Power"]
+        assert expenses[0]["amount"] == 1200.0
+        assert [(s["user_id"], s["amount_owed"]) for s in expenses[2]["shares"]] == [
+            (ids["Alice"], 0.02),
+            (ids["Bob"], 0.01),
+        ]
+        assert expenses[1]["shares"][0]["is_paid"] is False
+
+    def test_empty_household(self, client, db):
+        register(client, email="solo@export.com", username="Solo", password="Password123!")
+        solo = db.query(User).one()
+        household = Household(name="Empty", invite_code="EMPTY001")
+        db.add(household)
+        db.flush()
+        db.add(HouseholdMember(user_id=solo.id, household_id=household.id))
+        db.commit()
+        headers = auth_header(client, username="Solo", password="Password123!")
+
+        url = f"/api/v1/households/{household.id}/expenses/export"
+        assert client.get(url, params={"format": "ndjson"}, headers=headers).text == ""
+        assert client.get(url, headers=headers).text.startswith("expense_id,date,")
+
+
+class TestExportAccess:
+    def test_non_member_unknown_household_and_bad_format(self, client, make_household):
+        url, headers, _ = _setup_household(client, make_household)
+        register(client, email="eve@export.com", username="Eve", password="Password123!")
+        eve = auth_header(client, username="Eve", password="Password123!")
+
+        assert client.get(url, headers=eve).status_code == 403
+        assert client.get("/api/v1/households/9999/expenses/export", headers=eve).status_code == 404
+        resp = client.get(url, params={"format": "xml"}, headers=headers["Alice"])
+        assert resp.status_code == 422
@@ -0,0 +1,174 @@
+"""Unit tests for the CSV expense import (endpoint and CLI)."""
+
+import threading
+from datetime import datetime
+
+from app.db import expense_import
+from app.models.models import Expense, ExpenseShare, MemberBalance
+from tests.conftest import SQLALCHEMY_DATABASE_URL, auth_header, count_statements, register
+
+HEADER = "date,description,amount,category,paid_by,split_with,shares\n"
+
+
+def _setup_household(make_household):
+    """Alice, Bob and Cara share a household; returns (url, headers, household_id, ids)."""
+    household = make_household("Alice", "Bob", "Cara")
+    url = f"/api/v1/households/{household.id}/expenses/import"
+    return url, household.headers["Alice"], household.id, household.user_ids
+
+
+def _upload(client, url, headers, content, **params):
+    files = {"file": ("history.csv", content.encode(), "text/csv")}
+    return client.post(url, files=files, params=params, headers=headers)
+
+
+class TestImportEndpoint:
+    def test_rows_become_expenses_shares_and_balances(self, client, db, make_household):
+        url, headers, household_id, ids = _setup_household(make_household)
+        content = HEADER + (
+            "2025-01-31,Rent,900,housing,,,\n"
+            "2025-02-01,Pizza,30,food,Bob,Alice;Bob,\n"
+            '2025-02-02,"Gift, for Cara",20.50,,,,Cara:20.50\n'
+        )
+
+        resp = _upload(client, url, headers, content)
+
+        assert resp.status_code == 200, resp.text
+        assert resp.json() == {"created": 3, "rejected": 0, "errors": []}
+        rent, pizza, gift = db.query(Expense).order_by(Expense.id).all()
+        assert (rent.creator_id, rent.amount_cents, rent.date.year) == (ids["Alice"], 90000, 2025)
+        assert pizza.creator_id == ids["Bob"]
+        shares = db.query(ExpenseShare).filter(ExpenseShare.expense_id == pizza.id).all()
+        assert sorted((s.user_id, s.amount_owed_cents) for s in shares) == [
+            (ids["Alice"], 1500),
+            (ids["Bob"], 1500),
+        ]
+        assert gift.description == "Gift, for Cara"
+        balances = {
+            b.user_id: b.net_cents
+            for b in db.query(MemberBalance).filter(MemberBalance.household_id == household_id)
+        }
+        assert balances == {
+            ids["Alice"]: 30000 + 30000 - 1500 + 2050,
+            ids["Bob"]: -30000 + 1500,
+            ids["Cara"]: -30000 - 2050,
+        }
+
+    def test_statements_grow_with_chunks_not_rows(self, client, db, make_household):
+        url, headers, _, _ = _setup_household(make_household)
+        content = HEADER + "".join(f"2025-03-01,Item {i},{i + 1},,,,\n" for i in range(500))
+
+        with count_statements() as statements:
+            resp = _upload(client, url, headers, content)
+
+        assert resp.json()["created"] == 500
+        # Principal, membership check, username map, then expenses, shares and balances.
+        assert len(statements) == 6
+        assert db.query(Expense).count() == 500
+
+    def test_all_or_nothing_reports_every_bad_row(self, client, db, make_household):
+        url, headers, _, _ = _setup_household(make_household)
+        content = HEADER + (
+            "2025-01-01,Fine,10,,,,\n"
+            "2025-01-02,Free,0,,,,\n"
+            "2025-01-03,Ghost,10,,Mallory,,\n"
+            "yesterday,Bad date,10,,,,\n"
+            "2025-01-05,Short,10,,,,Bob:4\n"
+        )
+
+        resp = _upload(client, url, headers, content)
+
+        assert resp.status_code == 400
+        body = resp.json()
+        assert (body["created"], body["rejected"]) == (0, 4)
+        details = {e["line"]: e["detail"] for e in body["errors"]}
+        assert set(details) == {3, 4, 5, 6}
+        assert "greater than zero" in details[3]
+        assert "Mallory" in details[4]
+        assert db.query(Expense).count() == 0
+
+    def test_best_effort_keeps_valid_rows(self, client, db, make_household):
+        url, headers, _, _ = _setup_household(make_household)
+        content = HEADER + "2025-01-01,Fine,10,,,,\n2025-01-02,Free,-5,,,,\n"
+
+        resp = _upload(client, url, headers, content, mode="best_effort")
+
+        assert resp.status_code == 200
+        assert (resp.json()["created"], resp.json()["rejected"]) == (1, 1)
+        assert [e.description for e in db.query(Expense)] == ["Fine"]
+
+    def test_missing_columns_and_non_members(self, client, db, make_household):
+        url, headers, _, _ = _setup_household(make_household)
+        resp = _upload(client, url, headers, "date,category\n2025-01-01,food\n")
+        assert resp.status_code == 400
+        assert "amount, description" in resp.json()["detail"]
+
+        register(client, email="eve@import.com", username="Eve", password="Password123!")
+        eve = auth_header(client, username="Eve", password="Password123!")
+        assert _upload(client, url, eve, HEADER).status_code == 403
+
+    def test_dates_with_an_offset_are_stored_as_utc(self, client, db, make_household):
+        url, headers, _, _ = _setup_household(make_household)
+        content = (
+            HEADER + "2024-01-01T10:00:00-05:00,Late,10,,,,\n2024-01-01T10:00:00,Naive,10,,,,\n"
+        )
+
+        assert _upload(client, url, headers, content).json()["created"] == 2
+
+        late, naive = db.query(Expense).order_by(Expense.id).all()
+        assert late.date == datetime(2024, 1, 1, 15)
+        assert naive.date == datetime(2024, 1, 1, 10)
+        # Offset and naive dates share one timeline, so they order correctly.
+        assert late.date > naive.date
+
+    def test_rows_are_planned_off_the_event_loop(self, client, monkeypatch, make_household):
+        url, headers, _, _ = _setup_household(make_household)
+        threads = {}
+        plan_row, insert_expenses = expense_import._plan_row, expense_import.insert_expenses
+
+        def recording_plan_row(*args):
+            threads["plan"] = threading.get_ident()
+            return plan_row(*args)
+
+        async def recording_insert_expenses(*args):
+            threads["insert"] = threading.get_ident()
+            return await insert_expenses(*args)
+
+        monkeypatch.setattr(expense_import, "_plan_row", recording_plan_row)
+        monkeypatch.setattr(expense_import, "insert_expenses", recording_insert_expenses)
+        resp = _upload(client, url, headers, HEADER + "2025-01-01,Fine,10,,,,\n")
+
+        assert resp.json()["created"] == 1
+        assert threads["plan"] != threads["insert"]
+
+
+class TestImportCli:
+    def test_imports_file_in_chunks(self, client, db, tmp_path, capsys, make_household):
+        _, _, household_id, _ = _setup_household(make_household)
+        path = tmp_path / "history.csv"
+        path.write_text(HEADER + "".join(f"2025-04-01,Item {i},3,,,,\n" for i in range(25)))
+        argv = [
+            str(path),
+            "--household-id",
+            str(household_id),
+            "--as",
+            "Cara",
+            "--chunk-size",
+            "10",
+            "--database-url",
+            SQLALCHEMY_DATABASE_URL,
+        ]
+
+        assert expense_import.main(argv) == 0
+
+        captured = capsys.readouterr()
+        assert "imported 25 expenses" in captured.out
+        assert "25 rows: 25 created" in captured.err
+        assert db.query(Expense).count() == 25
+
+    def test_unknown_importer(self, client, db, tmp_path, make_household):
+        _, _, household_id, _ = _setup_household(make_household)
+        path = tmp_path / "history.csv"
+        path.write_text(HEADER)
+        argv = [str(path), "--household-id", str(household_id), "--as", "Nobody"]
+        assert expense_import.main([*argv, "--database-url", SQLALCHEMY_DATABASE_URL]) == 2
@@ -0,0 +1,47 @@
+"""Unit tests for the opt-in fast response mode (app.core.responses)."""
+
+import pytest
+
+from app.core import responses
+from app.core.config import settings
+from app.schemas.schemas import ExpensePage
+
+pytest.importorskip("orjson")
+
+
+@pytest.fixture
+def household(make_household):
+    """Alice and Bob share a household; returns (members_url, Alice's headers)."""
+    home = make_household("Alice", "Bob")
+    return f"/api/v1/households/{home.id}/members", home.headers["Alice"]
+
+
+class TestFastMode:
+    @pytest.mark.parametrize("path", ["/api/v1/auth/me", "members"])
+    def test_same_body_as_validated_response(self, client, household, monkeypatch, path):
+        members_url, headers = household
+        url = members_url if path == "members" else path
+        standard = client.get(url, headers=headers)
+
+        monkeypatch.setattr(settings, "FAST_RESPONSES", True)
+        fast = client.get(url, headers=headers)
+
+        assert fast.status_code == standard.status_code == 200
+        assert fast.json() == standard.json()
+        assert fast.headers["content-type"] == "application/json"
+
+    def test_off_returns_object_unchanged(self):
+        obj = object()
+        assert responses.respond(ExpensePage, obj) is obj
+
+
+class TestOrmDumper:
+    def test_unions_of_models_are_not_supported(self):
+        with pytest.raises(TypeError):
+            responses.orm_dumper(ExpensePage)
+
+    def test_missing_orjson_fails_at_startup(self, monkeypatch):
+        monkeypatch.setattr(responses, "orjson", None)
+        monkeypatch.setattr(settings, "FAST_RESPONSES", True)
+        with pytest.raises(RuntimeError, match="orjson"):
+            responses.default_response_class()
@@ -0,0 +1,136 @@
+"""Unit tests for the household ledger, its cache, and GET /households/{id}/balances."""
+
+import random
+
+import pytest
+
+from app.core.balance_cache import BalanceCache
+from app.core.ledger import Ledger, Transfer, build_ledger, net_balances, simplify_debts
+from app.models.models import Expense
+from tests.conftest import auth_header, count_statements, create_expense, register
+
+# ── ledger ────────────────────────────────────────────────────────────────
+
+
+class TestLedger:
+    def test_net_balances_fold_pairwise_debts(self):
+        debts = [(2, 1, 1000), (3, 1, 500), (1, 2, 200)]
+        assert net_balances(debts) == {1: 1300, 2: -800, 3: -500}
+
+    def test_chain_of_debts_collapses_to_one_transfer(self):
+        # 3 owes 2 owes 1 the same amount: 2 is square, 3 pays 1 directly.
+        ledger = build_ledger([(3, 2, 700), (2, 1, 700)])
+        assert ledger.transfers == (Transfer(debtor_id=3, creditor_id=1, cents=700),)
+
+    def test_random_households_settle_in_at_most_n_minus_one_transfers(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            n = rng.randint(2, 40)
+            debts = [
+                (rng.randrange(n), rng.randrange(n), rng.randint(1, 10_000)) for _ in range(n * 3)
+            ]
+            net = net_balances((d, c, cents) for d, c, cents in debts if d != c)
+            transfers = simplify_debts(net)
+
+            assert len(transfers) <= max(len(net) - 1, 0)
+            settled = dict(net)
+            for t in transfers:
+                assert t.cents > 0
+                settled[t.debtor_id] += t.cents
+                settled[t.creditor_id] -= t.cents
+            assert not any(settled.values())
+
+    def test_unbalanced_input_is_rejected(self):
+        with pytest.raises(ValueError):
+            simplify_debts({1: 100, 2: -50})
+
+
+# ── BalanceCache ──────────────────────────────────────────────────────────
+
+
+class TestBalanceCache:
+    ledger = Ledger(net={1: 100, 2: -100}, transfers=(Transfer(2, 1, 100),))
+
+    def test_hit_after_put(self):
+        cache = BalanceCache(maxsize=4, ttl_seconds=10)
+        cache.put(1, self.ledger, cache.generation(1))
+        assert cache.get(1) is self.ledger
+
+    def test_put_after_invalidation_is_dropped(self):
+        cache = BalanceCache(maxsize=4, ttl_seconds=10)
+        generation = cache.generation(1)
+        cache.invalidate(1)  # a payment committed while the ledger was computed
+        cache.put(1, self.ledger, generation)
+        assert cache.get(1) is None
+
+    def test_evicts_least_recently_used(self):
+        cache = BalanceCache(maxsize=2, ttl_seconds=10)
+        for household_id in (1, 2, 3):
+            cache.put(household_id, self.ledger, 0)
+        assert cache.get(1) is None
+        assert cache.get(3) is self.ledger
+
+
+# ── GET /households/{id}/balances ─────────────────────────────────────────
+
+
+def _even(description, amount):
+    return {
+        "description": description,
+        "amount": amount,
+        "split_evenly": True,
+        "include_creator": True,
+    }
+
+
+class TestHouseholdBalancesEndpoint:
+    def test_balances_and_transfers(self, client, make_household):
+        house = make_household("Alice", "Bob", "Cara")
+        household_id, headers, ids = house.id, house.headers, house.user_ids
+        create_expense(client, headers["Alice"], _even("Groceries", 90.0))
+        create_expense(client, headers["Bob"], _even("Internet", 30.0))
+
+        resp = client.get(f"/api/v1/households/{household_id}/balances", headers=headers["Cara"])
+
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        # Alice is owed 30 + 30 and owes Bob 10; Bob is owed 10 + 10 and owes Alice 30.
+        assert {b["user_id"]: b["net"] for b in body["balances"]} == {
+            ids["Alice"]: 50.0,
+            ids["Bob"]: -10.0,
+            ids["Cara"]: -40.0,
+        }
+        assert len(body["transfers"]) <= 2
+        assert sum(t["amount"] for t in body["transfers"]) == 50.0
+        assert all(t["to_user_id"] == ids["Alice"] for t in body["transfers"])
+
+    def test_cached_until_payment(self, client, db, make_household):
+        house = make_household("Alice", "Bob", "Cara")
+        household_id, headers, ids = house.id, house.headers, house.user_ids
+        create_expense(client, headers["Alice"], _even("Groceries", 90.0))
+        url = f"/api/v1/households/{household_id}/balances"
+        client.get(url, headers=headers["Bob"])
+
+        with count_statements() as statements:
+            cached = client.get(url, headers=headers["Bob"])
+        assert len(statements) == 1  # only the membership check
+        assert {b["user_id"]: b["net"] for b in cached.json()["balances"]}[ids["Bob"]] == -30.0
+
+        expense_id = db.query(Expense.id).scalar()
+        client.post(
+            f"/api/v1/expenses/{expense_id}/confirm-payment",
+            json={"amount": 30.0},
+            headers=headers["Bob"],
+        )
+        fresh = client.get(url, headers=headers["Bob"]).json()
+        assert {b["user_id"]: b["net"] for b in fresh["balances"]}[ids["Bob"]] == 0.0
+
+    def test_non_member_forbidden_and_unknown_household(self, client, make_household):
+        household_id = make_household("Alice", "Bob", "Cara").id
+        register(client, email="eve@bal.com", username="Eve", password="Password123!")
+        eve = auth_header(client, username="Eve", password="Password123!")
+
+        resp = client.get(f"/api/v1/households/{household_id}/balances", headers=eve)
+        assert resp.status_code == 403
+        resp = client.get("/api/v1/households/9999/balances", headers=eve)
+        assert resp.status_code == 404
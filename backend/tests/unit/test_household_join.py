@@ -0,0 +1,194 @@
+"""Unit tests for POST /households, POST /households/join and their guards."""
+
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import null
+
+from app.api import households
+from app.core.invite_codes import INVITE_CODE_ALPHABET
+from app.core.join_guard import AttemptLimiter, NegativeLookupCache, join_attempt_limiter
+from app.models.models import Household, HouseholdMember, User
+from tests.conftest import FakeClock, auth_header, count_statements, register
+
+CREATE_URL = "/api/v1/households"
+JOIN_URL = "/api/v1/households/join"
+
+
+def _user(client, name):
+    register(client, email=f"{name.lower()}@join.com", username=name, password="Password123!")
+    return auth_header(client, username=name, password="Password123!")
+
+
+def _memberships(db, username):
+    user = db.query(User).filter(User.username == username).one()
+    db.expire_all()
+    return db.query(HouseholdMember).filter(HouseholdMember.user_id == user.id).all()
+
+
+class TestCreateHousehold:
+    def test_creator_becomes_admin(self, client, db):
+        alice = _user(client, "Alice")
+
+        resp = client.post(
+            CREATE_URL, json={"name": "Flat 4B", "address": "4 Main St"}, headers=alice
+        )
+
+        assert resp.status_code == 201, resp.text
+        body = resp.json()
+        assert body["name"] == "Flat 4B"
+        assert len(body["invite_code"]) == 8
+        assert set(body["invite_code"]) <= set(INVITE_CODE_ALPHABET)
+        (membership,) = _memberships(db, "Alice")
+        assert (membership.household_id, membership.is_admin) == (body["id"], True)
+
+    def test_user_already_in_a_household(self, client, db):
+        alice = _user(client, "Alice")
+        client.post(CREATE_URL, json={"name": "First"}, headers=alice)
+
+        resp = client.post(CREATE_URL, json={"name": "Second"}, headers=alice)
+
+        assert resp.status_code == 400
+        assert db.query(Household).count() == 1
+
+
+class TestJoinHousehold:
+    def _household(self, client):
+        owner = _user(client, "Owner")
+        return client.post(CREATE_URL, json={"name": "Home"}, headers=owner).json()
+
+    def test_join_by_code_is_case_insensitive_and_idempotent(self, client, db):
+        household = self._household(client)
+        bob = _user(client, "Bob")
+        code = f"  {household['invite_code'].lower()} "
+
+        resp = client.post(JOIN_URL, json={"invite_code": code}, headers=bob)
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["id"] == household["id"]
+
+        with count_statements() as statements:
+            again = client.post(JOIN_URL, json={"invite_code": code}, headers=bob)
+        assert again.status_code == 200
+        assert len(statements) == 1  # the lookup; no write for an existing membership
+        (membership,) = _memberships(db, "Bob")
+        assert membership.left_at is None and not membership.is_admin
+
+    def test_former_member_is_reactivated(self, client, db):
+        household = self._household(client)
+        bob = _user(client, "Bob")
+        client.post(JOIN_URL, json={"invite_code": household["invite_code"]}, headers=bob)
+        (membership,) = _memberships(db, "Bob")
+        membership.left_at = datetime.now(UTC)
+        db.commit()
+
+        resp = client.post(JOIN_URL, json={"invite_code": household["invite_code"]}, headers=bob)
+
+        assert resp.status_code == 200
+        (membership,) = _memberships(db, "Bob")
+        assert membership.left_at is None
+
+    def test_member_of_another_household_is_rejected(self, client, db):
+        household = self._household(client)
+        bob = _user(client, "Bob")
+        client.post(CREATE_URL, json={"name": "Bob's place"}, headers=bob)
+
+        resp = client.post(JOIN_URL, json={"invite_code": household["invite_code"]}, headers=bob)
+
+        assert resp.status_code == 400
+        assert len(_memberships(db, "Bob")) == 1
+
+
+class TestConcurrentMemberships:
+    """Requests that race past the membership check and hit the unique index."""
+
+    @pytest.fixture
+    def check_passes(self, monkeypatch):
+        # As if another request committed its membership right after the check.
+        monkeypatch.setattr(
+            households, "_current_household_id", lambda _user_id: null().label("current")
+        )
+
+    def test_second_join_is_rejected(self, client, db, check_passes):
+        owner = _user(client, "Owner")
+        first = client.post(CREATE_URL, json={"name": "First"}, headers=owner).json()
+        second = client.post(CREATE_URL, json={"name": "Second"}, headers=_user(client, "Cara"))
+        bob = _user(client, "Bob")
+        client.post(JOIN_URL, json={"invite_code": first["invite_code"]}, headers=bob)
+
+        resp = client.post(
+            JOIN_URL, json={"invite_code": second.json()["invite_code"]}, headers=bob
+        )
+
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "User is already in another household"
+        (membership,) = _memberships(db, "Bob")
+        assert membership.household_id == first["id"]
+
+    def test_second_create_is_rejected(self, client, db, check_passes):
+        alice = _user(client, "Alice")
+        client.post(CREATE_URL, json={"name": "First"}, headers=alice)
+
+        resp = client.post(CREATE_URL, json={"name": "Second"}, headers=alice)
+
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "User is already in a household"
+        assert db.query(Household).count() == 1
+        assert len(_memberships(db, "Alice")) == 1
+
+
+class TestGuessingInviteCodes:
+    def test_repeated_wrong_code_is_answered_from_memory(self, client, db):
+        bob = _user(client, "Bob")
+        assert (
+            client.post(JOIN_URL, json={"invite_code": "NOPE2345"}, headers=bob).status_code == 404
+        )
+
+        with count_statements() as statements:
+            resp = client.post(JOIN_URL, json={"invite_code": "nope2345"}, headers=bob)
+
+        assert resp.status_code == 404
+        assert statements == []
+
+    def test_client_is_cut_off_after_too_many_wrong_codes(self, client, db, monkeypatch):
+        monkeypatch.setattr(join_attempt_limiter, "max_attempts", 3)
+        bob = _user(client, "Bob")
+        statuses = [
+            client.post(JOIN_URL, json={"invite_code": f"WRONG{i:03d}"}, headers=bob).status_code
+            for i in range(5)
+        ]
+
+        assert statuses == [404, 404, 404, 429, 429]
+        resp = client.post(JOIN_URL, json={"invite_code": "WRONG999"}, headers=bob)
+        assert int(resp.headers["Retry-After"]) >= 1
+
+
+class TestGuards:
+    def test_limiter_window_resets(self):
+        clock = FakeClock()
+        limiter = AttemptLimiter(max_attempts=2, window_seconds=60, clock=clock)
+        limiter.record_failure("1.2.3.4")
+        limiter.record_failure("1.2.3.4")
+        assert limiter.retry_after("1.2.3.4") == 60
+        assert limiter.retry_after("5.6.7.8") == 0
+
+        clock.now = 61
+        assert limiter.retry_after("1.2.3.4") == 0
+
+    def test_limiter_tracks_a_bounded_number_of_clients(self):
+        limiter = AttemptLimiter(max_attempts=1, window_seconds=60, maxsize=2)
+        for ip in ("a", "b", "c"):
+            limiter.record_failure(ip)
+        assert limiter.stats()["tracked_clients"] == 2
+        assert limiter.retry_after("a") == 0  # evicted first
+
+    def test_negative_cache_expires_and_discards(self):
+        clock = FakeClock()
+        misses = NegativeLookupCache(maxsize=10, ttl_seconds=30, clock=clock)
+        misses.add("ABCD2345")
+        assert "ABCD2345" in misses
+        misses.discard("ABCD2345")
+        assert "ABCD2345" not in misses
+
+        misses.add("EFGH2345")
+        clock.now = 31
+        assert "EFGH2345" not in misses
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi import HTTPException
@@ -6,6 +6,7 @@ from fastapi import HTTPException
 from app.api.households import get_household_members
 from app.models.models import Household, HouseholdMember
 from app.models.models import User as UserModel
+from tests.conftest import auth_header, count_statements, register
 
 # helpers needed to construct the objects returned by the mocked database queries
 
@@ -36,11 +37,26 @@ def _make_membership(user_id: int, household_id: int, is_admin: bool = False) ->
     return m
 
 
+def _make_db(household, members=()):
+    """Stub the single household/member outer-join query made by the endpoint.
+
+    Each row is (household id, active member or None); a missing household
+    yields no rows at all.
+    """
+    if household is None:
+        rows = []
+    else:
+        rows = [(household.id, m) for m in members] or [(household.id, None)]
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=rows)))
+    return db
+
+
 # Normal Flow Test
 
 
 class TestGetHouseholdMembersNormalFlow:
-    def test_member_can_view_member_list(self):
+    async def test_member_can_view_member_list(self):
         """A current member receives the full list of household members."""
         alice = _make_user(1, "Alice")
         bob = _make_user(2, "Bob")
@@ -53,18 +69,10 @@ class TestGetHouseholdMembersNormalFlow:
             _make_membership(cara.id, household.id),
         ]
 
-        db = MagicMock()
-
-        # Stub: household exists
-        db.query(Household).filter().first.return_value = household
+        # Stub: household exists, requesting user IS a member, full member list
+        db = _make_db(household, memberships)
 
-        # Stub: requesting user IS a member
-        db.query(HouseholdMember).filter().first.return_value = memberships[0]
-
-        # Stub: full member list
-        db.query(HouseholdMember).filter().all.return_value = memberships
-
-        result = get_household_members(
+        result = await get_household_members(
             household_id=household.id,
             db=db,
             current_user=alice,
@@ -73,7 +81,7 @@ class TestGetHouseholdMembersNormalFlow:
         assert result == memberships
         assert len(result) == 3
 
-    def test_non_admin_member_can_also_view_list(self):
+    async def test_non_admin_member_can_also_view_list(self):
         """Any active member (not just admin) can view the list."""
         alice = _make_user(1, "Alice")
         bob = _make_user(2, "Bob")
@@ -85,12 +93,9 @@ class TestGetHouseholdMembersNormalFlow:
             bob_membership,
         ]
 
-        db = MagicMock()
-        db.query(Household).filter().first.return_value = household
-        db.query(HouseholdMember).filter().first.return_value = bob_membership
-        db.query(HouseholdMember).filter().all.return_value = all_members
+        db = _make_db(household, all_members)
 
-        result = get_household_members(
+        result = await get_household_members(
             household_id=household.id,
             db=db,
             current_user=bob,
@@ -98,7 +103,7 @@ class TestGetHouseholdMembersNormalFlow:
 
         assert len(result) == 2
 
-    def test_returns_only_active_members(self):
+    async def test_returns_only_active_members(self):
         """Members who have left (left_at set) are excluded by the query."""
         alice = _make_user(1, "Alice")
         household = _make_household(10, "MapleHouse")
@@ -107,12 +112,9 @@ class TestGetHouseholdMembersNormalFlow:
         # Only active members returned by the stubbed query
         active_members = [alice_membership]
 
-        db = MagicMock()
-        db.query(Household).filter().first.return_value = household
-        db.query(HouseholdMember).filter().first.return_value = alice_membership
-        db.query(HouseholdMember).filter().all.return_value = active_members
+        db = _make_db(household, active_members)
 
-        result = get_household_members(
+        result = await get_household_members(
             household_id=household.id,
             db=db,
             current_user=alice,
@@ -125,37 +127,28 @@ class TestGetHouseholdMembersNormalFlow:
 
 
 class TestGetHouseholdMembersErrorFlows:
-    def test_household_not_found_raises_404(self):
+    async def test_household_not_found_raises_404(self):
         """Should raise 404 when the household does not exist."""
         alice = _make_user(1, "Alice")
 
-        db = MagicMock()
-        db.query(Household).filter().first.return_value = None  # household missing
+        db = _make_db(None)  # household missing
 
         with pytest.raises(HTTPException) as exc_info:
-            get_household_members(household_id=999, db=db, current_user=alice)
+            await get_household_members(household_id=999, db=db, current_user=alice)
 
         assert exc_info.value.status_code == 404
         assert "Household not found" in exc_info.value.detail
 
-    def test_non_member_raises_403(self):
+    async def test_non_member_raises_403(self):
         """Should raise 403 when the requesting user is not in the household."""
         dave = _make_user(4, "Dave")
         household = _make_household(10, "MapleHouse")
 
-        # Use side_effect to return different values for Household vs HouseholdMember queries
-        db = MagicMock()
-
-        household_query = MagicMock()
-        household_query.filter.return_value.first.return_value = household
-
-        member_query = MagicMock()
-        member_query.filter.return_value.first.return_value = None  # Dave is not a member
-
-        db.query.side_effect = lambda model: household_query if model is Household else member_query
+        other_member = _make_membership(1, household.id)
+        db = _make_db(household, [other_member])  # Dave is not a member
 
         with pytest.raises(HTTPException) as exc_info:
-            get_household_members(
+            await get_household_members(
                 household_id=household.id,
                 db=db,
                 current_user=dave,
@@ -169,19 +162,16 @@ class TestGetHouseholdMembersErrorFlows:
         resp = client.get("/api/v1/households/1/members")
         assert resp.status_code == 401
 
-    def test_single_member_household_returns_one_item(self):
+    async def test_single_member_household_returns_one_item(self):
         """A household with only the creator should return a list of one."""
         alice = _make_user(1, "Alice")
         household = _make_household(10, "SoloHouse")
 
         alice_membership = _make_membership(alice.id, household.id, is_admin=True)
 
-        db = MagicMock()
-        db.query(Household).filter().first.return_value = household
-        db.query(HouseholdMember).filter().first.return_value = alice_membership
-        db.query(HouseholdMember).filter().all.return_value = [alice_membership]
+        db = _make_db(household, [alice_membership])
 
-        result = get_household_members(
+        result = await get_household_members(
             household_id=household.id,
             db=db,
             current_user=alice,
@@ -189,3 +179,45 @@ class TestGetHouseholdMembersErrorFlows:
 
         assert len(result) == 1
         assert result[0].user_id == alice.id
+
+
+# Query-count regression
+
+
+class TestGetHouseholdMembersQueryCount:
+    def _household_with_members(self, db, n_members: int, invite_code: str, username: str) -> int:
+        requester = db.query(UserModel).filter(UserModel.username == username).one()
+        household = Household(name=f"House{n_members}", invite_code=invite_code)
+        db.add(household)
+        db.flush()
+        db.add(HouseholdMember(user_id=requester.id, household_id=household.id))
+        for i in range(n_members - 1):
+            user = UserModel(
+                username=f"m{n_members}_{i}",
+                email=f"m{n_members}_{i}@test.com",
+                password_hash="not-a-real-hash",
+            )
+            db.add(user)
+            db.flush()
+            db.add(HouseholdMember(user_id=user.id, household_id=household.id))
+        db.commit()
+        return household.id
+
+    def test_statement_count_does_not_grow_with_household_size(self, client, db):
+        # A user is active in one household at a time, so each has its own requester.
+        register(client)
+        register(client, email="large@example.com", username="large")
+        small = self._household_with_members(db, 2, "SMALL001", "testuser")
+        large = self._household_with_members(db, 25, "LARGE001", "large")
+
+        counts = {}
+        for household_id, size, username in ((small, 2, "testuser"), (large, 25, "large")):
+            headers = auth_header(client, username=username)
+            client.get("/api/v1/auth/me", headers=headers)  # warm the principal cache
+            with count_statements() as statements:
+                resp = client.get(f"/api/v1/households/{household_id}/members", headers=headers)
+            assert resp.status_code == 200
+            assert len(resp.json()) == size
+            counts[size] = len(statements)
+
+        assert counts[2] == counts[25] == 1
@@ -1,13 +1,18 @@
+import itertools
 import re
 
 import pytest
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
 
 from app.core.invite_codes import (
     DEFAULT_INVITE_CODE_LENGTH,
     INVITE_CODE_ALPHABET,
+    InviteCodeAllocator,
     generate_unique_invite_code,
 )
 from app.models.models import Household
+from tests.conftest import TestingAsyncSessionLocal, count_statements, engine
 
 
 class TestInviteCodeTool:
@@ -29,7 +34,7 @@ class TestInviteCodeTool:
         db.add(Household(name="Existing", invite_code=existing))
         db.commit()
 
-        candidates = iter([existing, "ZZZZZZZZ"])
+        candidates = itertools.chain([existing], itertools.repeat("ZZZZZZZZ"))
 
         def candidate_fn(_len: int) -> str:
             return next(candidates)
@@ -60,3 +65,85 @@ class TestInviteCodeTool:
     def test_invalid_params_raise(self, db, length, max_attempts, exc):
         with pytest.raises(exc):
             generate_unique_invite_code(db, length=length, max_attempts=max_attempts)
+
+    def test_checks_a_whole_batch_with_one_query(self, db):
+        for code in ("AAAA0001", "AAAA0002", "AAAA0003"):
+            db.add(Household(name=code, invite_code=code))
+        db.commit()
+        candidates = iter(["AAAA0001", "AAAA0002", "AAAA0003", "FREE0001"])
+
+        queries = []
+
+        def _record(_conn, _cursor, statement, *_args):
+            queries.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            code = generate_unique_invite_code(
+                db, candidate_fn=lambda _len: next(candidates), batch_size=4
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        assert code == "FREE0001"
+        assert len(queries) == 1
+
+
+def _sequence(*codes):
+    """candidate_fn returning ``codes`` in order, then fresh unique codes."""
+    fallback = (f"GEN{i:05d}" for i in itertools.count())
+    it = itertools.chain(codes, fallback)
+    return lambda _len: next(it)
+
+
+async def _create(db, code, name="Home"):
+    household = Household(name=name, invite_code=code)
+    db.add(household)
+    await db.flush()
+    return household
+
+
+class TestInviteCodeAllocator:
+    async def test_reservoir_serves_later_households_without_lookups(self, db):
+        allocator = InviteCodeAllocator(reservoir_size=8, candidate_fn=_sequence())
+        async with TestingAsyncSessionLocal() as session:
+            with count_statements() as statements:
+                for i in range(8):
+                    await allocator.insert(
+                        session, lambda code, i=i: _create(session, code, f"H{i}")
+                    )
+            await session.commit()
+
+        lookups = [s for s in statements if s.lstrip().startswith("SELECT")]
+        assert len(lookups) == 1
+        assert allocator.reserved == 0
+        assert db.query(Household).count() == 8
+
+    async def test_code_taken_after_the_check_is_retried(self, db):
+        allocator = InviteCodeAllocator(reservoir_size=2, candidate_fn=_sequence("RACE0001"))
+        async with TestingAsyncSessionLocal() as session:
+            await allocator.refill(session)
+            # Another worker creates a household with the reserved code first.
+            db.add(Household(name="Other", invite_code="RACE0001"))
+            db.commit()
+
+            household = await allocator.insert(session, lambda code: _create(session, code))
+            await session.commit()
+
+        assert household.invite_code == "GEN00000"
+        codes = set(db.scalars(select(Household.invite_code)))
+        assert codes == {"RACE0001", "GEN00000"}
+
+    async def test_other_integrity_errors_are_not_retried(self, db):
+        allocator = InviteCodeAllocator(candidate_fn=_sequence())
+        async with TestingAsyncSessionLocal() as session:
+            with pytest.raises(IntegrityError):
+                await allocator.insert(session, lambda code: _create(session, code, name=None))
+
+    async def test_gives_up_when_every_candidate_is_taken(self, db):
+        db.add(Household(name="Existing", invite_code="ABCDEFGH"))
+        db.commit()
+        allocator = InviteCodeAllocator(max_attempts=32, candidate_fn=lambda _len: "ABCDEFGH")
+        async with TestingAsyncSessionLocal() as session:
+            with pytest.raises(RuntimeError):
+                await allocator.take(session)
@@ -0,0 +1,128 @@
+"""Unit tests for GET /expenses (keyset pagination, filters, include_shares)."""
+
+from datetime import datetime, timedelta
+
+from app.models.models import Expense, ExpenseStatus
+from tests.conftest import auth_header, count_statements, register
+
+LIST_URL = "/api/v1/expenses"
+
+
+def _setup_household(client, db, make_household, count=7):
+    """Alice and Bob share a household with ``count`` expenses; returns (headers, ids)."""
+    household = make_household("Alice", "Bob")
+    ids, headers = household.user_ids, household.headers
+    items = [
+        {
+            "description": f"Expense {i}",
+            "amount": 10.0 + i,
+            "category": "food" if i % 2 else "utilities",
+            "split_evenly": True,
+            "include_creator": True,
+        }
+        for i in range(count)
+    ]
+    resp = client.post("/api/v1/expenses/batch", json={"items": items}, headers=headers["Alice"])
+    assert resp.status_code == 201, resp.text
+
+    # Pin dates: one per day, except that expenses 3 and 4 share a timestamp.
+    start = datetime(2026, 1, 1)
+    for i, expense in enumerate(db.query(Expense).order_by(Expense.id)):
+        expense.date = start + timedelta(days=i - 1 if i == 4 else i)
+    db.commit()
+    return headers, ids
+
+
+def _walk(client, headers, **params):
+    """Follow next_cursor to the end; returns the pages' descriptions."""
+    pages, cursor = [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        resp = client.get(LIST_URL, params=query, headers=headers)
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        pages.append([item["description"] for item in body["items"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+class TestKeysetPagination:
+    def test_pages_cover_every_expense_once_newest_first(self, client, db, make_household):
+        headers, _ = _setup_household(client, db, make_household)
+
+        pages = _walk(client, headers["Bob"], limit=3)
+
+        assert [len(page) for page in pages] == [3, 3, 1]
+        # Expenses 3 and 4 tie on date and fall back to id, descending.
+        assert [d for page in pages for d in page] == [
+            f"Expense {i}" for i in (6, 5, 4, 3, 2, 1, 0)
+        ]
+
+    def test_exact_multiple_of_limit_has_no_empty_trailing_page(self, client, db, make_household):
+        headers, _ = _setup_household(client, db, make_household, count=4)
+        assert _walk(client, headers["Alice"], limit=2) == [
+            ["Expense 3", "Expense 2"],
+            ["Expense 1", "Expense 0"],
+        ]
+
+    def test_invalid_cursor_and_limit(self, client, db, make_household):
+        headers, _ = _setup_household(client, db, make_household, count=1)
+        resp = client.get(LIST_URL, params={"cursor": "not-a-cursor"}, headers=headers["Alice"])
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Invalid cursor"
+        resp = client.get(LIST_URL, params={"limit": 0}, headers=headers["Alice"])
+        assert resp.status_code == 422
+
+
+class TestFilters:
+    def test_category_and_date_range(self, client, db, make_household):
+        headers, _ = _setup_household(client, db, make_household)
+        params = {
+            "category": "food",
+            "date_from": "2026-01-02T00:00:00",
+            "date_to": "2026-01-06T00:00:00",
+        }
+        assert _walk(client, headers["Alice"], limit=1, **params) == [["Expense 3"], ["Expense 1"]]
+
+    def test_status_and_creator(self, client, db, make_household):
+        headers, ids = _setup_household(client, db, make_household, count=3)
+        db.query(Expense).filter(Expense.description == "Expense 1").update(
+            {Expense.status: ExpenseStatus.FULLY_SETTLED}
+        )
+        db.commit()
+
+        settled = _walk(client, headers["Bob"], status="FULLY_SETTLED")
+        assert settled == [["Expense 1"]]
+        assert _walk(client, headers["Bob"], creator_id=ids["Bob"]) == [[]]
+        assert len(_walk(client, headers["Bob"], creator_id=ids["Alice"])[0]) == 3
+
+
+class TestIncludeShares:
+    def test_shares_are_batch_loaded(self, client, db, make_household):
+        headers, ids = _setup_household(client, db, make_household, count=5)
+        client.get(LIST_URL, headers=headers["Bob"])  # warm the principal cache
+
+        with count_statements() as statements:
+            resp = client.get(LIST_URL, params={"include_shares": True}, headers=headers["Bob"])
+
+        # Membership, the page of expenses and one IN query for all their shares.
+        assert len(statements) == 3
+        items = resp.json()["items"]
+        assert len(items) == 5
+        assert {s["user_id"] for s in items[0]["shares"]} == set(ids.values())
+        assert items[0]["amount"] == 14.0
+        assert [s["amount_owed"] for s in items[0]["shares"]] == [7.0, 7.0]
+
+    def test_shares_omitted_by_default(self, client, db, make_household):
+        headers, _ = _setup_household(client, db, make_household, count=1)
+        (item,) = client.get(LIST_URL, headers=headers["Alice"]).json()["items"]
+        assert "shares" not in item
+
+
+class TestAccess:
+    def test_user_without_household(self, client, db):
+        register(client, email="solo@list.com", username="Solo", password="Password123!")
+        headers = auth_header(client, username="Solo", password="Password123!")
+        resp = client.get(LIST_URL, headers=headers)
+        assert resp.status_code == 400
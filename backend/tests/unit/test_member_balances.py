@@ -0,0 +1,76 @@
+"""Unit tests for the materialized member_balances table and its verify/rebuild CLI."""
+
+from app.db import balances
+from app.models.models import Expense, MemberBalance
+from tests.conftest import SQLALCHEMY_DATABASE_URL, create_expense, engine
+
+
+def _household_with_activity(client, db, make_household):
+    """Alice, Bob and Cara; two expenses and one partial payment. Returns user ids."""
+    household = make_household("Alice", "Bob", "Cara")
+    ids, headers = household.user_ids, household.headers
+    even = {"split_evenly": True, "include_creator": True}
+    create_expense(client, headers["Alice"], {"description": "Rent", "amount": 90.0, **even})
+    create_expense(client, headers["Bob"], {"description": "Wifi", "amount": 30.0, **even})
+    rent_id = db.query(Expense.id).filter(Expense.description == "Rent").scalar()
+    resp = client.post(
+        f"/api/v1/expenses/{rent_id}/confirm-payment",
+        json={"amount": 12.5},
+        headers=headers["Cara"],
+    )
+    assert resp.status_code == 200, resp.text
+    return household.id, ids
+
+
+def _stored(db, household_id):
+    rows = db.query(MemberBalance).filter(MemberBalance.household_id == household_id).all()
+    return {row.user_id: row.net_cents for row in rows}
+
+
+class TestIncrementalMaintenance:
+    def test_table_tracks_expenses_and_payments(self, client, db, make_household):
+        household_id, ids = _household_with_activity(client, db, make_household)
+
+        # Rent: Bob and Cara owe Alice 30 each, Cara paid 12.50 back.
+        # Wifi: Alice and Cara owe Bob 10 each.
+        assert _stored(db, household_id) == {
+            ids["Alice"]: 3000 + 1750 - 1000,
+            ids["Bob"]: -3000 + 2000,
+            ids["Cara"]: -1750 - 1000,
+        }
+        with engine.connect() as conn:
+            assert balances.verify(conn) == []
+
+
+class TestVerifyAndRebuild:
+    def test_verify_reports_drift_and_rebuild_repairs_it(self, client, db, make_household):
+        household_id, ids = _household_with_activity(client, db, make_household)
+        expected = _stored(db, household_id)
+
+        db.query(MemberBalance).filter(MemberBalance.user_id == ids["Bob"]).update(
+            {MemberBalance.net_cents: 0}
+        )
+        db.query(MemberBalance).filter(MemberBalance.user_id == ids["Cara"]).delete()
+        db.commit()
+
+        with engine.connect() as conn:
+            drift = balances.verify(conn, chunk_size=1)
+        assert {key[1] for key, _, _ in drift} == {ids["Bob"], ids["Cara"]}
+
+        with engine.begin() as conn:
+            assert balances.rebuild(conn, chunk_size=1) == 3
+        db.expire_all()
+        assert _stored(db, household_id) == expected
+
+    def test_cli_exit_codes(self, client, db, capsys, make_household):
+        _, ids = _household_with_activity(client, db, make_household)
+        argv = ["--database-url", SQLALCHEMY_DATABASE_URL]
+        assert balances.main(argv) == 0
+
+        db.query(MemberBalance).filter(MemberBalance.user_id == ids["Alice"]).delete()
+        db.commit()
+        assert balances.main(argv) == 1
+        assert "balances differ" in capsys.readouterr().err
+
+        assert balances.main([*argv, "--rebuild"]) == 0
+        assert balances.main(argv) == 0
@@ -0,0 +1,97 @@
+"""The Alembic migrations, the migrate CLI and the startup schema check."""
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+
+from app.db import migrate
+from app.db.database import Base, create_async_db_engine, create_db_engine
+
+
+def _config(url: str):
+    return migrate.alembic_config(url, configure_logger=False)
+
+
+class TestMigrations:
+    def test_upgrade_head_matches_models(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'migrated.db'}"
+        command.upgrade(_config(url), "head")
+
+        engine = create_db_engine(url)
+        try:
+            with engine.connect() as conn:
+                diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+        finally:
+            engine.dispose()
+        assert diff == []
+
+    def test_downgrade_to_base_and_back(self, tmp_path):
+        cfg = _config(f"sqlite:///{tmp_path / 'roundtrip.db'}")
+        command.upgrade(cfg, "head")
+        command.downgrade(cfg, "base")
+        command.upgrade(cfg, "head")
+
+    def test_null_expense_dates_are_backfilled(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'dates.db'}"
+        command.upgrade(_config(url), "0008")
+        engine = create_db_engine(url)
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    text(
+                        "INSERT INTO users (id, username, email, password_hash, is_active)"
+                        " VALUES (1, 'alice', 'alice@example.com', 'x', 1)"
+                    )
+                )
+                conn.execute(
+                    text("INSERT INTO households (id, name, invite_code) VALUES (1, 'Home', 'H1')")
+                )
+                conn.execute(
+                    text(
+                        "INSERT INTO expenses (description, date, status, creator_id,"
+                        " household_id, amount_cents) VALUES ('Rent', NULL, 'PENDING', 1, 1, 100)"
+                    )
+                )
+
+            command.upgrade(_config(url), "head")
+
+            with engine.connect() as conn:
+                assert (
+                    conn.execute(text("SELECT count(*) FROM expenses WHERE date IS NULL")).scalar()
+                    == 0
+                )
+        finally:
+            engine.dispose()
+
+
+class TestVerifySchema:
+    async def test_unmigrated_database_is_rejected(self, tmp_path):
+        engine = create_async_db_engine(f"sqlite:///{tmp_path / 'empty.db'}", poolclass=NullPool)
+        try:
+            assert await migrate.current_revision(engine) is None
+            with pytest.raises(migrate.SchemaOutOfDateError):
+                await migrate.verify_schema(engine)
+        finally:
+            await engine.dispose()
+
+    async def test_database_behind_head_is_rejected(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'behind.db'}"
+        command.upgrade(_config(url), "0001")
+        engine = create_async_db_engine(url, poolclass=NullPool)
+        try:
+            with pytest.raises(migrate.SchemaOutOfDateError, match="0001"):
+                await migrate.verify_schema(engine)
+        finally:
+            await engine.dispose()
+
+
+class TestMigrateCli:
+    def test_check_fails_then_passes_after_migrate(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'cli.db'}"
+        assert migrate.main(["--database-url", url, "--check"]) == 1
+
+        migrate.upgrade(url, configure_logger=False)
+        assert migrate.main(["--database-url", url, "--check"]) == 0
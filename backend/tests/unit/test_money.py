@@ -0,0 +1,70 @@
+"""Unit tests for app.core.money and the Money schema type – no DB needed."""
+
+from decimal import Decimal
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.money import format_cents, from_cents, to_cents
+from app.schemas.schemas import ConfirmPaymentRequest, ExpenseShareBase
+
+
+class TestToCents:
+    @pytest.mark.parametrize(
+        "value,cents",
+        [
+            (12, 1200),
+            (12.5, 1250),
+            ("12.50", 1250),
+            (Decimal("0.07"), 7),
+            ("12.500", 1250),
+            (-4.2, -420),
+            (21474836.47, 2**31 - 1),
+        ],
+    )
+    def test_converts_to_integer_cents(self, value, cents):
+        assert to_cents(value) == cents
+
+    @pytest.mark.parametrize("value", ["abc", "nan", float("inf"), True])
+    def test_rejects_non_amounts(self, value):
+        with pytest.raises(ValueError):
+            to_cents(value)
+
+    @pytest.mark.parametrize("value", [10.005, "1.001", 0.1 + 0.2])
+    def test_rejects_sub_cent_precision(self, value):
+        with pytest.raises(ValueError, match="2 decimal places"):
+            to_cents(value)
+
+    @pytest.mark.parametrize("value", [1e20, "21474836.48", -21474836.48])
+    def test_rejects_amounts_that_do_not_fit_the_column(self, value):
+        with pytest.raises(ValueError, match="at most"):
+            to_cents(value)
+
+
+class TestFormatting:
+    @pytest.mark.parametrize(
+        "cents,text", [(2050, "20.50"), (5, "0.05"), (0, "0.00"), (-5, "-0.05")]
+    )
+    def test_format_cents(self, cents, text):
+        assert format_cents(cents) == text
+
+    def test_from_cents_is_exact(self):
+        assert from_cents(30) == Decimal("0.30")
+
+
+class TestMoneySchemaType:
+    def test_parses_dollars_into_cents(self):
+        assert ConfirmPaymentRequest(amount="19.99").amount == 1999
+
+    def test_serializes_back_to_dollars(self):
+        share = ExpenseShareBase(user_id=1, amount_owed=20.5, paid_amount=0.25)
+        assert share.model_dump(mode="json")["amount_owed"] == 20.5
+        assert share.model_dump(mode="json")["paid_amount"] == 0.25
+
+    def test_invalid_amount_is_a_validation_error(self):
+        with pytest.raises(ValidationError):
+            ConfirmPaymentRequest(amount="twelve")
+
+    def test_json_schema_is_a_number(self):
+        schema = ConfirmPaymentRequest.model_json_schema()
+        assert schema["properties"]["amount"]["type"] == "number"
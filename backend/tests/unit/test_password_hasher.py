@@ -0,0 +1,59 @@
+"""Unit tests for app.core.password_hasher."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.password_hasher import (
+    PasswordHasher,
+    PasswordHasherSaturatedError,
+    password_hasher,
+)
+from tests.conftest import register
+
+
+class TestPasswordHasher:
+    async def test_hash_and_verify_round_trip(self):
+        hasher = PasswordHasher(max_workers=1)
+        try:
+            hashed = await hasher.hash("Secret123!")
+            assert await hasher.verify("Secret123!", hashed) is True
+            assert await hasher.verify("wrong", hashed) is False
+        finally:
+            hasher.shutdown()
+
+    async def test_rejects_when_pending_limit_reached(self, monkeypatch):
+        release = threading.Event()
+        hasher = PasswordHasher(
+            max_pending=1,
+            executor_factory=lambda _workers: ThreadPoolExecutor(max_workers=1),
+        )
+        monkeypatch.setattr("app.core.security.get_password_hash", lambda _p: release.wait(5))
+        try:
+            first = asyncio.create_task(hasher.hash("one"))
+            await asyncio.sleep(0.05)
+            assert hasher.pending == 1
+
+            with pytest.raises(PasswordHasherSaturatedError):
+                await hasher.hash("two")
+
+            release.set()
+            await first
+            assert hasher.pending == 0
+        finally:
+            release.set()
+            hasher.shutdown()
+
+    def test_invalid_max_pending_raises(self):
+        with pytest.raises(ValueError):
+            PasswordHasher(max_pending=0)
+
+
+class TestHasherBackpressure:
+    def test_register_returns_429_when_saturated(self, client, monkeypatch):
+        monkeypatch.setattr(password_hasher, "max_pending", 0)
+        resp = register(client)
+        assert resp.status_code == 429
+        assert resp.headers["Retry-After"] == "1"
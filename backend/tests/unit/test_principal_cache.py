@@ -0,0 +1,103 @@
+"""Unit tests for app.core.principal_cache and its use in get_current_user."""
+
+from app.core.principal_cache import Principal, PrincipalCache, principal_cache
+from app.models.models import User as UserModel
+from tests.conftest import FakeClock, TestingSessionLocal, auth_header, register
+
+
+def _principal(id_: int, username: str) -> Principal:
+    return Principal(id=id_, username=username, is_active=True)
+
+
+# ── PrincipalCache ────────────────────────────────────────────────────────
+
+
+class TestPrincipalCache:
+    def test_hit_after_put(self):
+        cache = PrincipalCache(maxsize=4, ttl_seconds=10)
+        cache.put("alice", _principal(1, "alice"))
+        assert cache.get("alice") == _principal(1, "alice")
+        assert cache.stats()["hits"] == 1
+
+    def test_miss_is_counted(self):
+        cache = PrincipalCache(maxsize=4, ttl_seconds=10)
+        assert cache.get("nobody") is None
+        assert cache.stats()["misses"] == 1
+
+    def test_entry_expires_after_ttl(self):
+        clock = FakeClock()
+        cache = PrincipalCache(maxsize=4, ttl_seconds=10, clock=clock)
+        cache.put("alice", _principal(1, "alice"))
+        clock.now = 10.0
+        assert cache.get("alice") is None
+        assert cache.stats()["size"] == 0
+
+    def test_least_recently_used_is_evicted(self):
+        cache = PrincipalCache(maxsize=2, ttl_seconds=10)
+        cache.put("alice", _principal(1, "alice"))
+        cache.put("bob", _principal(2, "bob"))
+        cache.get("alice")  # bob is now the LRU entry
+        cache.put("cara", _principal(3, "cara"))
+        assert cache.get("bob") is None
+        assert cache.get("alice") is not None
+        assert cache.get("cara") is not None
+
+    def test_invalidate_user_by_id(self):
+        cache = PrincipalCache(maxsize=4, ttl_seconds=10)
+        cache.put("alice", _principal(1, "alice"))
+        cache.invalidate_user(1)
+        assert cache.get("alice") is None
+
+    def test_zero_maxsize_disables_cache(self):
+        cache = PrincipalCache(maxsize=0, ttl_seconds=10)
+        cache.put("alice", _principal(1, "alice"))
+        assert cache.get("alice") is None
+
+
+# ── get_current_user integration ──────────────────────────────────────────
+
+
+class TestPrincipalCacheInAuth:
+    def test_repeated_requests_hit_the_cache(self, client):
+        register(client)
+        headers = auth_header(client)
+        client.get("/api/v1/auth/me", headers=headers)
+        client.get("/api/v1/auth/me", headers=headers)
+
+        stats = client.get("/metrics").json()["principal_cache"]
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    def test_deactivation_invalidates_cached_principal(self, client):
+        register(client)
+        headers = auth_header(client)
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+        db = TestingSessionLocal()
+        user = db.query(UserModel).filter(UserModel.username == "testuser").first()
+        user.is_active = False
+        db.commit()
+        db.close()
+
+        assert principal_cache.get("testuser") is None
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
+
+    def test_read_between_flush_and_commit_is_not_kept(self, client):
+        register(client)
+        headers = auth_header(client)
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+        db = TestingSessionLocal()
+        try:
+            user = db.query(UserModel).filter(UserModel.username == "testuser").one()
+            user.is_active = False
+            db.flush()
+            assert principal_cache.get("testuser") is None
+            # Still committed as active: this request caches the old principal again.
+            assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+            db.commit()
+        finally:
+            db.close()
+
+        assert principal_cache.get("testuser") is None
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
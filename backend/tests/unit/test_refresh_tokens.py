@@ -0,0 +1,120 @@
+"""Unit tests for refresh-token rotation and reuse detection."""
+
+from datetime import UTC, datetime, timedelta
+
+from app.core.password_hasher import password_hasher
+from app.models.models import RefreshToken, User
+from tests.conftest import count_statements, login, register
+
+REFRESH_URL = "/api/v1/auth/refresh"
+ME_URL = "/api/v1/auth/me"
+
+
+def _login(client, username="Alice"):
+    register(
+        client, email=f"{username.lower()}@refresh.com", username=username, password="Password123!"
+    )
+    return login(client, username=username, password="Password123!").json()
+
+
+def _refresh(client, token):
+    return client.post(REFRESH_URL, json={"refresh_token": token})
+
+
+class TestRefreshTokens:
+    def test_login_stores_only_the_digest(self, client, db):
+        token = _login(client)["refresh_token"]
+
+        stored = db.query(RefreshToken).one()
+        assert stored.token_hash != token
+        assert len(stored.token_hash) == 64
+        assert stored.used_at is None and stored.revoked_at is None
+
+    def test_rotation_issues_a_new_pair_without_hashing_a_password(self, client, db, monkeypatch):
+        first = _login(client)["refresh_token"]
+
+        async def no_bcrypt(*_args):
+            raise AssertionError("refresh must not verify a password")
+
+        monkeypatch.setattr(password_hasher, "verify", no_bcrypt)
+        with count_statements() as statements:
+            resp = _refresh(client, first)
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["refresh_token"] != first
+        me = client.get(ME_URL, headers={"Authorization": f"Bearer {body['access_token']}"})
+        assert me.json()["username"] == "Alice"
+        # mark used, prune expired, insert next
+        assert sum("refresh_tokens" in s for s in statements) == 3
+        tokens = db.query(RefreshToken).order_by(RefreshToken.id).all()
+        assert len({t.family_id for t in tokens}) == 1
+        assert tokens[0].used_at is not None and tokens[1].used_at is None
+
+    def test_reuse_revokes_the_whole_family(self, client, db):
+        first = _login(client)["refresh_token"]
+        second = _refresh(client, first).json()["refresh_token"]
+
+        replay = _refresh(client, first)
+        assert replay.status_code == 401
+
+        # The legitimate holder of the newest token is signed out as well.
+        assert _refresh(client, second).status_code == 401
+        db.expire_all()
+        assert all(t.revoked_at is not None for t in db.query(RefreshToken))
+
+    def test_reuse_leaves_other_sessions_alone(self, client, db):
+        first = _login(client)["refresh_token"]
+        other = login(client, username="Alice", password="Password123!").json()["refresh_token"]
+        _refresh(client, first)
+
+        assert _refresh(client, first).status_code == 401
+        assert _refresh(client, other).status_code == 200
+
+    def test_expired_and_unknown_tokens_are_rejected(self, client, db):
+        token = _login(client)["refresh_token"]
+        db.query(RefreshToken).update({"expires_at": datetime.now(UTC) - timedelta(seconds=1)})
+        db.commit()
+
+        assert _refresh(client, token).status_code == 401
+        assert _refresh(client, "not-a-token").status_code == 401
+
+    def test_expired_tokens_are_pruned_on_rotation(self, client, db):
+        old = _login(client)["refresh_token"]
+        current = login(client, username="Alice", password="Password123!").json()["refresh_token"]
+        _login(client, username="Bob")
+        current_id = db.query(RefreshToken.id).order_by(RefreshToken.id).offset(1).limit(1).scalar()
+        db.query(RefreshToken).filter(RefreshToken.id != current_id).update(
+            {"expires_at": datetime.now(UTC) - timedelta(seconds=1)}
+        )
+        db.commit()
+
+        assert _refresh(client, current).status_code == 200
+
+        db.expire_all()
+        alice, bob = (db.query(User).filter(User.username == n).one().id for n in ("Alice", "Bob"))
+        # Alice keeps the used token (for reuse detection) and its successor.
+        kept = db.query(RefreshToken).filter_by(user_id=alice).order_by(RefreshToken.id).all()
+        assert len(kept) == 2
+        assert kept[0].id == current_id and kept[0].used_at is not None
+        # Bob's expired token goes when Bob next logs in or refreshes.
+        assert db.query(RefreshToken).filter_by(user_id=bob).count() == 1
+        assert _refresh(client, old).status_code == 401
+
+    def test_logout_revokes_refresh_tokens(self, client, db):
+        body = _login(client)
+        headers = {"Authorization": f"Bearer {body['access_token']}"}
+
+        assert client.post("/api/v1/auth/logout", headers=headers).status_code == 200
+
+        assert _refresh(client, body["refresh_token"]).status_code == 401
+
+    def test_inactive_user_cannot_refresh(self, client, db):
+        token = _login(client)["refresh_token"]
+        alice = db.query(User).one()
+        alice.is_active = False
+        db.commit()
+
+        assert _refresh(client, token).status_code == 401
+        db.expire_all()
+        assert db.query(RefreshToken).one().revoked_at is not None
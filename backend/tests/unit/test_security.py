@@ -5,7 +5,12 @@ from datetime import timedelta
 from jose import jwt
 
 from app.core.config import settings
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.security import (
+    create_access_token,
+    get_password_hash,
+    password_needs_rehash,
+    verify_password,
+)
 
 # ── verify_password ───────────────────────────────────────────────────────
 
@@ -47,6 +52,19 @@ class TestGetPasswordHash:
         assert verify_password(password, h) is True
 
 
+# ── password_needs_rehash ───────────────────────────────────────────────
+
+
+class TestPasswordNeedsRehash:
+    def test_fresh_hash_is_current(self):
+        assert password_needs_rehash(get_password_hash("mypassword")) is False
+
+    def test_hash_with_other_work_factor_needs_update(self):
+        h = get_password_hash("mypassword")
+        other_cost = "$2b$04$" if settings.BCRYPT_ROUNDS != 4 else "$2b$05$"
+        assert password_needs_rehash(other_cost + h[7:]) is True
+
+
 # ── create_access_token ───────────────────────────────────────────────────
 
 
@@ -0,0 +1,119 @@
+"""Unit tests for the split engine in app.core.splits – pure functions, no DB needed."""
+
+from decimal import Decimal
+
+import pytest
+
+from app.core import splits
+from app.core.splits import ItemInput, ShareInput, SplitError, SplitRequest
+
+
+def _request(total_cents, roommates=(2, 3), **kwargs):
+    return SplitRequest(
+        total_cents=total_cents, creator_id=1, roommate_ids=tuple(roommates), **kwargs
+    )
+
+
+class TestAllocate:
+    def test_largest_remainders_get_the_leftover_cents(self):
+        # Exact quotas 33.33.., 33.33.., 33.33.. -> one spare cent to the first position.
+        assert splits.allocate(10000, [1, 1, 1]) == [3334, 3333, 3333]
+        # 50/30/20 of 1.01: quotas 50.5, 30.3, 20.2 -> the spare cent goes to 50.5.
+        assert splits.allocate(101, [50, 30, 20]) == [51, 30, 20]
+
+    def test_always_sums_to_total(self):
+        weights = [7, 1, 13, 2, 2, 5]
+        for total in range(0, 500):
+            assert sum(splits.allocate(total, weights)) == total
+
+    def test_thousands_of_members(self):
+        shares = splits.allocate(1_000_001, [1] * 5000)
+        assert sum(shares) == 1_000_001
+        assert set(shares) == {200, 201}
+
+    def test_allocate_many_matches_allocate(self):
+        weights = [3, 2, 2]
+        totals = [100, 101, 1, 99999]
+        assert splits.allocate_many(totals, weights) == [
+            splits.allocate(t, weights) for t in totals
+        ]
+
+    @pytest.mark.parametrize("weights", [[], [0, 0], [1, -1]])
+    def test_invalid_weights(self, weights):
+        with pytest.raises(SplitError):
+            splits.allocate(100, weights)
+
+
+class TestStrategies:
+    def test_even_split_optionally_excludes_creator(self):
+        assert splits.split("even", _request(1000)) == [(1, 334), (2, 333), (3, 333)]
+        assert splits.split("even", _request(1000, include_creator=False)) == [
+            (2, 500),
+            (3, 500),
+        ]
+
+    def test_zero_cent_shares_are_dropped(self):
+        assert splits.split("even", _request(2)) == [(1, 1), (2, 1)]
+
+    def test_manual_split_must_match_total(self):
+        shares = (ShareInput(2, amount_cents=600), ShareInput(3, amount_cents=300))
+        with pytest.raises(SplitError, match=r"Split amounts 9\.00 CAD do not equal expense total"):
+            splits.split("manual", _request(1000, shares=shares))
+
+    def test_percentage_split(self):
+        shares = (ShareInput(1, percent=Decimal("50")), ShareInput(2, percent=Decimal("33.33")))
+        shares += (ShareInput(3, percent=Decimal("16.67")),)
+        assert splits.split("percentage", _request(10001, shares=shares)) == [
+            (1, 5001),
+            (2, 3333),
+            (3, 1667),
+        ]
+
+    def test_percentages_must_add_up_to_100(self):
+        shares = (ShareInput(1, percent=Decimal("50")), ShareInput(2, percent=Decimal("40")))
+        with pytest.raises(SplitError, match="add up to 100, got 90"):
+            splits.split("percentage", _request(1000, shares=shares))
+
+    def test_weighted_split_accepts_decimal_weights(self):
+        shares = (ShareInput(1, weight=Decimal("12.5")), ShareInput(2, weight=Decimal("7.5")))
+        assert splits.split("weighted", _request(1000, shares=shares)) == [(1, 625), (2, 375)]
+
+    def test_itemized_split_spreads_tax_by_subtotal(self):
+        items = (ItemInput(2000, (1,)), ItemInput(1000, (2, 3)), ItemInput(1000, (1, 2)))
+        # Subtotals: 1 -> 2500, 2 -> 1000, 3 -> 500; 10% on top is split the same way.
+        allocation = dict(splits.split("itemized", _request(4400, items=items)))
+        assert allocation == {1: 2750, 2: 1100, 3: 550}
+
+    def test_itemized_items_cannot_exceed_total(self):
+        items = (ItemInput(2000, (1, 2)),)
+        with pytest.raises(SplitError, match="exceed expense total"):
+            splits.split("itemized", _request(1500, items=items))
+
+    def test_participants_must_be_unique_household_members(self):
+        shares = (ShareInput(2, weight=Decimal(1)), ShareInput(2, weight=Decimal(1)))
+        with pytest.raises(SplitError, match="more than once"):
+            splits.split("weighted", _request(100, shares=shares))
+        with pytest.raises(SplitError, match="User 9 is not an active member"):
+            splits.split("weighted", _request(100, shares=(ShareInput(9, weight=Decimal(1)),)))
+
+    def test_unknown_strategy(self):
+        with pytest.raises(SplitError, match="Unknown split strategy 'random'"):
+            splits.split("random", _request(100))
+
+
+class TestRegistry:
+    def test_builtin_strategies(self):
+        assert {"even", "manual", "percentage", "weighted", "itemized"} <= set(
+            splits.split_strategies()
+        )
+
+    def test_register_custom_strategy(self, monkeypatch):
+        monkeypatch.setattr(splits, "_STRATEGIES", dict(splits._STRATEGIES))
+
+        @splits.register_strategy("creator_pays")
+        def creator_pays(request):
+            return {request.creator_id: request.total_cents}
+
+        assert splits.split("creator_pays", _request(500)) == [(1, 500)]
+        with pytest.raises(ValueError, match="already registered"):
+            splits.register_strategy("creator_pays")(creator_pays)
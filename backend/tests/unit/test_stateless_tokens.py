@@ -0,0 +1,125 @@
+"""Unit tests for stateless access tokens and their revocation set."""
+
+from datetime import UTC, datetime
+
+import pytest
+from jose import jwt
+
+from app.core.config import settings
+from app.core.revocations import BloomFilter, RevocationSet, revocation_set
+from app.models.models import TokenRevocation, User
+from tests.conftest import count_statements, login, register
+
+ME_URL = "/api/v1/auth/me"
+EXPENSES_URL = "/api/v1/expenses"
+
+
+@pytest.fixture
+def stateless(monkeypatch):
+    monkeypatch.setattr(settings, "STATELESS_TOKENS", True)
+
+
+def _token(client, username="Alice"):
+    register(
+        client, email=f"{username.lower()}@jwt.com", username=username, password="Password123!"
+    )
+    return login(client, username=username, password="Password123!").json()["access_token"]
+
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestBloomFilter:
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(capacity=1000)
+        for user_id in range(0, 2000, 2):
+            bloom.add(user_id)
+
+        assert all(user_id in bloom for user_id in range(0, 2000, 2))
+        false_positives = sum(user_id in bloom for user_id in range(1, 20_001, 2))
+        assert false_positives / 10_000 < 0.03
+
+
+class TestRevocationSet:
+    def test_only_versions_below_the_minimum_are_revoked(self):
+        revocations = RevocationSet(refresh_seconds=60)
+        revocations.revoke(7, 3)
+
+        assert revocations.is_revoked(7, 2)
+        assert not revocations.is_revoked(7, 3)
+        assert not revocations.is_revoked(8, 0)
+
+
+class TestStatelessTokens:
+    def test_token_claims_and_no_user_query(self, client, db, stateless):
+        token = _token(client)
+        claims = jwt.get_unverified_claims(token)
+        alice = db.query(User).one()
+        assert (claims["uid"], claims["act"], claims["ver"]) == (alice.id, True, 0)
+
+        client.get(EXPENSES_URL, headers=_bearer(token))  # first request loads revocations
+        with count_statements() as statements:
+            resp = client.get(EXPENSES_URL, headers=_bearer(token))
+
+        assert resp.status_code == 400  # authorized; Alice has no household yet
+        assert not any("FROM users" in s for s in statements)
+
+    def test_logout_revokes_immediately(self, client, db, stateless):
+        token = _token(client)
+        assert client.get(ME_URL, headers=_bearer(token)).status_code == 200
+
+        assert client.post("/api/v1/auth/logout", headers=_bearer(token)).status_code == 200
+
+        assert client.get(ME_URL, headers=_bearer(token)).status_code == 401
+        fresh = login(client, username="Alice", password="Password123!").json()["access_token"]
+        assert jwt.get_unverified_claims(fresh)["ver"] == 1
+        assert client.get(ME_URL, headers=_bearer(fresh)).status_code == 200
+
+    def test_deactivation_revokes_after_refresh(self, client, db, stateless):
+        token = _token(client)
+        assert client.get(ME_URL, headers=_bearer(token)).status_code == 200
+
+        alice = db.query(User).one()
+        alice.is_active = False
+        db.commit()
+
+        assert alice.token_version == 1
+        assert db.get(TokenRevocation, alice.id).min_version == 1
+        assert client.get(ME_URL, headers=_bearer(token)).status_code == 401
+
+    def test_refresh_between_flush_and_commit_does_not_lose_deactivation(
+        self, client, db, stateless
+    ):
+        token = _token(client)
+        assert client.get(ME_URL, headers=_bearer(token)).status_code == 200
+        revocation_set.expire()
+
+        alice = db.query(User).one()
+        alice.is_active = False
+        db.flush()
+        # This refresh reads the table before the revocation is committed.
+        assert client.get(ME_URL, headers=_bearer(token)).status_code == 200
+        db.commit()
+
+        assert client.get(ME_URL, headers=_bearer(token)).status_code == 401
+
+    def test_revocations_from_other_workers_are_picked_up(self, client, db, stateless):
+        token = _token(client)
+        assert client.get(ME_URL, headers=_bearer(token)).status_code == 200
+        alice = db.query(User).one()
+        db.add(TokenRevocation(user_id=alice.id, min_version=1, revoked_at=datetime.now(UTC)))
+        db.commit()
+
+        # Still inside the refresh interval: the row is not visible yet.
+        assert client.get(ME_URL, headers=_bearer(token)).status_code == 200
+        revocation_set.expire()
+        assert client.get(ME_URL, headers=_bearer(token)).status_code == 401
+
+    def test_legacy_tokens_still_accepted(self, client, db, stateless, monkeypatch):
+        monkeypatch.setattr(settings, "STATELESS_TOKENS", False)
+        token = _token(client)
+        assert "uid" not in jwt.get_unverified_claims(token)
+
+        monkeypatch.setattr(settings, "STATELESS_TOKENS", True)
+        assert client.get(ME_URL, headers=_bearer(token)).status_code == 200
@@ -0,0 +1,103 @@
+"""Unit tests for app.core.token_cache and its use in get_current_user."""
+
+import pytest
+
+from app.api import auth
+from app.core.config import settings
+from app.core.token_cache import TokenCache, token_cache
+from tests.conftest import FakeClock, auth_header, register
+
+ME_URL = "/api/v1/auth/me"
+
+
+# ── TokenCache ────────────────────────────────────────────────────────────
+
+
+class TestTokenCache:
+    def test_hit_until_exp(self):
+        clock = FakeClock(1_000.0)
+        cache = TokenCache(maxsize=4, clock=clock)
+        claims = {"sub": "alice", "exp": 1_010}
+        cache.put("t1", claims)
+
+        assert cache.get("t1") is claims
+        clock.now = 1_010.0
+        assert cache.get("t1") is None
+        assert cache.stats() == {
+            "hits": 1,
+            "misses": 1,
+            "hit_rate": 0.5,
+            "size": 0,
+            "maxsize": 4,
+        }
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TokenCache(maxsize=2, clock=FakeClock(1_000.0))
+        cache.put("a", {"exp": 2_000})
+        cache.put("b", {"exp": 2_000})
+        cache.get("a")  # b is now the LRU entry
+        cache.put("c", {"exp": 2_000})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_tokens_without_exp_are_not_kept(self):
+        cache = TokenCache(maxsize=4)
+        cache.put("t1", {"sub": "alice"})
+        assert cache.get("t1") is None
+
+    def test_zero_maxsize_disables_cache(self):
+        cache = TokenCache(maxsize=0)
+        cache.put("t1", {"sub": "alice", "exp": 2**40})
+        assert cache.get("t1") is None
+
+
+# ── get_current_user ──────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    calls = []
+    decode = auth.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    return calls
+
+
+class TestGetCurrentUserTokenCache:
+    def test_token_is_decoded_once(self, client, decodes):
+        register(client)
+        headers = auth_header(client)
+
+        for _ in range(3):
+            assert client.get(ME_URL, headers=headers).status_code == 200
+
+        assert len(decodes) == 1
+        stats = client.get("/metrics").json()["token_cache"]
+        assert (stats["hits"], stats["misses"]) == (2, 1)
+
+    def test_invalid_tokens_are_not_cached(self, client, decodes):
+        register(client)
+        token = auth_header(client)["Authorization"].removeprefix("Bearer ")
+        tampered = {"Authorization": f"Bearer {token[:-2]}xx"}
+
+        assert client.get(ME_URL, headers=tampered).status_code == 401
+        assert client.get(ME_URL, headers=tampered).status_code == 401
+
+        assert len(decodes) == 2
+        assert token_cache.stats()["size"] == 0
+
+    def test_logout_still_revokes_cached_stateless_token(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "STATELESS_TOKENS", True)
+        register(client)
+        headers = auth_header(client)
+        assert client.get(ME_URL, headers=headers).status_code == 200
+
+        assert client.post("/api/v1/auth/logout", headers=headers).status_code == 200
+
+        assert client.get(ME_URL, headers=headers).status_code == 401
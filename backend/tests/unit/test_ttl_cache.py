@@ -0,0 +1,44 @@
+"""Unit tests for app.core.ttl_cache, the base of the in-process caches."""
+
+import pytest
+
+from app.core.ttl_cache import TTLCache
+from tests.conftest import FakeClock
+
+
+class RecordingCache(TTLCache):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.removed = []
+
+    def _removed(self, key, value):
+        self.removed.append(key)
+
+
+class TestTTLCache:
+    def test_every_departure_reaches_the_hook(self):
+        clock = FakeClock()
+        cache = RecordingCache(maxsize=2, ttl_seconds=10, clock=clock)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("c", 3)  # evicts a
+        cache.pop("b")
+        clock.now = 10.0
+        assert cache.get("c") is None  # expired
+
+        assert cache.removed == ["a", "b", "c"]
+        assert cache.stats()["size"] == 0
+
+    def test_explicit_deadline_overrides_ttl(self):
+        clock = FakeClock()
+        cache = TTLCache(maxsize=4, ttl_seconds=10, clock=clock)
+        cache.put("short", 1, expires_at=1.0)
+        cache.put("default", 2)
+        clock.now = 5.0
+
+        assert cache.get("short") is None
+        assert cache.get("default") == 2
+
+    def test_deadline_required_without_ttl(self):
+        with pytest.raises(ValueError, match="expires_at"):
+            TTLCache(maxsize=4).put("key", 1)
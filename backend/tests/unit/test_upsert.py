@@ -0,0 +1,38 @@
+"""Unit tests for app.db.upsert – compiled SQL only, no DB needed."""
+
+import pytest
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from app.db.upsert import upsert
+from app.models.models import MemberBalance
+
+_table = MemberBalance.__table__
+
+
+def _statement(dialect_name: str):
+    return upsert(
+        dialect_name,
+        _table,
+        {"household_id": 1, "user_id": 2, "net_cents": 5},
+        index_elements=[_table.c.household_id, _table.c.user_id],
+        set_=lambda new: {"net_cents": _table.c.net_cents + new.net_cents},
+    )
+
+
+@pytest.mark.parametrize(
+    "dialect,clause",
+    [
+        (sqlite.dialect(), "ON CONFLICT (household_id, user_id) DO UPDATE"),
+        (postgresql.dialect(), "ON CONFLICT (household_id, user_id) DO UPDATE"),
+        (mysql.dialect(), "ON DUPLICATE KEY UPDATE"),
+    ],
+)
+def test_each_supported_dialect_gets_its_own_syntax(dialect, clause):
+    sql = str(_statement(dialect.name).compile(dialect=dialect))
+    assert clause in sql
+    assert "net_cents" in sql.split(clause)[1]
+
+
+def test_unsupported_dialect_raises_instead_of_guessing():
+    with pytest.raises(NotImplementedError, match="mssql"):
+        _statement("mssql")